@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark flattened forest inference against the models' own predict_proba.
+
+WHAT: Time predict_proba vs FlatForest.predict_proba at several batch sizes
+WHY: Check the flattened engine pays off (small batches) and stays identical
+WHEN: After changing forest.py or the model hyperparameters
+WHEN NOT: CI (timings are machine dependent)
+ALTERNATIVE: Profile the scoring service end to end
+
+Usage:
+    python scripts/benchmark_forest.py --rows 10000 --repeat 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pandas as pd
+from churn_prediction.models.forest import FlatForest
+from churn_prediction.models.train import train_model
+
+
+def _best_time(fn, repeat: int) -> float:
+    """Best of `repeat` wall times, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def _synthetic(n_rows: int, seed: int = 0):
+    """Customer-shaped features with a non-linear churn signal."""
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame({
+        "Age": rng.uniform(18, 70, n_rows),
+        "Tenure": rng.uniform(0, 72, n_rows),
+        "MonthlyCharges": rng.uniform(20, 120, n_rows),
+        "TotalCharges": rng.uniform(0, 8000, n_rows),
+        "NumProducts": rng.integers(1, 5, n_rows).astype(float),
+    })
+    logit = ((X["MonthlyCharges"] - 70) / 20 - X["Tenure"] / 24
+             + rng.normal(0, 1, n_rows))
+    return X, (logit > 0).astype(int)
+
+
+def _models(X_train, y_train):
+    """The forests train_model builds (scripts/train.py settings)."""
+    model_types = ["random_forest"]
+    try:
+        import xgboost  # noqa: F401
+        model_types.append("xgboost")
+    except ImportError:
+        print("xgboost not installed, skipping")
+    return {
+        model_type: train_model(X_train, y_train, model_type, verbose=False,
+                                n_estimators=100, random_state=42)
+        for model_type in model_types
+    }
+
+
+def main():
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description="FlatForest benchmark")
+    parser.add_argument("--rows", type=int, default=10_000, help="Largest batch size")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    X_train, y_train = _synthetic(10_000)
+    X_test, _ = _synthetic(args.rows, seed=1)
+    batch_sizes = sorted({1, 100, args.rows})
+
+    print(f"{'model':<15}{'rows':>8}{'predict_proba ms':>18}{'flat ms':>10}"
+          f"{'speedup':>9}{'max |diff|':>12}")
+    for name, model in _models(X_train, y_train).items():
+        forest = FlatForest.from_model(model)
+
+        for n_rows in batch_sizes:
+            batch = X_test.iloc[:n_rows]
+            array = batch.to_numpy(dtype=np.float32)
+
+            expected = model.predict_proba(batch)
+            diff = np.abs(forest.predict_proba(array) - expected).max()
+
+            model_ms = _best_time(lambda: model.predict_proba(batch), args.repeat)
+            flat_ms = _best_time(lambda: forest.predict_proba(array), args.repeat)
+            print(f"{name:<15}{n_rows:>8}{model_ms:>18.3f}{flat_ms:>10.3f}"
+                  f"{model_ms / flat_ms:>8.1f}x{diff:>12.2e}")
+
+        print(f"{name}: {forest.n_trees} trees, {forest.n_nodes} nodes, "
+              f"{forest.nbytes / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark model artifact loading.
+
+WHAT: Cold-start (fresh process) and repeated-load times for model
+    artifacts: joblib raw / compressed / flattened + mmap / registry
+WHY: Scoring workers pay the load on every start
+WHEN: Choosing the artifact format for deployment
+WHEN NOT: CI (timings are machine dependent)
+ALTERNATIVE: Time the service start-up end to end
+
+Existing models/*.pkl and models/*.joblib files are benchmarked too;
+Git LFS pointers (not pulled) are skipped.
+
+Usage:
+    python scripts/benchmark_model_loading.py --trees 300 --repeat 10
+"""
+
+import argparse
+import logging
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(SRC))
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from churn_prediction.models.train import ModelRegistry, load_model, save_model
+
+
+def _is_lfs_pointer(path: Path) -> bool:
+    with open(path, "rb") as f:
+        return f.read(23) == b"version https://git-lfs"
+
+
+def cold_start_seconds(path: Path, mmap_mode) -> float:
+    """Load time measured inside a fresh interpreter (imports excluded)."""
+    code = (
+        "import sys, time; sys.path.insert(0, {src!r})\n"
+        "from churn_prediction.models.train import load_model\n"
+        "start = time.perf_counter(); load_model({path!r}, mmap_mode={mmap!r})\n"
+        "print(time.perf_counter() - start)\n"
+    ).format(src=str(SRC), path=str(path), mmap=mmap_mode)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                         check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def repeated_seconds(fn, repeat: int) -> float:
+    """Mean seconds per call over `repeat` calls."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def synthetic_artifacts(directory: Path, n_trees: int):
+    """Train one forest and save it in every supported format."""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(50_000, 6)),
+                     columns=["Age", "Tenure", "MonthlyCharges", "TotalCharges",
+                              "NumProducts", "Score"])
+    y = (X["Age"] + X["Tenure"] * X["MonthlyCharges"]
+         + rng.normal(0, 1, len(X)) > 0).astype(int)
+    model = RandomForestClassifier(n_estimators=n_trees, max_depth=12, n_jobs=-1,
+                                   random_state=42).fit(X, y)
+
+    variants = {
+        "joblib raw": (directory / "rf_raw.joblib", {}, None),
+        "joblib compress=3": (directory / "rf_compressed.joblib", {"compress": 3},
+                              None),
+        "joblib raw, mmap": (directory / "rf_raw.joblib", None, "r"),
+        "flattened, mmap": (directory / "rf_flat.joblib", {"flatten": True}, "r"),
+    }
+    for path, save_kwargs, _ in variants.values():
+        if save_kwargs is not None:
+            save_model(model, str(path), **save_kwargs)
+    return {name: (path, mmap) for name, (path, _, mmap) in variants.items()}
+
+
+def main():
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description="Model loading benchmark")
+    parser.add_argument("--trees", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--models-dir", default="models")
+    args = parser.parse_args()
+    # One "Model loaded" line per timed load would drown the table
+    logging.getLogger("churn_prediction.models.train").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        artifacts = synthetic_artifacts(Path(tmp), args.trees)
+
+        models_dir = Path(args.models_dir)
+        saved = sorted(models_dir.glob("*.pkl")) + sorted(models_dir.glob("*.joblib"))
+        for path in saved:
+            if _is_lfs_pointer(path):
+                print(f"Skipping {path}: Git LFS pointer (run `git lfs pull`)")
+                continue
+            artifacts[str(path)] = (path, None)
+
+        print(f"\n{'artifact':<28}{'size MB':>9}{'cold s':>9}{'reload ms':>11}"
+              f"{'registry ms':>13}")
+        for name, (path, mmap_mode) in artifacts.items():
+            registry = ModelRegistry()
+            registry.get(str(path), mmap_mode)
+
+            size_mb = path.stat().st_size / 2**20
+            cold = cold_start_seconds(path, mmap_mode)
+            reload_ms = repeated_seconds(
+                lambda: load_model(str(path), mmap_mode=mmap_mode), args.repeat) * 1e3
+            registry_ms = repeated_seconds(
+                lambda: registry.get(str(path), mmap_mode), args.repeat) * 1e3
+            print(f"{name:<28}{size_mb:>9.1f}{cold:>9.3f}{reload_ms:>11.1f}"
+                  f"{registry_ms:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
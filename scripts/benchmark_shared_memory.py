@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Measure node memory of scoring workers: private vs shared model.
+
+WHAT: Start N workers that each load the model privately (load_model)
+    or attach to one SharedModel, score a batch, then report RSS and PSS
+    from /proc/<pid>/smaps_rollup
+WHY: Prove that shared mode stops model memory growing with workers
+WHEN: Sizing scoring nodes
+WHEN NOT: Non-Linux hosts (no smaps_rollup, RSS only)
+ALTERNATIVE: Watch `free` while the batch job runs
+
+Usage:
+    python scripts/benchmark_shared_memory.py --workers 8 --trees 300
+"""
+
+import argparse
+import logging
+import multiprocessing as mp
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from churn_prediction.features.engineering import FeatureEngineer
+from churn_prediction.instrumentation import process_memory
+from churn_prediction.models.shared import SharedModel
+from churn_prediction.models.train import load_model, save_model
+
+
+def _worker(mode, paths, batch, ready, done):
+    """Load or attach, score once so the model pages are touched, then wait."""
+    logging.getLogger("churn_prediction.models.train").setLevel(logging.WARNING)
+    if mode == "shared":
+        model, engineer = SharedModel.attach(*paths)
+    else:
+        model, engineer = load_model(paths[0]), load_model(paths[1])
+    model.predict_proba(engineer.transform(batch))
+    ready.put(mp.current_process().pid)
+    done.wait()
+
+
+def measure(mode, paths, batch, n_workers):
+    """Sum RSS/PSS of n_workers live workers in the given mode."""
+    ctx = mp.get_context("spawn")
+    ready, done = ctx.Queue(), ctx.Event()
+    workers = [ctx.Process(target=_worker, args=(mode, paths, batch, ready, done))
+               for _ in range(n_workers)]
+    for w in workers:
+        w.start()
+    pids = [ready.get() for _ in workers]
+
+    memory = [process_memory(pid) for pid in pids]
+    done.set()
+    for w in workers:
+        w.join()
+
+    total = {key: sum(m[key] or 0 for m in memory) for key in ("rss", "pss")}
+    return total, memory
+
+
+def main():
+    """Train a forest, then compare private and shared workers."""
+    parser = argparse.ArgumentParser(description="Shared model memory benchmark")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--trees", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=50_000, help="Training rows")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(args.rows, 5)),
+                     columns=["Age", "Tenure", "MonthlyCharges", "TotalCharges",
+                              "NumProducts"])
+    y = (X["Age"] + X["Tenure"] * X["MonthlyCharges"]
+         + rng.normal(0, 1, len(X)) > 0).astype(int)
+    engineer = FeatureEngineer()
+    model = RandomForestClassifier(n_estimators=args.trees, max_depth=14, n_jobs=-1,
+                                   random_state=42).fit(engineer.fit_transform(X), y)
+    batch = X.iloc[:1000]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        private_paths = (f"{tmp}/model.joblib", f"{tmp}/engineer.joblib")
+        save_model(model, private_paths[0])
+        save_model(engineer, private_paths[1])
+
+        with SharedModel(model, engineer) as shared:
+            results = {
+                "private": measure("private", private_paths, batch, args.workers),
+                "shared": measure("shared", shared.paths, batch, args.workers),
+            }
+
+    print(f"\n{args.workers} workers, {args.trees}-tree forest")
+    print(f"{'mode':<10}{'total RSS MB':>14}{'total PSS MB':>14}{'PSS/worker MB':>15}")
+    for mode, (total, _) in results.items():
+        print(f"{mode:<10}{total['rss'] / 2**20:>14.1f}{total['pss'] / 2**20:>14.1f}"
+              f"{total['pss'] / 2**20 / args.workers:>15.1f}")
+    saved = results["private"][0]["pss"] - results["shared"][0]["pss"]
+    print(f"Shared mode saves {saved / 2**20:.1f} MB of node memory (PSS)")
+
+
+if __name__ == "__main__":
+    main()
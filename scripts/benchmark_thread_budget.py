@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Measure training throughput of parallel workers with and without the thread budget.
+
+WHAT: Run the same fits (random_forest, logistic_regression, xgboost when
+    installed) across N worker processes twice: every fit claiming all
+    cores (n_jobs=-1, uncapped BLAS), then each worker limited to its
+    share of the budget (parallel_section + init_worker_threads)
+WHY: Show the cost of nested-parallelism oversubscription on this node
+WHEN: Choosing n_workers / CHURN_THREADS for search and batch jobs
+WHEN NOT: Single-core hosts (both modes run one thread per core)
+ALTERNATIVE: Watch load average and context switches in `vmstat`
+
+Usage:
+    python scripts/benchmark_thread_budget.py --workers 4 --fits 12
+"""
+
+import argparse
+import logging
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pandas as pd
+
+from churn_prediction.models.train import (
+    MODEL_BACKENDS,
+    init_worker_threads,
+    parallel_section,
+    thread_budget,
+    train_model,
+)
+
+
+def _init(n_threads):
+    logging.getLogger("churn_prediction.models.train").setLevel(logging.WARNING)
+    if n_threads is not None:
+        init_worker_threads(n_threads)
+
+
+def _fit(model_type, X, y, n_jobs):
+    params = {"n_estimators": 100} if model_type != "logistic_regression" else {}
+    if n_jobs is not None:
+        params["n_jobs"] = n_jobs
+    start = time.perf_counter()
+    train_model(X, y, model_type, verbose=False, **params)
+    return time.perf_counter() - start
+
+
+def run(mode, tasks, X, y, n_workers):
+    """Wall time of all tasks; 'oversubscribed' passes n_jobs=-1 everywhere."""
+    if mode == "budgeted":
+        with parallel_section(n_workers) as n_threads:
+            initargs, n_jobs = (n_threads,), None
+    else:
+        initargs, n_jobs = (None,), -1
+
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=get_context("spawn"),
+                             initializer=_init, initargs=initargs) as pool:
+        # Warm the workers up so imports are not timed
+        list(pool.map(_init, [initargs[0]] * n_workers))
+        start = time.perf_counter()
+        fit_seconds = list(pool.map(_fit, tasks, [X] * len(tasks), [y] * len(tasks),
+                                    [n_jobs] * len(tasks)))
+        wall = time.perf_counter() - start
+    return wall, fit_seconds
+
+
+def main():
+    """Compare oversubscribed and budgeted multi-worker training."""
+    parser = argparse.ArgumentParser(description="Thread budget throughput benchmark")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--fits", type=int, default=12, help="Fits per mode")
+    parser.add_argument("--rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(args.rows, 20)),
+                     columns=[f"f{i}" for i in range(20)])
+    y = (X["f0"] + X["f1"] * X["f2"] + rng.normal(0, 1, len(X)) > 0).astype(int)
+
+    model_types = [m for m in ("random_forest", "logistic_regression", "xgboost")
+                   if m in MODEL_BACKENDS]
+    try:
+        import xgboost  # noqa: F401
+    except ImportError:
+        model_types.remove("xgboost")
+    tasks = [model_types[i % len(model_types)] for i in range(args.fits)]
+
+    print(f"\n{args.workers} workers, {args.fits} fits ({', '.join(model_types)}), "
+          f"budget {thread_budget()} threads")
+    print(f"{'mode':<16}{'wall s':>9}{'fits/min':>10}{'mean fit s':>12}")
+    walls = {}
+    for mode in ("oversubscribed", "budgeted"):
+        wall, fit_seconds = run(mode, tasks, X, y, args.workers)
+        walls[mode] = wall
+        print(f"{mode:<16}{wall:>9.2f}{len(tasks) / wall * 60:>10.1f}"
+              f"{np.mean(fit_seconds):>12.2f}")
+    print(f"Budgeted throughput: {walls['oversubscribed'] / walls['budgeted']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,8 +14,13 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 import xgboost as xgb
+from churn_prediction.data.cache import DEFAULT_CACHE_DIR
 from churn_prediction.data.loader import load_data, split_data
 from churn_prediction.features.engineering import FeatureEngineer
+from churn_prediction.evaluation.bootstrap import (
+    bootstrap_evaluate,
+    print_bootstrap_results,
+)
 from churn_prediction.evaluation.metrics import evaluate_model, print_metrics
 
 
@@ -27,11 +32,11 @@ def main():
     
     # Load data
     DATA_PATH = "data/raw/customers.csv"
-    df = load_data(DATA_PATH)
+    df = load_data(DATA_PATH, cache_dir=DEFAULT_CACHE_DIR)
     
     # Split and engineer features
     X_train, X_test, y_train, y_test = split_data(df)
-    engineer = FeatureEngineer()
+    engineer = FeatureEngineer(categorical="codes")
     X_train_transformed = engineer.fit_transform(X_train)
     X_test_transformed = engineer.transform(X_test)
     
@@ -49,20 +54,28 @@ def main():
     metrics = evaluate_model(model, X_test_transformed, y_test)
     print_metrics(metrics)
     
-    # DECISION CRITERIA:
-    # If ROC AUC > 0.90 → Merge to main
-    # If ROC AUC 0.88-0.90 → Consider merging
-    # If ROC AUC < 0.88 → Discard experiment
+    # Uncertainty of every metric on this holdout
+    result = bootstrap_evaluate(model, X_test_transformed, y_test, n_replicates=10_000)
+    print_bootstrap_results(result)
+    
+    # DECISION CRITERIA (on the 95% bootstrap interval, not the point estimate):
+    # If whole interval > 0.90 → Merge to main
+    # If whole interval > 0.88 → Consider merging
+    # If whole interval < 0.88 → Discard experiment
+    # Otherwise the holdout cannot tell → Inconclusive
     
     roc_auc = metrics['roc_auc']
-    print(f"\nDecision: ROC AUC = {roc_auc:.4f}")
+    low, high = result.intervals['roc_auc']
+    print(f"\nDecision: ROC AUC = {roc_auc:.4f} (95% CI {low:.4f}-{high:.4f})")
     
-    if roc_auc > 0.90:
+    if low > 0.90:
         print("✅ MERGE TO MAIN - Significant improvement")
-    elif roc_auc > 0.88:
+    elif low > 0.88:
         print("⚠️  REVIEW - Marginal improvement, needs discussion")
-    else:
+    elif high < 0.88:
         print("❌ DISCARD - No improvement over baseline")
+    else:
+        print("❔ INCONCLUSIVE - Interval spans the 0.88 bar, evaluate on more data")
 
 
 if __name__ == "__main__":
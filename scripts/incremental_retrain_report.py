@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Incremental vs full retraining report.
+
+WHAT: Compare update_model (warm start / continued boosting) against a
+    full refit on all history: wall time and test metrics
+WHY: Decide whether daily refreshes can use incremental updates
+WHEN: Before switching the retraining schedule, after data drift
+WHEN NOT: Feature engineering changed (always refit from scratch)
+ALTERNATIVE: Always refit (simple, slow)
+
+Usage:
+    python scripts/incremental_retrain_report.py --history 200000 \
+        --window 20000 --output reports/incremental_retrain.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pandas as pd
+
+from churn_prediction.evaluation.metrics import evaluate_model
+from churn_prediction.models.train import train_model, update_model
+
+
+def drifting_windows(n_history: int, n_window: int, n_test: int, seed: int = 42):
+    """
+    Synthetic customers whose churn drivers drift over time.
+
+    Returns:
+        (X_history, y_history), (X_window, y_window), (X_test, y_test);
+        the newest window and the test set share the latest behaviour
+    """
+    rng = np.random.default_rng(seed)
+
+    def sample(n: int, drift: float):
+        X = pd.DataFrame({
+            "Age": rng.uniform(18, 70, n),
+            "Tenure": rng.uniform(0, 120, n),
+            "MonthlyCharges": rng.uniform(20, 120, n),
+            "NumProducts": rng.integers(1, 5, n).astype(float),
+        })
+        logit = ((X["MonthlyCharges"] - 70) / 20 * (1 + drift)
+                 - X["Tenure"] / 40 - drift * (X["NumProducts"] - 2.5)
+                 + rng.normal(0, 1, n))
+        return X, (logit > 0).astype(int)
+
+    return sample(n_history, 0.0), sample(n_window, 0.5), sample(n_test, 0.5)
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def compare(model_type: str, history, window, test, n_estimators: int,
+            n_new_trees: int, max_trees=None):
+    """Full refit on history + window vs update of a history-only model."""
+    (X_hist, y_hist), (X_win, y_win), (X_test, y_test) = history, window, test
+    X_all = pd.concat([X_hist, X_win], ignore_index=True)
+    y_all = pd.concat([y_hist, y_win], ignore_index=True)
+
+    base = train_model(X_hist, y_hist, model_type, verbose=False,
+                       n_estimators=n_estimators)
+
+    full, full_seconds = _timed(lambda: train_model(
+        X_all, y_all, model_type, verbose=False, n_estimators=n_estimators))
+    updated, update_seconds = _timed(lambda: update_model(
+        base, X_win, y_win, n_new_trees=n_new_trees, max_trees=max_trees,
+        verbose=False))
+
+    rows = {}
+    for name, model, seconds in [("stale", base, 0.0),
+                                 ("full_refit", full, full_seconds),
+                                 ("incremental", updated, update_seconds)]:
+        metrics = evaluate_model(model, X_test, y_test)
+        metrics.pop("confusion_matrix")
+        rows[name] = {"seconds": seconds, **{k: float(v) for k, v in metrics.items()}}
+    return rows
+
+
+def main():
+    """Run the comparison for each model type and print / save a report."""
+    parser = argparse.ArgumentParser(description="Incremental retraining report")
+    parser.add_argument("--history", type=int, default=100_000, help="Rows of history")
+    parser.add_argument("--window", type=int, default=10_000,
+                        help="Rows in the new window")
+    parser.add_argument("--test", type=int, default=20_000)
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--new-trees", type=int, default=20)
+    parser.add_argument("--output", default=None, help="Optional JSON report path")
+    args = parser.parse_args()
+
+    history, window, test = drifting_windows(args.history, args.window, args.test)
+    report = {"history_rows": args.history, "window_rows": args.window}
+
+    model_types = {"random_forest": {"max_trees": args.trees}}
+    try:
+        import xgboost  # noqa: F401
+        model_types["xgboost"] = {}
+    except ImportError:
+        print("xgboost not installed, skipping")
+
+    for model_type, options in model_types.items():
+        rows = compare(model_type, history, window, test, args.trees, args.new_trees,
+                       **options)
+        report[model_type] = rows
+
+        print(f"\n{model_type} ({args.trees} trees, +{args.new_trees} on "
+              f"{args.window} new rows{', oldest replaced' if options else ''})")
+        print(f"{'':<13}{'seconds':>9}{'roc_auc':>9}{'f1':>8}{'accuracy':>10}")
+        for name, row in rows.items():
+            print(f"{name:<13}{row['seconds']:>9.2f}{row['roc_auc']:>9.4f}"
+                  f"{row['f1']:>8.4f}{row['accuracy']:>10.4f}")
+        incremental_seconds = max(rows["incremental"]["seconds"], 1e-9)
+        speedup = rows["full_refit"]["seconds"] / incremental_seconds
+        print(f"Incremental update is {speedup:.1f}x faster than a full refit")
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nReport saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
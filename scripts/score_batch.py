@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Batch scoring script for churn prediction.
+
+WHAT: Score a customer file with a trained model
+WHY: Nightly scoring of the full customer base
+WHEN: After training (needs model + feature engineer artifacts)
+WHEN NOT: Single-customer requests (use CompiledScorer)
+ALTERNATIVE: Notebook scoring (not reproducible)
+
+Usage:
+    python scripts/score_batch.py --input data/raw/customers.csv \
+        --output data/processed/scores --workers 4
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from churn_prediction.models.batch import score_file
+
+
+def main():
+    """Parse arguments and run batch scoring."""
+    parser = argparse.ArgumentParser(description="Batch churn scoring")
+    parser.add_argument("--model", default="models/random_forest_model.joblib")
+    parser.add_argument("--engineer", default="models/feature_engineer.joblib")
+    parser.add_argument("--input", default="data/raw/customers.csv")
+    parser.add_argument("--output", default="data/processed/scores",
+                        help="Directory (columnar .npy per column), "
+                             ".parquet (needs pyarrow) or .csv")
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument("--shared-model", action="store_true",
+                        help="Workers map one shared read-only copy of the model")
+    args = parser.parse_args()
+
+    score_file(
+        args.model,
+        args.engineer,
+        args.input,
+        args.output,
+        chunksize=args.chunksize,
+        n_workers=args.workers,
+        shared_model=args.shared_model,
+    )
+
+
+if __name__ == "__main__":
+    main()
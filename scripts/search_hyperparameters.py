@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Hyperparameter search script for churn prediction.
+
+WHAT: Successive-halving search over train_model's model types
+WHY: Replace hardcoded parameters in experiment scripts with tuned ones
+WHEN: Before retraining with a new model type or new data
+WHEN NOT: Routine retraining with known-good parameters (scripts/train.py)
+ALTERNATIVE: Hand-tuning in a notebook (slow, not recorded)
+
+Usage:
+    python scripts/search_hyperparameters.py --model-type xgboost \
+        --resource n_estimators --workers 16 --log models/search_xgboost.jsonl
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from churn_prediction.data.cache import DEFAULT_CACHE_DIR
+from churn_prediction.data.loader import load_data, split_data
+from churn_prediction.evaluation.metrics import evaluate_model, print_metrics
+from churn_prediction.features.engineering import FeatureEngineer
+from churn_prediction.models.search import successive_halving_search
+
+
+# Default search spaces per train_model model type
+PARAM_GRIDS = {
+    "random_forest": {
+        "max_depth": [4, 6, 8, 10, 14, None],
+        "min_samples_leaf": [1, 2, 5, 10],
+        "max_features": ["sqrt", 0.5, 1.0],
+    },
+    "xgboost": {
+        "max_depth": [3, 4, 5, 6, 8],
+        "learning_rate": [0.03, 0.1, 0.3],
+        "subsample": [0.7, 0.85, 1.0],
+        "colsample_bytree": [0.7, 1.0],
+    },
+    "logistic_regression": {
+        "C": [0.01, 0.03, 0.1, 0.3, 1.0, 3.0, 10.0],
+    },
+}
+
+
+def main():
+    """Parse arguments, search on the training split, evaluate on test."""
+    parser = argparse.ArgumentParser(description="Hyperparameter search")
+    parser.add_argument("--data", default="data/raw/customers.csv")
+    parser.add_argument("--model-type", default="random_forest",
+                        choices=sorted(PARAM_GRIDS))
+    parser.add_argument("--resource", default="n_samples",
+                        choices=["n_samples", "n_estimators"])
+    parser.add_argument("--max-resource", type=int, default=None)
+    parser.add_argument("--factor", type=int, default=3)
+    parser.add_argument("--candidates", type=int, default=None,
+                        help="Random sample of the grid (default: full grid)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument("--log", default=None,
+                        help="JSONL results log; rerun with the same log to resume")
+    args = parser.parse_args()
+
+    df = load_data(args.data, cache_dir=DEFAULT_CACHE_DIR)
+    X_train, X_test, y_train, y_test = split_data(df)
+    engineer = FeatureEngineer(categorical="codes")
+    X_train_transformed = engineer.fit_transform(X_train)
+    X_test_transformed = engineer.transform(X_test)
+
+    result = successive_halving_search(
+        X_train_transformed,
+        y_train,
+        PARAM_GRIDS[args.model_type],
+        model_type=args.model_type,
+        resource=args.resource,
+        max_resource=args.max_resource,
+        factor=args.factor,
+        n_candidates=args.candidates,
+        n_workers=args.workers,
+        log_path=args.log or f"models/search_{args.model_type}.jsonl",
+    )
+
+    print("\nBest model on the test split:")
+    print_metrics(evaluate_model(result.best_model, X_test_transformed, y_test))
+
+
+if __name__ == "__main__":
+    main()
@@ -13,22 +13,34 @@ Usage:
 """
 
 import sys
+from functools import partial
 from pathlib import Path
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from churn_prediction.data.cache import DEFAULT_CACHE_DIR
 from churn_prediction.data.loader import load_data, split_data
 from churn_prediction.features.engineering import FeatureEngineer
 from churn_prediction.models.train import train_model, save_model
-from churn_prediction.evaluation.metrics import evaluate_model, print_metrics
+from churn_prediction.evaluation.cross_validation import (
+    cross_validate,
+    print_cv_results,
+)
+from churn_prediction.evaluation.metrics import (
+    binary_metrics,
+    optimal_threshold,
+    print_metrics,
+)
+from churn_prediction.instrumentation import RunProfile
 
 
 def main():
     """
     Main training pipeline.
     
-    WHAT: Orchestrate data loading → feature engineering → training → evaluation
+    WHAT: Orchestrate data loading → cross-validation → feature engineering →
+        training → evaluation
     WHY: Single entry point for training
     WHEN: Model development, retraining
     WHEN NOT: N/A
@@ -46,8 +58,13 @@ def main():
     # ALTERNATIVE: YAML config, command-line args
     DATA_PATH = "data/raw/customers.csv"
     MODEL_PATH = "models/random_forest_model.joblib"
+    ENGINEER_PATH = "models/feature_engineer.joblib"
+    PROFILE_PATH = "models/training_profile.json"
     MODEL_TYPE = "random_forest"
     
+    # Wall/CPU time, peak RSS and rows/s per stage, saved as JSON
+    profile = RunProfile("train", model_type=MODEL_TYPE)
+    
     # For this demo, we'll create synthetic data
     # In real project, data would be in data/raw/
     print("Step 1: Creating synthetic data for demo...")
@@ -55,37 +72,72 @@ def main():
     
     # Load data
     print("\nStep 2: Loading data...")
-    df = load_data(DATA_PATH)
+    with profile.stage("load") as stage:
+        df = load_data(DATA_PATH, cache_dir=DEFAULT_CACHE_DIR)
+        stage["rows"] = len(df)
     
     # Split data
     print("\nStep 3: Splitting data...")
-    X_train, X_test, y_train, y_test = split_data(df)
+    with profile.stage("split", rows=len(df)):
+        X_train, X_test, y_train, y_test = split_data(df)
+    
+    # Cross-validate on the training split (engineer refit per fold)
+    print("\nStep 4: Cross-validating...")
+    with profile.stage("cross_validate", rows=len(X_train)):
+        cv_result = cross_validate(
+            X_train,
+            y_train,
+            model_type=MODEL_TYPE,
+            n_splits=5,
+            engineer_factory=partial(FeatureEngineer, categorical="codes"),
+            n_estimators=100,
+            max_depth=10,
+        )
+    print_cv_results(cv_result)
     
     # Feature engineering
-    print("\nStep 4: Engineering features...")
-    engineer = FeatureEngineer()
-    X_train_transformed = engineer.fit_transform(X_train)
-    X_test_transformed = engineer.transform(X_test)
+    print("\nStep 5: Engineering features...")
+    with profile.stage("transform", rows=len(df)):
+        # Integer-code string columns (contract, payment method, region)
+        engineer = FeatureEngineer(categorical="codes")
+        X_train_transformed = engineer.fit_transform(X_train)
+        X_test_transformed = engineer.transform(X_test)
     
     # Train model
-    print("\nStep 5: Training model...")
-    model = train_model(
-        X_train_transformed,
-        y_train,
-        model_type=MODEL_TYPE,
-        n_estimators=100,
-        max_depth=10,
-        random_state=42
-    )
+    print("\nStep 6: Training model...")
+    with profile.stage("fit", rows=len(X_train_transformed)):
+        model = train_model(
+            X_train_transformed,
+            y_train,
+            model_type=MODEL_TYPE,
+            n_estimators=100,
+            max_depth=10,
+            random_state=42
+        )
     
     # Evaluate model
-    print("\nStep 6: Evaluating model...")
-    metrics = evaluate_model(model, X_test_transformed, y_test)
+    print("\nStep 7: Evaluating model...")
+    with profile.stage("evaluate", rows=len(X_test_transformed)):
+        # One inference, shared by the metrics and the threshold sweep
+        y_test_proba = model.predict_proba(X_test_transformed)[:, 1]
+        metrics = binary_metrics(y_test, y_test_proba)
+        # Campaign threshold with the best net benefit ($1000 revenue, $100 offer)
+        campaign = optimal_threshold(y_test, y_test_proba)
     print_metrics(metrics)
+    print(f"Best campaign threshold: {campaign['threshold']:.3f} "
+          f"(targets {campaign['targeted']} customers, "
+          f"net benefit ${campaign['net_benefit']:,.0f})")
     
     # Save model
-    print("\nStep 7: Saving model...")
-    save_model(model, MODEL_PATH)
+    print("\nStep 8: Saving model...")
+    with profile.stage("save"):
+        save_model(model, MODEL_PATH)
+        # Batch scoring (scripts/score_batch.py) needs the fitted engineer too
+        save_model(engineer, ENGINEER_PATH)
+    
+    profile.print_summary()
+    profile.to_json(PROFILE_PATH)
+    print(f"Stage profile saved to {PROFILE_PATH}")
     
     print("\n" + "="*60)
     print("TRAINING COMPLETE!")
@@ -1,31 +1,271 @@
+import sys
+import warnings
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, Iterable, Optional, Tuple
 
+from churn_prediction.data.cache import DEFAULT_MAX_BYTES, ColumnarCache
 
-def load_data(data_path: str) -> pd.DataFrame:
+
+# WHAT: Declared dtypes for the customer extract
+# WHY: Default int64/float64/object uses several times the memory needed
+# WHEN: Loading customers.csv (or anything with the same columns)
+# WHEN NOT: New columns not listed here (they are downcast from the data)
+# ALTERNATIVE: infer_schema() on a sample
+CUSTOMER_SCHEMA: Dict[str, str] = {
+    "CustomerID": "int32",
+    "Age": "int8",
+    "Tenure": "int16",
+    "MonthlyCharges": "float32",
+    "TotalCharges": "float32",
+    "NumProducts": "int8",
+    "Churn": "int8",
+}
+
+# Object columns with more distinct values than this share of rows stay as
+# strings - a categorical of mostly-unique values is bigger, not smaller
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+def _csv_engine() -> str:
+    """Use the columnar pyarrow parser when it is installed."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return "c"
+    return "pyarrow"
+
+
+def infer_schema(data_path: str, sample_rows: int = 10_000) -> Dict[str, str]:
+    """
+    Infer compact dtypes from the first rows of a CSV.
+
+    WHAT: Map each column to the smallest dtype that fits the sample
+    WHY: Schema-less extracts still get memory-lean loading
+    WHEN: No declared schema exists for the file
+    WHEN NOT: Known layouts (use CUSTOMER_SCHEMA - it is checked, not guessed)
+    ALTERNATIVE: Declare the schema by hand
+
+    Args:
+        data_path: Path to CSV file
+        sample_rows: Number of rows to inspect
+
+    Returns:
+        Dictionary of column name -> dtype string
+    """
+    sample = pd.read_csv(data_path, nrows=sample_rows)
+    schema = {}
+
+    for col in sample.columns:
+        series = sample[col]
+        if pd.api.types.is_bool_dtype(series):
+            schema[col] = "bool"
+        elif pd.api.types.is_integer_dtype(series):
+            schema[col] = str(pd.to_numeric(series, downcast="integer").dtype)
+        elif pd.api.types.is_float_dtype(series):
+            schema[col] = "float32"
+        elif series.nunique() <= CATEGORY_MAX_UNIQUE_RATIO * len(series):
+            schema[col] = "category"
+
+    return schema
+
+
+def _apply_schema(df: pd.DataFrame, schema: Dict[str, str],
+                  strict: bool) -> pd.DataFrame:
+    """
+    Cast integer columns to their narrow schema dtype after parsing.
+
+    Parsers wrap out-of-range integers silently (300 as int8 -> 44), so
+    integers are parsed at full width and range-checked here. Declared
+    schemas (strict) raise; inferred ones fall back to the data's own range.
+    """
+    for col, dtype in schema.items():
+        if col not in df.columns:
+            continue
+        # pandas_dtype also understands extension names ("category", "string")
+        target = pd.api.types.pandas_dtype(dtype)
+        if not isinstance(target, np.dtype) or target.kind not in "iu":
+            continue
+
+        series = df[col]
+        if not pd.api.types.is_integer_dtype(series):
+            if strict:
+                raise ValueError(
+                    f"Column '{col}' is not integer, cannot cast to {target}"
+                )
+            continue
+
+        info = np.iinfo(target)
+        lo, hi = series.min(), series.max()
+        if lo < info.min or hi > info.max:
+            if strict:
+                raise ValueError(
+                    f"Column '{col}' range [{lo}, {hi}] does not fit {target}"
+                )
+            df[col] = pd.to_numeric(series, downcast="integer")
+        else:
+            df[col] = series.astype(target)
+
+    return df
+
+
+def downcast_dtypes(df: pd.DataFrame, exclude: Iterable[str] = ()) -> pd.DataFrame:
+    """
+    Downcast every column to the smallest safe dtype, in place.
+
+    WHAT: int64 -> int8/16/32, float64 -> float32, strings -> category
+    WHY: Cuts memory of wide frames several times over
+    WHEN: After loading, before heavy processing
+    WHEN NOT: float64 precision is genuinely needed
+    ALTERNATIVE: Declared schema at load time
+
+    Columns in exclude (e.g. a declared schema) keep their dtype.
+    """
+    exclude = set(exclude)
+    for col in df.columns:
+        if col in exclude:
+            continue
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_float_dtype(series) and series.dtype != np.float32:
+            df[col] = series.astype(np.float32)
+        elif (series.dtype == object
+              and series.nunique() <= CATEGORY_MAX_UNIQUE_RATIO * len(series)):
+            df[col] = series.astype("category")
+
+    return df
+
+
+def memory_report(df: pd.DataFrame) -> Dict[str, int]:
+    """
+    Compare actual memory with what default dtypes would use.
+
+    WHAT: Bytes used now vs. int64/float64/object equivalents
+    WHY: Quantify the saving of typed loading
+    WHEN: After typed loading
+    WHEN NOT: Frames already loaded with default dtypes (nothing saved)
+    ALTERNATIVE: Load twice and compare (doubles the memory we try to save)
+
+    Returns:
+        Dictionary with default_bytes, optimized_bytes, saved_bytes
+    """
+    n_rows = len(df)
+    optimized = int(df.memory_usage(deep=True).sum())
+    default = int(df.index.memory_usage(deep=True))
+
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Object column: one pointer per row plus one str object per row
+            counts = np.bincount(series.cat.codes[series.cat.codes >= 0],
+                                 minlength=len(series.cat.categories))
+            sizes = np.array([sys.getsizeof(c) for c in series.cat.categories])
+            default += 8 * n_rows + int(counts @ sizes) if len(sizes) else 8 * n_rows
+        elif pd.api.types.is_bool_dtype(series) or series.dtype == object:
+            default += int(series.memory_usage(index=False, deep=True))
+        else:
+            default += 8 * n_rows
+
+    return {
+        "default_bytes": default,
+        "optimized_bytes": optimized,
+        "saved_bytes": default - optimized,
+    }
+
+
+def _read_csv(path: Path,
+              schema: Optional[Dict[str, str]],
+              optimize_memory: bool,
+              sample_rows: int) -> pd.DataFrame:
+    """Parse a CSV, typed and downcast unless both options are off."""
+    if schema is None and not optimize_memory:
+        return pd.read_csv(path)
+
+    strict = schema is not None
+    if schema is None:
+        schema = infer_schema(str(path), sample_rows)
+
+    # Floats and categories are safe to narrow while parsing; integers are
+    # narrowed afterwards by _apply_schema (parsers wrap on overflow)
+    parse_dtypes = {}
+    for col, dtype in schema.items():
+        target = pd.api.types.pandas_dtype(dtype)
+        if not isinstance(target, np.dtype) or target.kind == "f":
+            parse_dtypes[col] = dtype
+    df = pd.read_csv(path, dtype=parse_dtypes, engine=_csv_engine())
+    df = _apply_schema(df, schema, strict=strict)
+    # A declared schema is final: only columns it does not list are narrowed
+    # from the data, so dtypes do not change from file to file
+    return downcast_dtypes(df, exclude=schema if strict else ())
+
+
+def load_data(data_path: str,
+              schema: Optional[Dict[str, str]] = None,
+              optimize_memory: bool = False,
+              sample_rows: int = 10_000,
+              cache_dir: Optional[str] = None,
+              cache_max_bytes: int = DEFAULT_MAX_BYTES) -> pd.DataFrame:
     """
     Loads customer data from csv
+
+    With a schema (or optimize_memory=True, which infers one from the first
+    sample_rows rows) the file is read with the columnar engine when
+    available and every column is downcast to its smallest safe dtype.
+
+    With cache_dir (e.g. DEFAULT_CACHE_DIR) the parsed frame is kept in a
+    columnar cache keyed by the file's content, and later loads of the
+    unchanged file are memory-mapped instead of parsed.
     """
 
     path = Path(data_path)
 
     if not path.exists():
         raise FileNotFoundError(f"Data not found in {path}")
-    
-    df = pd.read_csv(path)
+
+    cache = key = None
+    if cache_dir is not None:
+        cache = ColumnarCache(cache_dir, max_bytes=cache_max_bytes)
+        key = cache.key(str(path), schema=schema, optimize_memory=optimize_memory,
+                        sample_rows=sample_rows)
+        df = cache.get(key)
+        if df is not None:
+            print(f"Loaded ( {len(df)} ) records from cache : {cache_dir}/{key}")
+            return df
+
+    df = _read_csv(path, schema, optimize_memory, sample_rows)
     print(f"Loaded ( {len(df)} ) records from Path : {data_path}")
 
+    if schema is not None or optimize_memory:
+        report = memory_report(df)
+        print(f"Memory: {report['default_bytes'] / 1e6:.2f} MB -> "
+              f"{report['optimized_bytes'] / 1e6:.2f} MB "
+              f"(saved {report['saved_bytes'] / max(report['default_bytes'], 1):.1%})")
+
+    if cache is not None and not cache.put(key, df):
+        print("Frame not cached (unsupported dtypes or larger than cache limit)")
+
     return df
 
 def split_data(df:pd.DataFrame, 
                target_col:str = 'Churn', 
                test_size:float = 0.2, 
-               ranom_state: int = 42) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
+               random_state: int = 42,
+               ranom_state: Optional[int] = None,
+               ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
+    if ranom_state is not None:
+        # Misspelled original name, still accepted for existing callers
+        warnings.warn("split_data(ranom_state=...) is deprecated, use random_state",
+                      DeprecationWarning, stacklevel=2)
+        random_state = ranom_state
     X, y = df.drop(columns=[target_col], axis=1), df[target_col]
     from sklearn.model_selection import train_test_split
 
-    X_train, X_test, y_train, y_test =  train_test_split(X, y, test_size=test_size, random_state=ranom_state,
+    X_train, X_test, y_train, y_test =  train_test_split(X, y, test_size=test_size,
+                                                         random_state=random_state,
                                                          stratify = y)
     
     print(f"Train: {len(X_train)} | Test: {len(X_test)}")
@@ -35,4 +275,121 @@ def split_data(df:pd.DataFrame,
     return X_train, X_test, y_train, y_test
 
 
+def _hash_uniform(ids: np.ndarray, random_state: int) -> np.ndarray:
+    """Deterministic uniform [0, 1) value per ID, seeded by random_state."""
+    ids = np.asarray(ids)
+    if ids.dtype.kind in "iu":
+        z = ids.astype(np.uint64)
+    else:
+        z = pd.util.hash_array(ids, categorize=False)
+
+    # splitmix64 finaliser over (id + seed); uint64 array arithmetic wraps
+    offset = (random_state * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    z = z + np.uint64(offset)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z = z ^ (z >> np.uint64(31))
+
+    # Top 53 bits -> exactly representable float in [0, 1)
+    return (z >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+
+
+# Hash histogram resolution per class for stream_split's thresholds
+_SPLIT_BINS = 1 << 20
+
+
+def stream_split(data_path: str,
+                 train_path: str,
+                 test_path: str,
+                 target_col: str = 'Churn',
+                 id_col: str = 'CustomerID',
+                 test_size: float = 0.2,
+                 random_state: int = 42,
+                 chunksize: int = 100_000) -> Dict[str, float]:
+    """
+    Split a CSV into train/test files in bounded memory, stratified on target_col.
+
+    WHAT: Pass 1 reads only the ID and label columns and histograms a
+        seeded hash of each ID per class; each class gets its own hash
+        threshold so that test_size of that class falls below it. Pass 2
+        assigns each row by (ID hash < its class's threshold), chunk by chunk
+    WHY: split_data needs the whole frame (plus two copies) in RAM
+    WHEN: Datasets larger than memory
+    WHEN NOT: Small data (split_data reads the file once)
+    ALTERNATIVE: Sample row numbers up front (needs the row count first)
+
+    The assignment depends only on (ID, class, random_state) and the class
+    totals, never on chunk size, row order or other rows' IDs, so reruns
+    and re-chunked runs produce the same split. Every class, including
+    rare ones, gets round(test_size * class rows) test rows, up to the
+    rows sharing one of 2**20 hash bins (none for classes below ~100k rows).
+
+    Args:
+        data_path: Source CSV
+        train_path: Output CSV for train rows (overwritten)
+        test_path: Output CSV for test rows (overwritten)
+        target_col: Label column to stratify on
+        id_col: Stable row identifier to hash
+        test_size: Share of rows assigned to test
+        random_state: Seed of the hash
+        chunksize: Rows held in memory at a time
+
+    Returns:
+        Dictionary with train/test row counts and churn rates
+    """
+    path = Path(data_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Data not found in {path}")
+
+    def hash_bins(chunk: pd.DataFrame) -> np.ndarray:
+        u = _hash_uniform(chunk[id_col].to_numpy(), random_state)
+        return (u * _SPLIT_BINS).astype(np.int64)
+
+    # Pass 1: per-class histogram of the ID hashes (label and ID columns only)
+    histograms: Dict[object, np.ndarray] = {}
+    for chunk in pd.read_csv(path, usecols=[id_col, target_col], chunksize=chunksize):
+        bins = hash_bins(chunk)
+        labels = chunk[target_col].to_numpy()
+        for label in pd.unique(labels):
+            counts = np.bincount(bins[labels == label], minlength=_SPLIT_BINS)
+            histograms[label] = histograms.get(label, 0) + counts
+
+    # Threshold bin per class: cumulative count closest to the class's quota
+    thresholds = {}
+    for label, histogram in histograms.items():
+        cumulative = np.r_[0, np.cumsum(histogram)]
+        quota = round(test_size * cumulative[-1])
+        thresholds[label] = int(np.argmin(np.abs(cumulative - quota)))
+
+    counts = {"train": 0, "test": 0}
+    positives = {"train": 0, "test": 0}
+    outputs = {"train": Path(train_path), "test": Path(test_path)}
+    for out in outputs.values():
+        out.parent.mkdir(parents=True, exist_ok=True)
+
+    # Pass 2: write rows below their class's threshold to test
+    first = True
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        limit = chunk[target_col].map(thresholds).to_numpy()
+        is_test = hash_bins(chunk) < limit
+
+        for name, mask in (("train", ~is_test), ("test", is_test)):
+            part = chunk[mask]
+            part.to_csv(outputs[name], mode="w" if first else "a",
+                        header=first, index=False)
+            counts[name] += len(part)
+            positives[name] += int(part[target_col].sum())
+        first = False
+
+    result = {
+        "train": counts["train"],
+        "test": counts["test"],
+        "train_churn_rate": positives["train"] / max(counts["train"], 1),
+        "test_churn_rate": positives["test"] / max(counts["test"], 1),
+    }
+
+    print(f"Train: {result['train']} | Test: {result['test']}")
+    print(f"Train churn rate: {result['train_churn_rate']:.2%}")
+    print(f"Test churn rate: {result['test_churn_rate']:.2%}")
 
+    return result
@@ -0,0 +1,190 @@
+"""
+Partitioned (multi-file) data ingestion.
+
+WHAT: Load many CSV partitions (e.g. one per day) as one dataset
+WHY: Raw data arrives as daily files, not a single customers.csv
+WHEN: Directory or glob of partitions
+WHEN NOT: Single file (use load_data directly)
+ALTERNATIVE: Concatenate files by hand before loading (slow, extra disk)
+"""
+
+import glob
+import os
+import re
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import partial
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Union
+
+from churn_prediction.data.loader import load_data
+
+
+# YYYY-MM-DD or YYYYMMDD, in the file name or a hive-style dir (date=...)
+_DATE_PATTERN = re.compile(r"(?<!\d)(\d{4})-?(\d{2})-?(\d{2})(?!\d)")
+
+
+def partition_date(path: Union[str, Path]) -> Optional[date]:
+    """
+    Date encoded in a partition path.
+
+    The innermost path component with a date wins, so
+    raw/date=2024-01-15/part-0.csv and raw/customers_20240115.csv both
+    resolve to 2024-01-15.
+
+    Returns:
+        Partition date, or None if the path carries no date
+    """
+    for part in reversed(Path(path).parts):
+        match = _DATE_PATTERN.search(part)
+        if match:
+            try:
+                return date(*(int(g) for g in match.groups()))
+            except ValueError:
+                continue
+    return None
+
+
+def list_partitions(source: Union[str, Path],
+                    pattern: str = "*.csv",
+                    start_date: Optional[date] = None,
+                    end_date: Optional[date] = None) -> List[Path]:
+    """
+    Resolve and prune the partitions of a dataset.
+
+    WHAT: Expand a directory/glob to files, drop those outside the date range
+    WHY: Pruning by path is free; pruning after parsing is not
+    WHEN: Before loading partitions
+    WHEN NOT: N/A
+    ALTERNATIVE: Load everything and filter rows (reads unneeded files)
+
+    Args:
+        source: Directory (searched recursively for pattern), glob, or file
+        pattern: File pattern used when source is a directory
+        start_date: First date to keep (inclusive)
+        end_date: Last date to keep (inclusive)
+
+    Returns:
+        Sorted list of partition paths. With a date range, partitions
+        without a date in their path are dropped.
+    """
+    source = str(source)
+    if os.path.isdir(source):
+        paths = [p for p in Path(source).rglob(pattern) if p.is_file()]
+    elif glob.has_magic(source):
+        paths = [Path(p) for p in glob.glob(source, recursive=True)
+                 if os.path.isfile(p)]
+    else:
+        paths = [Path(source)]
+
+    if start_date is not None or end_date is not None:
+        kept = []
+        for path in paths:
+            day = partition_date(path)
+            if day is None:
+                continue
+            if start_date is not None and day < start_date:
+                continue
+            if end_date is not None and day > end_date:
+                continue
+            kept.append(path)
+        paths = kept
+
+    return sorted(paths, key=lambda p: (partition_date(p) or date.min, str(p)))
+
+
+def iter_partitions(source: Union[str, Path],
+                    pattern: str = "*.csv",
+                    start_date: Optional[date] = None,
+                    end_date: Optional[date] = None,
+                    max_workers: Optional[int] = 1,
+                    **load_kwargs: Any) -> Iterator[pd.DataFrame]:
+    """
+    Yield partitions one at a time, in date order.
+
+    WHAT: Generator over loaded partitions
+    WHY: Out-of-core consumers only hold one partition (plus prefetch)
+    WHEN: Streaming training/scoring over many days of data
+    WHEN NOT: Data fits in memory (use load_partitions)
+    ALTERNATIVE: load_partitions + chunking (needs all data in RAM)
+
+    Args:
+        source, pattern, start_date, end_date: See list_partitions
+        max_workers: Worker processes parsing ahead of the consumer
+            (1 = parse in this process, None = one per CPU)
+        **load_kwargs: Passed to load_data (schema, optimize_memory, ...)
+    """
+    paths = list_partitions(source, pattern, start_date, end_date)
+    loader = partial(load_data, **load_kwargs)
+
+    if max_workers == 1 or len(paths) <= 1:
+        for path in paths:
+            yield loader(str(path))
+        return
+
+    max_workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        # Keep at most max_workers partitions in flight to bound memory
+        pending = [pool.submit(loader, str(p)) for p in paths[:max_workers]]
+        next_path = max_workers
+        while pending:
+            df = pending.pop(0).result()
+            if next_path < len(paths):
+                pending.append(pool.submit(loader, str(paths[next_path])))
+                next_path += 1
+            yield df
+
+
+def load_partitions(source: Union[str, Path],
+                    pattern: str = "*.csv",
+                    start_date: Optional[date] = None,
+                    end_date: Optional[date] = None,
+                    max_workers: Optional[int] = None,
+                    **load_kwargs: Any) -> pd.DataFrame:
+    """
+    Load partitions concurrently and concatenate them.
+
+    WHAT: Parse partitions in a process pool, then one concat
+    WHY: CSV parsing is CPU-bound; partitions parse independently
+    WHEN: Many partitions, multi-core machine
+    WHEN NOT: Data larger than RAM (use iter_partitions)
+    ALTERNATIVE: Sequential load_data per file (one core)
+
+    Categorical columns are unified to a shared category set (a code remap,
+    no string copies) so concat keeps them categorical instead of falling
+    back to object.
+
+    Args:
+        source, pattern, start_date, end_date: See list_partitions
+        max_workers: Worker processes (None = one per CPU)
+        **load_kwargs: Passed to load_data
+
+    Returns:
+        Single DataFrame with a fresh RangeIndex
+    """
+    frames = list(iter_partitions(source, pattern, start_date, end_date,
+                                  max_workers=max_workers, **load_kwargs))
+    if not frames:
+        raise FileNotFoundError(f"No partitions found in {source}")
+
+    _unify_categories(frames)
+    df = pd.concat(frames, ignore_index=True, copy=False)
+    print(f"Loaded ( {len(df)} ) records from {len(frames)} partitions : {source}")
+
+    return df
+
+
+def _unify_categories(frames: List[pd.DataFrame]) -> None:
+    """Give each categorical column the same categories in every frame."""
+    for col in frames[0].columns:
+        if not all(
+            col in f.columns and isinstance(f[col].dtype, pd.CategoricalDtype)
+            for f in frames
+        ):
+            continue
+        categories = pd.Index([])
+        for f in frames:
+            categories = categories.union(f[col].cat.categories, sort=False)
+        for f in frames:
+            f[col] = f[col].cat.set_categories(categories)
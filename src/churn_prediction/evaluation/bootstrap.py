@@ -0,0 +1,223 @@
+"""
+Bootstrap confidence intervals for evaluation and business metrics.
+
+WHAT: Resample the holdout with replacement thousands of times and report
+    percentile intervals for every evaluate_model and
+    calculate_business_metrics output
+WHY: A ROC AUC of 0.89 on one holdout may just as well be 0.87 or 0.91;
+    merge decisions on a point estimate follow the noise
+WHEN: Comparing a candidate model against a fixed bar or a baseline
+WHEN NOT: Time-dependent errors (resample whole periods instead)
+ALTERNATIVE: cross_validate (spread across refits, not across test rows)
+
+Replicates are never looped over in Python. A batch of B replicates is a
+(B, n) matrix of resampled positions turned into per-row weights with one
+bincount; confusion counts are weight-matrix products and ROC AUC comes
+from np.add.reduceat over tie groups of the scores, sorted once. Batches
+are seeded from SeedSequence(random_state).spawn(), so results do not
+depend on how many workers run them.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from churn_prediction.evaluation.metrics import (
+    _business_metrics,
+    binary_metrics,
+    calculate_business_metrics,
+)
+from churn_prediction.models.train import init_worker_threads, parallel_section
+
+
+# Replicates per seeded block (fixed, so results do not depend on n_workers)
+_BLOCK_REPLICATES = 256
+# Resampled positions held at once per batch (B x n)
+_BATCH_ELEMENTS = 1 << 22
+
+# Set once per worker process by _init_worker
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+class BootstrapResult(NamedTuple):
+    """Point estimates, percentile intervals and the replicate table."""
+    estimates: Dict[str, float]
+    intervals: Dict[str, Tuple[float, float]]
+    replicates: pd.DataFrame
+    confidence: float
+
+
+def _init_worker(positive: np.ndarray, predicted: np.ndarray, group_starts: np.ndarray,
+                 revenue_per_customer: float, retention_cost: float,
+                 n_threads: Optional[int] = None) -> None:
+    """Receive the sorted holdout once per worker."""
+    if n_threads is not None:
+        init_worker_threads(n_threads)
+    _WORKER_STATE.update(
+        positive=positive.astype(np.float64),
+        negative=(~positive).astype(np.float64),
+        masks=np.stack([~positive & ~predicted, ~positive & predicted,
+                        positive & ~predicted, positive & predicted],
+                       axis=1).astype(np.float64),
+        group_starts=group_starts,
+        revenue_per_customer=revenue_per_customer,
+        retention_cost=retention_cost,
+    )
+
+
+def _replicate_batch(
+    rng: np.random.Generator, n_replicates: int
+) -> Dict[str, np.ndarray]:
+    """Metrics of n_replicates bootstrap samples, as arrays."""
+    state = _WORKER_STATE
+    n = len(state["positive"])
+
+    # Resampled positions → how often each row is drawn in each replicate
+    draws = rng.integers(0, n, size=(n_replicates, n))
+    draws += (np.arange(n_replicates) * n)[:, None]
+    weights = np.bincount(draws.ravel(), minlength=n_replicates * n)
+    weights = weights.reshape(n_replicates, n).astype(np.float64)
+    del draws
+
+    tn, fp, fn, tp = (weights @ state["masks"]).T
+    n_pos, n_neg = tp + fn, tn + fp
+
+    # Weighted positives / negatives per tie group, highest scores first
+    pos = np.add.reduceat(weights * state["positive"], state["group_starts"], axis=1)
+    neg = np.add.reduceat(weights * state["negative"], state["group_starts"], axis=1)
+    pos_above = np.cumsum(pos, axis=1) - pos
+    pairs = np.einsum("ij,ij->i", neg, pos_above + 0.5 * pos)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        metrics = {
+            "accuracy": (tp + tn) / n,
+            "precision": np.where(tp + fp > 0, tp / np.maximum(tp + fp, 1), 0.0),
+            "recall": np.where(n_pos > 0, tp / np.maximum(n_pos, 1), 0.0),
+            "f1": np.where(tp > 0, 2 * tp / np.maximum(2 * tp + fp + fn, 1), 0.0),
+            # Undefined with a single class in the replicate
+            "roc_auc": np.where((n_pos > 0) & (n_neg > 0),
+                                pairs / (n_pos * n_neg), np.nan),
+        }
+    metrics.update(_business_metrics(tp, fp, fn, state["revenue_per_customer"],
+                                     state["retention_cost"]))
+    return metrics
+
+
+def _run_block(
+    seed: np.random.SeedSequence, n_replicates: int
+) -> Dict[str, np.ndarray]:
+    """One seeded block of replicates, in batches of bounded memory."""
+    rng = np.random.default_rng(seed)
+    n = len(_WORKER_STATE["positive"])
+    batch = max(1, min(n_replicates, _BATCH_ELEMENTS // max(n, 1)))
+    parts = [_replicate_batch(rng, min(batch, n_replicates - start))
+             for start in range(0, n_replicates, batch)]
+    return {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+
+
+def bootstrap_metrics(y_true, y_pred_proba,
+                      n_replicates: int = 10_000,
+                      confidence: float = 0.95,
+                      threshold: float = 0.5,
+                      revenue_per_customer: float = 1000.0,
+                      retention_cost: float = 100.0,
+                      n_workers: Optional[int] = None,
+                      random_state: int = 42) -> BootstrapResult:
+    """
+    Percentile bootstrap intervals of evaluation and business metrics.
+
+    WHAT: n_replicates resamples of (label, probability) pairs; each gets
+        binary_metrics (labels = probability > threshold) and
+        calculate_business_metrics; intervals are the (1 - confidence) / 2
+        percentiles of the replicates
+    WHY: Shows how far the holdout estimate can move by chance
+    WHEN: Merge / deploy decisions against a fixed metric bar
+    WHEN NOT: Tiny holdouts with a handful of churners (intervals unstable)
+    ALTERNATIVE: DeLong's test for ROC AUC only
+
+    Args:
+        y_true: Actual churn labels (0/1)
+        y_pred_proba: Predicted churn probabilities (one inference, reused)
+        n_replicates: Bootstrap samples
+        confidence: Interval coverage (0.95 = 2.5th to 97.5th percentile)
+        threshold: Churn probability above which a customer is predicted to churn
+        revenue_per_customer: Average annual revenue of a customer
+        retention_cost: Cost of one retention offer
+        n_workers: Worker processes (None = one per CPU, 1 = in-process)
+        random_state: Seed; the same seed gives the same replicates for
+            any n_workers
+
+    Returns:
+        BootstrapResult; ROC AUC replicates with a single class are NaN
+        and left out of its interval
+    """
+    positive = np.asarray(y_true) == 1
+    scores = np.asarray(y_pred_proba, dtype=np.float64)
+    order = np.argsort(-scores, kind="stable")
+    sorted_scores = scores[order]
+    positive_sorted = positive[order]
+    predicted_sorted = sorted_scores > threshold
+    group_starts = np.r_[0, np.flatnonzero(np.diff(sorted_scores)) + 1]
+
+    estimates = binary_metrics(positive.astype(int), scores, threshold)
+    estimates.pop("confusion_matrix")
+    estimates.update(calculate_business_metrics(
+        positive.astype(int), (scores > threshold).astype(int), scores,
+        revenue_per_customer, retention_cost,
+    ))
+
+    n_blocks = math.ceil(n_replicates / _BLOCK_REPLICATES)
+    seeds = np.random.SeedSequence(random_state).spawn(n_blocks)
+    sizes = [min(_BLOCK_REPLICATES, n_replicates - i * _BLOCK_REPLICATES)
+             for i in range(n_blocks)]
+    initargs = (positive_sorted, predicted_sorted, group_starts,
+                revenue_per_customer, retention_cost)
+    n_workers = min(n_workers or os.cpu_count() or 1, n_blocks)
+
+    blocks: List[Dict[str, np.ndarray]]
+    if n_workers > 1:
+        with parallel_section(n_workers) as n_threads:
+            initargs = (*initargs, n_threads)
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                 initargs=initargs) as pool:
+            blocks = list(pool.map(_run_block, seeds, sizes))
+    else:
+        _init_worker(*initargs)
+        try:
+            blocks = [_run_block(seed, size) for seed, size in zip(seeds, sizes)]
+        finally:
+            _WORKER_STATE.clear()
+
+    replicates = pd.DataFrame(
+        {k: np.concatenate([b[k] for b in blocks]) for k in blocks[0]}
+    )
+    alpha = (1 - confidence) / 2 * 100
+    intervals = {
+        metric: tuple(
+            float(v)
+            for v in np.nanpercentile(replicates[metric], [alpha, 100 - alpha])
+        )
+        for metric in replicates.columns
+    }
+    return BootstrapResult(estimates=estimates, intervals=intervals,
+                           replicates=replicates, confidence=confidence)
+
+
+def bootstrap_evaluate(model: Any, X_test, y_test, **kwargs: Any) -> BootstrapResult:
+    """bootstrap_metrics of a model's holdout predictions (one predict_proba call)."""
+    return bootstrap_metrics(y_test, model.predict_proba(X_test)[:, 1], **kwargs)
+
+
+def print_bootstrap_results(result: BootstrapResult) -> None:
+    """Print every metric with its confidence interval."""
+    print("\n" + "="*60)
+    print(f"BOOTSTRAP {result.confidence:.0%} CONFIDENCE INTERVALS "
+          f"({len(result.replicates)} replicates)")
+    print("="*60)
+    for metric, (low, high) in result.intervals.items():
+        estimate = result.estimates[metric]
+        print(f"{metric:>17s}: {estimate:>14,.4f}  [{low:,.4f}, {high:,.4f}]")
+    print("="*60 + "\n")
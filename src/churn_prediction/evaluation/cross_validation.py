@@ -0,0 +1,223 @@
+"""
+Fold-parallel cross-validation over a shared read-only feature matrix.
+
+WHAT: K stratified folds run in worker processes; each refits a fresh
+    FeatureEngineer on its training rows, trains with train_model and
+    scores with evaluate_model; metrics are aggregated as mean ± std
+WHY: One split_data holdout is a single noisy estimate, and naive
+    parallel K-fold pickles the whole training matrix into every worker
+WHEN: Comparing models or parameters before trusting a holdout number
+WHEN NOT: Time-ordered data (folds must not train on the future)
+ALTERNATIVE: sklearn cross_validate with a Pipeline (copies X per worker
+    with the loky backend; memmaps only above max_nbytes)
+
+The raw numeric columns are written once to .npy files (on /dev/shm when
+available) and mapped read-only by every worker, so the parent's matrix
+is never copied into a worker. The transformed matrix cannot be shared:
+the engineer is refit per fold, so scaling statistics and vocabularies
+come from that fold's training rows only. Each worker materializes only
+its own fold's rows.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import KFold, StratifiedKFold
+
+from churn_prediction.evaluation.metrics import evaluate_model
+from churn_prediction.features.engineering import FeatureEngineer
+from churn_prediction.models.shared import shared_directory
+from churn_prediction.models.train import (
+    init_worker_threads,
+    parallel_section,
+    train_model,
+)
+
+
+# Set once per worker process by _init_worker
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+class CVResult(NamedTuple):
+    """Per-fold metrics and their mean / std across folds."""
+    folds: pd.DataFrame
+    summary: Dict[str, Dict[str, float]]
+
+
+def _write_columns(X: pd.DataFrame, directory: Path) -> List[Dict[str, Any]]:
+    """
+    Write numeric columns as one column-major .npy per dtype.
+
+    Returns the block layout: path (or None plus the frame itself for
+    non-numeric columns, which are small enough to send to each worker).
+    """
+    blocks: List[Dict[str, Any]] = []
+    numeric = X.select_dtypes(include=[np.number])
+    by_dtype: Dict[np.dtype, List[str]] = {}
+    for col, dtype in numeric.dtypes.items():
+        by_dtype.setdefault(dtype, []).append(col)
+
+    for i, (dtype, columns) in enumerate(by_dtype.items()):
+        path = str(directory / f"block{i}.npy")
+        # Fortran order: each column is contiguous, written without an
+        # intermediate 2-D copy of the frame
+        matrix = np.lib.format.open_memmap(path, mode="w+", dtype=dtype,
+                                           shape=(len(X), len(columns)),
+                                           fortran_order=True)
+        for j, col in enumerate(columns):
+            matrix[:, j] = X[col].to_numpy()
+        matrix.flush()
+        del matrix
+        blocks.append({"columns": columns, "path": path})
+
+    other = X.drop(columns=numeric.columns)
+    if len(other.columns):
+        blocks.append({"columns": list(other.columns),
+                       "frame": other.reset_index(drop=True)})
+    return blocks
+
+
+def _init_worker(blocks: List[Dict[str, Any]], columns: List[str], y: np.ndarray,
+                 n_threads: Optional[int] = None) -> None:
+    """Map the shared column blocks read-only, once per worker."""
+    if n_threads is not None:
+        init_worker_threads(n_threads)
+    frames = []
+    for block in blocks:
+        if "path" in block:
+            matrix = np.load(block["path"], mmap_mode="r")
+            frames.append(pd.DataFrame(matrix, columns=block["columns"], copy=False))
+        else:
+            frames.append(block["frame"])
+    _WORKER_STATE.update(frames=frames, columns=columns, y=y)
+
+
+def _fold_frame(rows: np.ndarray) -> pd.DataFrame:
+    """The given rows of the shared matrix, in the original column order."""
+    parts = [frame.iloc[rows] for frame in _WORKER_STATE["frames"]]
+    X = parts[0] if len(parts) == 1 else pd.concat(parts, axis=1)
+    return X[_WORKER_STATE["columns"]].reset_index(drop=True)
+
+
+def _run_fold(fold: int, train_rows: np.ndarray, test_rows: np.ndarray,
+              model_type: str, model_params: Dict[str, Any],
+              engineer_factory: Callable[[], Any]) -> Dict[str, Any]:
+    """Refit the engineer on the fold's training rows, train and evaluate."""
+    y = _WORKER_STATE["y"]
+    start = time.perf_counter()
+    engineer = engineer_factory()
+    X_train = engineer.fit_transform(_fold_frame(train_rows))
+    X_test = engineer.transform(_fold_frame(test_rows))
+
+    model = train_model(X_train, y[train_rows], model_type, verbose=False,
+                        **model_params)
+    metrics = evaluate_model(model, X_test, y[test_rows])
+    return {
+        "fold": fold,
+        "train_rows": len(train_rows),
+        "test_rows": len(test_rows),
+        **metrics,
+        "fit_seconds": time.perf_counter() - start,
+    }
+
+
+def cross_validate(X: pd.DataFrame, y,
+                   model_type: str = "random_forest",
+                   n_splits: int = 5,
+                   stratified: bool = True,
+                   n_workers: Optional[int] = None,
+                   engineer_factory: Callable[[], Any] = FeatureEngineer,
+                   random_state: int = 42,
+                   directory: Optional[str] = None,
+                   **model_params) -> CVResult:
+    """
+    K-fold cross-validation of train_model, folds in parallel processes.
+
+    WHAT: Raw columns → shared .npy files → one task per fold (refit
+        engineer, train, evaluate_model) → per-fold table + mean/std
+    WHY: A spread across folds shows whether a metric difference between
+        two models is real; workers share one copy of the data
+    WHEN: Before model selection, or next to the split_data holdout
+    WHEN NOT: Very small data with rare positives (use fewer splits)
+    ALTERNATIVE: Repeated holdouts (overlapping test sets, biased spread)
+
+    Args:
+        X: Raw (untransformed) features, as passed to FeatureEngineer
+        y: Labels
+        model_type: Any train_model model type
+        n_splits: Number of folds
+        stratified: Keep the churn rate equal across folds
+        n_workers: Worker processes (None = min(n_splits, CPUs), 1 = in-process)
+        engineer_factory: Builds a fresh, unfitted engineer per fold
+            (picklable for n_workers > 1, e.g. functools.partial(
+            FeatureEngineer, categorical="codes") for string columns)
+        random_state: Seed for fold assignment (and models without one)
+        directory: Where to write the shared matrix (default /dev/shm)
+        **model_params: train_model hyperparameters
+
+    Returns:
+        CVResult: folds (one row per fold, confusion_matrix included) and
+        summary {metric: {"mean", "std"}} (std across folds, ddof=1)
+    """
+    X = pd.DataFrame(X).reset_index(drop=True)
+    y = np.asarray(y)
+    splitter = (StratifiedKFold if stratified else KFold)(
+        n_splits=n_splits, shuffle=True, random_state=random_state,
+    )
+    splits = list(splitter.split(np.zeros(len(y)), y))
+    model_params.setdefault("random_state", random_state)
+    n_workers = n_workers or min(n_splits, os.cpu_count() or 1)
+
+    workdir = Path(tempfile.mkdtemp(prefix="churn-cv-",
+                                    dir=directory or shared_directory()))
+    try:
+        blocks = _write_columns(X, workdir)
+        if n_workers > 1:
+            with parallel_section(n_workers) as n_threads:
+                initargs = (blocks, list(X.columns), y, n_threads)
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                     initargs=initargs) as pool:
+                futures = [pool.submit(_run_fold, fold, train_rows, test_rows,
+                                       model_type, model_params, engineer_factory)
+                           for fold, (train_rows, test_rows) in enumerate(splits)]
+                records = [f.result() for f in futures]
+        else:
+            _init_worker(blocks, list(X.columns), y)
+            try:
+                records = [_run_fold(fold, train_rows, test_rows, model_type,
+                                     model_params, engineer_factory)
+                           for fold, (train_rows, test_rows) in enumerate(splits)]
+            finally:
+                _WORKER_STATE.clear()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    folds = pd.DataFrame(records)
+    bookkeeping = ("fold", "train_rows", "test_rows", "confusion_matrix", "fit_seconds")
+    metric_cols = [c for c in folds.columns if c not in bookkeeping]
+    summary = {
+        metric: {"mean": float(folds[metric].mean()), "std": float(folds[metric].std())}
+        for metric in metric_cols
+    }
+
+    print(f"{n_splits}-fold CV ({model_type}): ROC AUC "
+          f"{summary['roc_auc']['mean']:.4f} ± {summary['roc_auc']['std']:.4f}")
+
+    return CVResult(folds=folds, summary=summary)
+
+
+def print_cv_results(result: CVResult) -> None:
+    """Print mean ± std of every metric across folds."""
+    print("\n" + "="*50)
+    print(f"CROSS-VALIDATION ({len(result.folds)} folds)")
+    print("="*50)
+    for metric, stats in result.summary.items():
+        print(f"{metric:>15s}: {stats['mean']:.4f} ± {stats['std']:.4f}")
+    print("="*50 + "\n")
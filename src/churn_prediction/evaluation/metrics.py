@@ -8,19 +8,88 @@ WHEN NOT: Never skip evaluation
 ALTERNATIVE: Ad-hoc evaluation (inconsistent)
 """
 
-from sklearn.metrics import (
-    accuracy_score,
-    precision_score,
-    recall_score,
-    f1_score,
-    roc_auc_score,
-    confusion_matrix
-)
-from typing import Dict, Any
+from typing import Any, Dict, Tuple
 import numpy as np
+import pandas as pd
 
 
-def evaluate_model(model: Any, X_test, y_test) -> Dict[str, float]:
+def confusion_counts(y_true, y_pred) -> Tuple[int, int, int, int]:
+    """(tn, fp, fn, tp) of 0/1 labels with a single bincount."""
+    codes = 2 * (np.asarray(y_true) == 1) + (np.asarray(y_pred) == 1)
+    tn, fp, fn, tp = np.bincount(codes.astype(np.intp), minlength=4)
+    return int(tn), int(fp), int(fn), int(tp)
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    # sklearn's zero_division default: 0.0 when undefined
+    return numerator / denominator if denominator else 0.0
+
+
+def _count_metrics(tn: int, fp: int, fn: int, tp: int) -> Dict[str, Any]:
+    """Accuracy, precision, recall and F1 from confusion counts."""
+    return {
+        "accuracy": _ratio(tp + tn, tn + fp + fn + tp),
+        "precision": _ratio(tp, tp + fp),
+        "recall": _ratio(tp, tp + fn),
+        "f1": _ratio(2 * tp, 2 * tp + fp + fn),
+    }
+
+
+def roc_auc(y_true, y_score) -> float:
+    """
+    ROC AUC from one sort.
+
+    WHAT: Sort scores descending, cumulative true/false positives at each
+        distinct score, trapezoids between them
+    WHY: Same value as sklearn roc_auc_score (tied scores form one ROC
+        point, i.e. half credit) without building the curve arrays
+    WHEN: Binary 0/1 labels
+    WHEN NOT: Multiclass
+    ALTERNATIVE: sklearn.metrics.roc_auc_score
+    """
+    y = np.asarray(y_true) == 1
+    scores = np.asarray(y_score)
+    n_pos = int(y.sum())
+    n_neg = len(y) - n_pos
+    if n_pos == 0 or n_neg == 0:
+        raise ValueError("ROC AUC is undefined when y_true has a single class")
+
+    order = np.argsort(-scores, kind="stable")
+    scores, y = scores[order], y[order]
+    # Last index of every run of equal scores
+    ends = np.r_[np.flatnonzero(np.diff(scores)), len(scores) - 1]
+    tps = np.r_[0, np.cumsum(y)[ends]]
+    fps = np.r_[0, ends + 1 - tps[1:]]
+    return float(np.sum(np.diff(fps) * (tps[1:] + tps[:-1])) / (2 * n_pos * n_neg))
+
+
+def binary_metrics(y_true, y_score, threshold: float = 0.5) -> Dict[str, Any]:
+    """
+    evaluate_model's metrics from labels and churn probabilities.
+
+    WHAT: Labels = y_score > threshold; one bincount for the confusion
+        counts, every count metric derived from them; ROC AUC from one sort
+    WHY: Five sklearn metric calls plus confusion_matrix re-scan and
+        re-validate the labels six times
+    WHEN: Scores already computed (batch output, bootstrap, CV)
+    WHEN NOT: Need sklearn's warnings on undefined precision/recall
+    ALTERNATIVE: sklearn.metrics functions one by one
+
+    Returns:
+        accuracy, precision, recall, f1, roc_auc and confusion_matrix
+        [[tn, fp], [fn, tp]] (always 2x2)
+    """
+    y_score = np.asarray(y_score)
+    tn, fp, fn, tp = confusion_counts(y_true, y_score > threshold)
+    metrics = _count_metrics(tn, fp, fn, tp)
+    metrics["roc_auc"] = roc_auc(y_true, y_score)
+    metrics["confusion_matrix"] = [[tn, fp], [fn, tp]]
+    return metrics
+
+
+def evaluate_model(
+    model: Any, X_test, y_test, threshold: float = 0.5
+) -> Dict[str, float]:
     """
     Calculate classification metrics.
     
@@ -34,6 +103,8 @@ def evaluate_model(model: Any, X_test, y_test) -> Dict[str, float]:
         model: Trained model
         X_test: Test features
         y_test: Test labels
+        threshold: Churn probability above which a customer is predicted
+            to churn (0.5 = model.predict for binary classifiers)
         
     Returns:
         Dictionary of metrics
@@ -42,32 +113,80 @@ def evaluate_model(model: Any, X_test, y_test) -> Dict[str, float]:
     # WHY: Compare against ground truth
     # WHEN: Evaluation
     # WHEN NOT: Training
-    # ALTERNATIVE: None
-    y_pred = model.predict(X_test)
+    # ALTERNATIVE: model.predict as well (a second full inference pass)
     y_pred_proba = model.predict_proba(X_test)[:, 1]
     
-    # WHAT: Calculate metrics
+    # WHAT: Calculate metrics and the confusion matrix in one pass
     # WHY: Different metrics for different business needs
     # WHEN: Always calculate multiple metrics
     # WHEN NOT: Never rely on single metric
     # ALTERNATIVE: Custom business metrics
-    metrics = {
-        "accuracy": accuracy_score(y_test, y_pred),
-        "precision": precision_score(y_test, y_pred),
-        "recall": recall_score(y_test, y_pred),
-        "f1": f1_score(y_test, y_pred),
-        "roc_auc": roc_auc_score(y_test, y_pred_proba),
-    }
-    
-    # WHAT: Confusion matrix
-    # WHY: See actual vs predicted breakdown
-    # WHEN: Understanding model errors
-    # WHEN NOT: Quick checks (too detailed)
-    # ALTERNATIVE: Classification report
-    cm = confusion_matrix(y_test, y_pred)
-    metrics["confusion_matrix"] = cm.tolist()
-    
-    return metrics
+    return binary_metrics(y_test, y_pred_proba, threshold)
+
+
+class MetricsAccumulator:
+    """
+    evaluate_model metrics accumulated over chunks of scores.
+
+    WHAT: update() adds confusion counts and per-class score histograms
+        of one chunk; merge() adds another accumulator; compute() returns
+        the same dictionary as evaluate_model
+    WHY: Chunked or distributed scoring never holds all scores at once;
+        counts and histograms are tiny and add up exactly
+    WHEN: Batch scoring, worker processes, streaming evaluation
+    WHEN NOT: Scores fit in memory (binary_metrics gives the exact AUC)
+    ALTERNATIVE: Concatenate all scores, then binary_metrics
+
+    Count metrics are exact. ROC AUC treats scores in the same histogram
+    bin as tied, so it is within about 1/n_bins of the exact value.
+    """
+
+    def __init__(self, threshold: float = 0.5, n_bins: int = 10_000):
+        self.threshold = threshold
+        self.n_bins = n_bins
+        self.counts = np.zeros(4, dtype=np.int64)
+        self.positive_hist = np.zeros(n_bins, dtype=np.int64)
+        self.negative_hist = np.zeros(n_bins, dtype=np.int64)
+
+    def update(self, y_true, y_score) -> "MetricsAccumulator":
+        """Add one chunk of labels and churn probabilities (in [0, 1])."""
+        positive = np.asarray(y_true) == 1
+        y_score = np.asarray(y_score)
+        codes = 2 * positive + (y_score > self.threshold)
+        self.counts += np.bincount(codes.astype(np.intp), minlength=4)
+
+        bins = np.clip((y_score * self.n_bins).astype(np.intp), 0, self.n_bins - 1)
+        self.positive_hist += np.bincount(bins[positive], minlength=self.n_bins)
+        self.negative_hist += np.bincount(bins[~positive], minlength=self.n_bins)
+        return self
+
+    def merge(self, other: "MetricsAccumulator") -> "MetricsAccumulator":
+        """Add another accumulator's chunks (same threshold and n_bins)."""
+        if (other.threshold, other.n_bins) != (self.threshold, self.n_bins):
+            raise ValueError(
+                "Can only merge accumulators with the same threshold and n_bins"
+            )
+        self.counts += other.counts
+        self.positive_hist += other.positive_hist
+        self.negative_hist += other.negative_hist
+        return self
+
+    def compute(self) -> Dict[str, Any]:
+        """Metrics of everything added so far."""
+        tn, fp, fn, tp = (int(c) for c in self.counts)
+        metrics = _count_metrics(tn, fp, fn, tp)
+
+        n_pos, n_neg = tp + fn, tn + fp
+        if n_pos == 0 or n_neg == 0:
+            raise ValueError("ROC AUC is undefined when y_true has a single class")
+        # Negatives ranked below each positive, half credit within a bin
+        # (float: pair counts overflow int64 past ~3e9 rows per class)
+        positives = self.positive_hist.astype(np.float64)
+        negatives_below = np.cumsum(self.negative_hist) - self.negative_hist
+        pairs = positives @ negatives_below + 0.5 * (positives @ self.negative_hist)
+        metrics["roc_auc"] = float(pairs / (n_pos * n_neg))
+        metrics["confusion_matrix"] = [[tn, fp], [fn, tp]]
+        return metrics
 
 
 def print_metrics(metrics: Dict[str, float]) -> None:
@@ -93,7 +212,9 @@ def print_metrics(metrics: Dict[str, float]) -> None:
     
     print("="*50 + "\n")
 
-def calculate_business_metrics(y_true, y_pred, y_pred_proba):
+def calculate_business_metrics(y_true, y_pred, y_pred_proba,
+                               revenue_per_customer: float = 1000.0,
+                               retention_cost: float = 100.0):
     """
     Calculate business-focused metrics for churn prediction.
     
@@ -107,19 +228,22 @@ def calculate_business_metrics(y_true, y_pred, y_pred_proba):
         y_true: Actual churn labels
         y_pred: Predicted churn labels
         y_pred_proba: Predicted churn probabilities
+        revenue_per_customer: Average annual revenue of a customer ($1000)
+        retention_cost: Cost of one retention offer ($100)
         
     Returns:
         Dictionary with business metrics
     """
-    from sklearn.metrics import confusion_matrix
-    import numpy as np
-    
     # Confusion matrix
-    tn, fp, fn, tp = confusion_matrix(y_true, y_pred).ravel()
-    
-    # Business metrics (example values)
-    revenue_per_customer = 1000  # $1000 average annual revenue
-    retention_cost = 100  # $100 cost to retain customer
+    tn, fp, fn, tp = confusion_counts(y_true, y_pred)
+    return _business_metrics(tp, fp, fn, revenue_per_customer, retention_cost)
+
+
+def _business_metrics(
+    tp, fp, fn, revenue_per_customer: float, retention_cost: float
+) -> Dict[str, Any]:
+    """Business metrics from counts; scalars or arrays (one entry per threshold)."""
+    tp, fp, fn = (np.asarray(c, dtype=np.float64) for c in (tp, fp, fn))
     
     # True Positives: Correctly identified churners we can save
     saved_customers = tp
@@ -134,13 +258,103 @@ def calculate_business_metrics(y_true, y_pred, y_pred_proba):
     # ROI calculation
     total_cost = (tp + fp) * retention_cost
     total_benefit = saved_revenue
-    roi = (total_benefit - total_cost) / total_cost if total_cost > 0 else 0
+    roi = np.divide(total_benefit - total_cost, total_cost,
+                    out=np.zeros_like(total_cost), where=total_cost > 0)
     
-    return {
-        'saved_customers': int(saved_customers),
-        'saved_revenue': float(saved_revenue),
-        'wasted_retention': float(wasted_retention),
-        'lost_revenue': float(lost_revenue),
-        'roi': float(roi),
-        'net_benefit': float(saved_revenue - wasted_retention - lost_revenue)
+    metrics = {
+        'saved_customers': saved_customers.astype(np.int64),
+        'saved_revenue': saved_revenue,
+        'wasted_retention': wasted_retention,
+        'lost_revenue': lost_revenue,
+        'roi': roi,
+        'net_benefit': saved_revenue - wasted_retention - lost_revenue
     }
+    if tp.ndim == 0:
+        metrics = {k: v.item() for k, v in metrics.items()}
+    return metrics
+
+
+def threshold_sweep(y_true, y_pred_proba,
+                    revenue_per_customer: float = 1000.0,
+                    retention_cost: float = 100.0) -> pd.DataFrame:
+    """
+    Business metrics at every distinct churn-probability threshold.
+
+    WHAT: Sort the probabilities once (descending); cumulative sums of the
+        labels give TP/FP/FN for "target everyone with probability >
+        threshold" (the evaluate_model / binary_metrics rule) at each
+        distinct value, then the calculate_business_metrics formulas run
+        on those arrays
+    WHY: O(n log n) for all thresholds, instead of one full pass of
+        calculate_business_metrics per candidate threshold
+    WHEN: Choosing the campaign threshold, including on millions of
+        scored customers
+    WHEN NOT: A fixed, already agreed threshold (calculate_business_metrics)
+    ALTERNATIVE: Python loop over np.linspace thresholds (coarse and slow)
+
+    Args:
+        y_true: Actual churn labels (0/1)
+        y_pred_proba: Predicted churn probabilities
+        revenue_per_customer: Average annual revenue of a customer
+        retention_cost: Cost of one retention offer
+
+    Returns:
+        DataFrame, one row per threshold from highest to lowest: threshold,
+        targeted, tp, fp, fn and the calculate_business_metrics columns.
+        The first row (the highest probability) targets nobody, the last
+        (-inf) everyone; pass any threshold to evaluate_model or
+        bootstrap_metrics to get the same customers targeted.
+    """
+    positive = np.asarray(y_true) == 1
+    scores = np.asarray(y_pred_proba, dtype=np.float64)
+    order = np.argsort(-scores, kind="stable")
+    scores, positive = scores[order], positive[order]
+
+    # Last index of every run of equal scores: targeting that score and above
+    # is "> the next lower distinct score"
+    ends = np.r_[np.flatnonzero(np.diff(scores)), len(scores) - 1]
+    tp = np.r_[0, np.cumsum(positive)[ends]]
+    targeted = np.r_[0, ends + 1]
+    fp = targeted - tp
+    fn = int(positive.sum()) - tp
+
+    sweep = pd.DataFrame({
+        "threshold": np.r_[scores[ends], -np.inf],
+        "targeted": targeted,
+        "tp": tp,
+        "fp": fp,
+        "fn": fn,
+    })
+    business = _business_metrics(tp, fp, fn, revenue_per_customer, retention_cost)
+    for name, values in business.items():
+        sweep[name] = values
+    return sweep
+
+
+def optimal_threshold(y_true, y_pred_proba,
+                      revenue_per_customer: float = 1000.0,
+                      retention_cost: float = 100.0,
+                      objective: str = "net_benefit") -> Dict[str, Any]:
+    """
+    Threshold that maximizes a business metric (threshold_sweep row).
+
+    Customers with probability > threshold are targeted, as in
+    evaluate_model(threshold=...). Ties on the objective go to the highest
+    threshold (fewest offers).
+
+    Args:
+        y_true: Actual churn labels (0/1)
+        y_pred_proba: Predicted churn probabilities
+        revenue_per_customer: Average annual revenue of a customer
+        retention_cost: Cost of one retention offer
+        objective: Any threshold_sweep column to maximize ("net_benefit",
+            "roi", "saved_revenue", ...)
+
+    Returns:
+        The optimal row as a dictionary (threshold, counts, business metrics)
+    """
+    sweep = threshold_sweep(y_true, y_pred_proba, revenue_per_customer, retention_cost)
+    if objective not in sweep.columns or objective == "threshold":
+        raise ValueError(f"Unknown objective: {objective}")
+    best = int(np.argmax(sweep[objective].to_numpy()))
+    return sweep.iloc[[best]].to_dict("records")[0]
@@ -11,7 +11,7 @@ ALTERNATIVE: Use raw data (suboptimal performance)
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler
-from typing import Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 class FeatureEngineer:
@@ -25,7 +25,11 @@ class FeatureEngineer:
     ALTERNATIVE: Ad-hoc transformations (causes train/test skew)
     """
     
-    def __init__(self):
+    def __init__(self,
+                 categorical: Optional[str] = None,
+                 max_categories: int = 1000,
+                 min_frequency: int = 1,
+                 hash_buckets: int = 1 << 16):
         """
         Initialize feature engineer.
         
@@ -34,9 +38,33 @@ class FeatureEngineer:
         WHEN: Creating new pipeline
         WHEN NOT: N/A
         ALTERNATIVE: Stateless functions (can't remember training stats)
+        
+        Args:
+            categorical: How to encode string/categorical columns:
+                None - pass through unchanged (default)
+                "codes" - learned vocabulary, integer code per value
+                "hash" - hashing trick into hash_buckets codes (no vocabulary)
+            max_categories: Most frequent values kept per column ("codes")
+            min_frequency: Values seen fewer times share the unknown code
+            hash_buckets: Number of hash codes per column ("hash")
+        
+        Code 0 is reserved for missing, rare and unseen values.
         """
+        if categorical not in ("codes", "hash", None):
+            raise ValueError(f"Unknown categorical encoding: {categorical}")
+        
         self.scaler = StandardScaler()
+        self.categorical = categorical
+        self.max_categories = max_categories
+        self.min_frequency = min_frequency
+        self.hash_buckets = hash_buckets
+        self.numeric_cols: Optional[List[str]] = None
+        self.categorical_cols: Optional[List[str]] = None
+        self.feature_cols: Optional[List[str]] = None
+        self.vocabularies: Dict[str, pd.Index] = {}
         self.fitted = False
+        self._category_counts: Dict[str, pd.Series] = {}
+        self._frozen: dict = {}
     
     def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -64,10 +92,23 @@ class FeatureEngineer:
         numeric_cols = df_transformed.select_dtypes(include=[np.number]).columns.tolist()
         
         # Fit and transform
-        df_transformed[numeric_cols] = self.scaler.fit_transform(df_transformed[numeric_cols])
+        if numeric_cols:
+            df_transformed[numeric_cols] = self.scaler.fit_transform(
+                df_transformed[numeric_cols]
+            )
+        
+        self._select_columns(df, numeric_cols)
+        self._category_counts = {}
+        self._update_vocabularies(df)
+        for col in self.categorical_cols:
+            df_transformed[col] = self.encode_column(col, df[col])
         
         self.fitted = True
+        self._frozen = {}
         print(f"Fitted on {len(numeric_cols)} numeric features")
+        if self.categorical_cols:
+            print(f"Encoded {len(self.categorical_cols)} categorical features "
+                  f"({self.categorical})")
         
         return df_transformed
     
@@ -91,8 +132,354 @@ class FeatureEngineer:
             raise ValueError("Must call fit_transform() before transform()")
         
         df_transformed = df.copy()
-        numeric_cols = df_transformed.select_dtypes(include=[np.number]).columns.tolist()
+        numeric_cols = self.numeric_cols
+        
+        if numeric_cols:
+            df_transformed[numeric_cols] = self.scaler.transform(
+                df_transformed[numeric_cols]
+            )
+        for col in self.categorical_cols:
+            df_transformed[col] = self.encode_column(col, df[col])
+        
+        return df_transformed
+    
+    def partial_fit(self, df: pd.DataFrame) -> "FeatureEngineer":
+        """
+        Update scaling statistics with one chunk of training data.
+        
+        WHAT: Accumulate mean/variance incrementally (Chan et al. update)
+        WHY: Fit on data that never fits in memory at once
+        WHEN: Chunked/partitioned training data
+        WHEN NOT: Data fits in memory (fit_transform is simpler)
+        ALTERNATIVE: Subsample then fit_transform (biased statistics)
+        
+        The numeric and categorical columns are frozen on the first chunk;
+        later chunks must contain them. Category counts accumulate across
+        chunks, so vocabularies reflect the whole stream.
         
-        df_transformed[numeric_cols] = self.scaler.transform(df_transformed[numeric_cols])
+        Args:
+            df: Training chunk
+            
+        Returns:
+            self
+        """
+        if self.numeric_cols is None:
+            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+            self._select_columns(df, numeric_cols)
         
-        return df_transformed
\ No newline at end of file
+        if self.numeric_cols:
+            self.scaler.partial_fit(df[self.numeric_cols])
+        self._update_vocabularies(df)
+        self.fitted = True
+        self._frozen = {}
+        
+        return self
+    
+    def fit_stream(self, chunks: Iterable[pd.DataFrame]) -> "FeatureEngineer":
+        """
+        Fit on an iterable of chunks in one pass.
+        
+        WHAT: partial_fit over every chunk
+        WHY: One pass over hundreds of millions of rows, bounded memory
+        WHEN: With iter_partitions or pd.read_csv(chunksize=...)
+        WHEN NOT: Data fits in memory
+        ALTERNATIVE: Per-shard engineers combined with merge()
+        
+        Args:
+            chunks: Iterable of training DataFrames
+            
+        Returns:
+            self
+        """
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        
+        if not self.fitted:
+            raise ValueError("fit_stream() received no chunks")
+        
+        print(f"Fitted on {len(self.numeric_cols)} numeric features")
+        if self.categorical_cols:
+            print(f"Encoded {len(self.categorical_cols)} categorical features "
+                  f"({self.categorical})")
+        
+        return self
+    
+    def transform_stream(self,
+                         chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Transform an iterable of chunks lazily, one chunk at a time."""
+        for chunk in chunks:
+            yield self.transform(chunk)
+    
+    def merge(self, other: "FeatureEngineer") -> "FeatureEngineer":
+        """
+        Combine statistics fitted on another shard into this engineer.
+        
+        WHAT: Pairwise mean/variance merge (Chan et al. parallel formula)
+        WHY: Fit shards in parallel workers, then reduce
+        WHEN: Distributed/parallel fitting
+        WHEN NOT: Single-process fitting (use fit_stream)
+        ALTERNATIVE: Ship raw data to one worker (network + memory)
+        
+        Exact: merging per-shard fits equals fitting on all rows at once
+        (up to floating-point rounding).
+        
+        Args:
+            other: Engineer fitted on a disjoint shard with the same columns
+            
+        Returns:
+            self
+        """
+        if not (self.fitted and other.fitted):
+            raise ValueError("Both engineers must be fitted before merge()")
+        if (self.feature_cols != other.feature_cols
+                or self.categorical != other.categorical):
+            raise ValueError(
+                f"Cannot merge engineers fitted on different columns: "
+                f"{self.feature_cols} vs {other.feature_cols}"
+            )
+        
+        for col, counts in other._category_counts.items():
+            self._category_counts[col] = self._category_counts[col].add(
+                counts, fill_value=0)
+        self._build_vocabularies()
+        self._frozen = {}
+        
+        if not self.numeric_cols:
+            return self
+        
+        a, b = self.scaler, other.scaler
+        n_a = np.asarray(a.n_samples_seen_, dtype=np.float64)
+        n_b = np.asarray(b.n_samples_seen_, dtype=np.float64)
+        n = n_a + n_b
+        
+        delta = b.mean_ - a.mean_
+        mean = a.mean_ + delta * np.divide(n_b, n, out=np.zeros_like(delta),
+                                           where=n > 0)
+        m2 = a.var_ * n_a + b.var_ * n_b + delta ** 2 * np.divide(
+            n_a * n_b, n, out=np.zeros_like(delta), where=n > 0
+        )
+        var = np.divide(m2, n, out=np.zeros_like(m2), where=n > 0)
+        
+        a.mean_ = mean
+        a.var_ = var
+        # Same zero-variance handling as StandardScaler: leave constant columns unscaled
+        scale = np.sqrt(var)
+        scale[scale < 10 * np.finfo(scale.dtype).eps] = 1.0
+        a.scale_ = scale
+        n_seen = a.n_samples_seen_ + b.n_samples_seen_
+        a.n_samples_seen_ = n_seen
+        self._frozen = {}
+        
+        return self
+    
+    def _mean_inv_scale(self, dtype: np.dtype) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Frozen (mean, 1/scale) vectors over feature_cols.
+        
+        The mean stays float64 so it is subtracted at the input's precision;
+        only 1/scale is cast to dtype. Categorical columns get (0, 1) so
+        their codes pass through.
+        """
+        dtype = np.dtype(dtype)
+        if dtype not in self._frozen:
+            mean = np.zeros(len(self.feature_cols))
+            inv_scale = np.ones(len(self.feature_cols))
+            if self.numeric_cols:
+                positions = [self.feature_cols.index(c) for c in self.numeric_cols]
+                mean[positions] = self.scaler.mean_
+                inv_scale[positions] = 1.0 / self.scaler.scale_
+            self._frozen[dtype] = (mean, inv_scale.astype(dtype))
+        return self._frozen[dtype]
+    
+    def transform_array(self,
+                        X,
+                        dtype: np.dtype = np.float32,
+                        out: Optional[np.ndarray] = None,
+                        inplace: bool = False) -> np.ndarray:
+        """
+        Fast transform straight to a model-ready ndarray.
+        
+        WHAT: (x - mean) * (1/scale) with frozen vectors, no pandas
+        WHY: transform() copies the frame twice and re-dispatches on dtypes
+        WHEN: Batch/online scoring where per-batch overhead matters
+        WHEN NOT: You need a DataFrame back (use transform)
+        ALTERNATIVE: transform(df).to_numpy() (two extra copies)
+        
+        Numeric and categorical columns are returned in feature_cols order
+        (the column order of fit_transform's output, minus passthrough
+        columns); categoricals as their integer codes. Models fitted on
+        DataFrames will warn about missing feature names when given the
+        array.
+        
+        Args:
+            X: DataFrame, or 2D array whose columns are feature_cols in order
+                (categoricals already encoded)
+            dtype: Output dtype (float32 halves memory traffic)
+            out: Preallocated C-contiguous buffer to write into (reused per batch)
+            inplace: Scale X itself when it is already a C-contiguous array
+                of dtype (no allocation at all)
+            
+        Returns:
+            C-contiguous array of shape (n_rows, len(feature_cols))
+        """
+        if not self.fitted:
+            raise ValueError("Must call fit_transform() before transform()")
+        
+        dtype = np.dtype(dtype)
+        mean, inv_scale = self._mean_inv_scale(dtype)
+        
+        if isinstance(X, pd.DataFrame):
+            # Center column by column straight from pandas' storage into the
+            # output (at the column's precision, before any cast to dtype):
+            # no intermediate frame or gathered block
+            if out is None:
+                out = np.empty((len(X), len(self.feature_cols)), dtype=dtype)
+            categorical = set(self.categorical_cols)
+            for j, col in enumerate(self.feature_cols):
+                if col in categorical:
+                    out[:, j] = self.encode_column(col, X[col])
+                else:
+                    np.subtract(X[col].to_numpy(), mean[j], out=out[:, j],
+                                casting="unsafe")
+            np.multiply(out, inv_scale, out=out)
+            return out
+        
+        if out is None:
+            if (inplace and isinstance(X, np.ndarray) and X.dtype == dtype
+                    and X.flags.c_contiguous):
+                out = X
+            else:
+                out = np.empty(np.shape(X), dtype=dtype)
+        
+        np.subtract(X, mean, out=out, casting="unsafe")
+        np.multiply(out, inv_scale, out=out)
+        
+        return out
+    
+    def encode_column(self, col: str, series: pd.Series) -> np.ndarray:
+        """
+        Integer codes for one categorical column.
+        
+        WHAT: Vocabulary lookup ("codes") or bucket hash ("hash")
+        WHY: One small int per row instead of a dense one-hot block
+        WHEN: Called by transform(); also usable on its own
+        WHEN NOT: Numeric columns
+        ALTERNATIVE: pd.get_dummies (memory grows with cardinality)
+        
+        Args:
+            col: Fitted categorical column name
+            series: Raw values
+            
+        Returns:
+            Array of codes (int8/16/32), 0 for missing/rare/unseen values
+        """
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Encode each category once, then gather by the existing codes
+            per_category = self._encode_values(col, series.cat.categories)
+            raw_codes = series.cat.codes.to_numpy()
+            codes = np.where(raw_codes >= 0, per_category[raw_codes], 0)
+        else:
+            codes = self._encode_values(col, series.to_numpy())
+        
+        return codes.astype(self._code_dtype(col), copy=False)
+    
+    def encode_value(self, col: str, value: Any) -> int:
+        """Code of a single raw value (for single-row scoring)."""
+        if self.categorical == "hash":
+            return int(self._encode_values(col, np.array([value], dtype=object))[0])
+        
+        key = ("lookup", col)
+        if key not in self._frozen:
+            self._frozen[key] = {v: i + 1 for i, v in enumerate(self.vocabularies[col])}
+        return self._frozen[key].get(value, 0)
+    
+    def encode_sparse(self, df: pd.DataFrame):
+        """
+        Sparse one-hot matrix of all categorical columns.
+        
+        WHAT: CSR matrix, one column per code (incl. 0 = other) per feature
+        WHY: Linear models need one-hot, but dense one-hot multiplies memory
+        WHEN: LogisticRegression on categorical features
+        WHEN NOT: Tree models (int codes from transform() are enough)
+        ALTERNATIVE: pd.get_dummies (dense)
+        
+        Args:
+            df: Raw DataFrame
+            
+        Returns:
+            scipy.sparse.csr_matrix of shape (n_rows, total codes)
+        """
+        from scipy import sparse
+        
+        if not self.fitted:
+            raise ValueError("Must call fit_transform() before transform()")
+        
+        n_rows, n_cols = len(df), len(self.categorical_cols)
+        indices = np.empty((n_rows, n_cols), dtype=np.int64)
+        offset = 0
+        for j, col in enumerate(self.categorical_cols):
+            indices[:, j] = self.encode_column(col, df[col]) + offset
+            offset += self._n_codes(col)
+        
+        return sparse.csr_matrix(
+            (np.ones(n_rows * n_cols, dtype=np.float32), indices.ravel(),
+             np.arange(0, n_rows * n_cols + 1, n_cols)),
+            shape=(n_rows, offset),
+        )
+    
+    def _select_columns(self, df: pd.DataFrame, numeric_cols: List[str]) -> None:
+        """Freeze numeric, categorical and model-ready column lists."""
+        if self.categorical is None:
+            categorical_cols = []
+        else:
+            categorical_cols = df.select_dtypes(
+                include=["object", "category", "string"]
+            ).columns.tolist()
+        
+        self.numeric_cols = numeric_cols
+        self.categorical_cols = categorical_cols
+        keep = set(numeric_cols) | set(categorical_cols)
+        self.feature_cols = [c for c in df.columns if c in keep]
+    
+    def _update_vocabularies(self, df: pd.DataFrame) -> None:
+        """Add a chunk's value counts and rebuild the capped vocabularies."""
+        if self.categorical != "codes":
+            return
+        
+        for col in self.categorical_cols:
+            counts = df[col].value_counts(dropna=True)
+            if col in self._category_counts:
+                counts = self._category_counts[col].add(counts, fill_value=0)
+            self._category_counts[col] = counts
+        self._build_vocabularies()
+    
+    def _build_vocabularies(self) -> None:
+        for col, counts in self._category_counts.items():
+            kept = counts[counts >= self.min_frequency]
+            kept = kept.sort_values(ascending=False, kind="mergesort")
+            kept = kept.head(self.max_categories)
+            self.vocabularies[col] = pd.Index(kept.index, dtype=object)
+        self._frozen = {}
+    
+    def _encode_values(self, col: str, values) -> np.ndarray:
+        if self.categorical == "hash":
+            values = np.asarray(values, dtype=object)
+            hashes = pd.util.hash_array(values, categorize=True)
+            codes = (hashes % np.uint64(self.hash_buckets)).astype(np.int64) + 1
+            codes[pd.isna(values)] = 0
+            return codes
+        
+        return self.vocabularies[col].get_indexer(values) + 1
+    
+    def _n_codes(self, col: str) -> int:
+        if self.categorical == "hash":
+            return self.hash_buckets + 1
+        return len(self.vocabularies[col]) + 1
+    
+    def _code_dtype(self, col: str) -> np.dtype:
+        n_codes = self._n_codes(col)
+        for dtype in (np.int8, np.int16, np.int32):
+            if n_codes <= np.iinfo(dtype).max:
+                return np.dtype(dtype)
+        return np.dtype(np.int64)
+
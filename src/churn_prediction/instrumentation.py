@@ -0,0 +1,246 @@
+"""
+Per-stage timing and memory instrumentation.
+
+WHAT: Record wall time, CPU time, peak RSS and rows/s for each pipeline
+    stage (load → split → transform → fit → evaluate → save)
+WHY: Banners and start/end log lines do not show where time and memory go
+WHEN: Training and scoring runs, including production (a few syscalls
+    per stage)
+WHEN NOT: Per-row hot loops (time the loop, not each row)
+ALTERNATIVE: cProfile / memray (detailed but far too heavy to leave on)
+"""
+
+import functools
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:
+    # Windows: no getrusage; psutil (if installed) or no peak RSS
+    resource = None
+
+
+# Profile that @instrument records into, set by `with RunProfile(...)`
+_ACTIVE: ContextVar[Optional["RunProfile"]] = ContextVar("active_profile", default=None)
+
+# ru_maxrss is kilobytes on Linux, bytes on macOS
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """High-water mark of this process's resident memory (None if unknown)."""
+    if resource is not None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_UNIT
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    # peak_wset is the Windows peak working set
+    return getattr(info, "peak_wset", info.rss)
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Current resident memory (None where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def process_memory(pid: Optional[int] = None) -> Dict[str, Optional[int]]:
+    """
+    RSS and PSS of a process in bytes, from /proc/<pid>/smaps_rollup.
+
+    PSS splits every shared page between the processes mapping it, so
+    summing PSS over workers gives the node's real memory; summing RSS
+    counts shared model pages once per worker. Falls back to VmRSS
+    (pss None) where smaps_rollup is unavailable.
+    """
+    pid = os.getpid() if pid is None else pid
+    fields = {"Rss": "rss", "Pss": "pss", "Shared_Clean": "shared_clean",
+              "Shared_Dirty": "shared_dirty", "Private_Clean": "private_clean",
+              "Private_Dirty": "private_dirty"}
+    memory: Dict[str, Optional[int]] = {name: None for name in fields.values()}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in fields:
+                    memory[fields[key]] = int(rest.split()[0]) * 1024
+    except OSError:
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        memory["rss"] = int(line.split()[1]) * 1024
+        except OSError:
+            pass
+    return memory
+
+
+def _cpu_seconds() -> float:
+    """CPU time of this process and its finished children (worker pools)."""
+    if resource is None:
+        # Own process only
+        return time.process_time()
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+class RunProfile:
+    """
+    Stage records for one pipeline run.
+
+    WHAT: `with profile.stage("fit", rows=n):` appends one record with
+        wall_seconds, cpu_seconds, peak_rss_mb, peak_rss_increase_mb,
+        rss_delta_mb and rows_per_second
+    WHY: One structured JSON document per run, comparable across runs
+    WHEN: Wrap each step of a pipeline
+    WHEN NOT: Nested fine-grained timing (records are flat)
+    ALTERNATIVE: Ad-hoc time.time() prints
+
+    CPU time includes finished child processes, so a stage that runs a
+    process pool shows the pool's CPU. Peak RSS is the process-wide
+    high-water mark after the stage; peak_rss_increase_mb is how much
+    the stage raised it.
+
+    Entering the profile as a context manager makes it the target of
+    @instrument-decorated functions called inside it.
+    """
+
+    def __init__(self, name: str = "run", **metadata: Any):
+        self.name = name
+        self.metadata = metadata
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.stages: List[Dict[str, Any]] = []
+        self._token = None
+
+    def __enter__(self) -> "RunProfile":
+        self._token = _ACTIVE.set(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _ACTIVE.reset(self._token)
+        self._token = None
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Record one stage.
+
+        Yields the record, so rows can be filled in once known:
+            with profile.stage("load") as record:
+                df = load_data(path)
+                record["rows"] = len(df)
+        """
+        record: Dict[str, Any] = {"stage": name, "rows": rows}
+        rss_before = current_rss_bytes()
+        peak_before = peak_rss_bytes()
+        cpu_before = _cpu_seconds()
+        wall_before = time.perf_counter()
+        try:
+            yield record
+        finally:
+            wall = time.perf_counter() - wall_before
+            cpu = _cpu_seconds() - cpu_before
+            peak = peak_rss_bytes()
+            rss_after = current_rss_bytes()
+            rows = record.get("rows")
+
+            record.update(
+                wall_seconds=round(wall, 6),
+                cpu_seconds=round(cpu, 6),
+                peak_rss_mb=round(peak / 2**20, 2) if peak is not None else None,
+                peak_rss_increase_mb=(
+                    round((peak - peak_before) / 2**20, 2)
+                    if peak is not None and peak_before is not None else None
+                ),
+                rss_delta_mb=(
+                    round((rss_after - rss_before) / 2**20, 2)
+                    if rss_before is not None and rss_after is not None else None
+                ),
+                rows_per_second=round(rows / wall, 1) if rows and wall > 0 else None,
+            )
+            self.stages.append(record)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Run metadata, stages and totals."""
+        return {
+            "run": self.name,
+            "started_at": self.started_at,
+            "pid": os.getpid(),
+            **self.metadata,
+            "stages": self.stages,
+            "total_wall_seconds": round(sum(s["wall_seconds"] for s in self.stages), 6),
+            "total_cpu_seconds": round(sum(s["cpu_seconds"] for s in self.stages), 6),
+            "peak_rss_mb": max((s["peak_rss_mb"] for s in self.stages
+                                if s["peak_rss_mb"] is not None), default=None),
+        }
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """Serialize the run; also write it to path when given."""
+        text = json.dumps(self.to_dict(), indent=2, default=str)
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_text(text)
+        return text
+
+    def print_summary(self) -> None:
+        """Print one line per stage."""
+        print(f"\n{'stage':<14}{'wall s':>9}{'cpu s':>9}{'peak MB':>10}{'rows/s':>12}")
+        for s in self.stages:
+            rate = f"{s['rows_per_second']:,.0f}" if s["rows_per_second"] else "-"
+            peak = f"{s['peak_rss_mb']:.1f}" if s["peak_rss_mb"] is not None else "-"
+            print(f"{s['stage']:<14}{s['wall_seconds']:>9.3f}{s['cpu_seconds']:>9.3f}"
+                  f"{peak:>10}{rate:>12}")
+
+
+def active_profile() -> Optional[RunProfile]:
+    """The RunProfile entered in the current context, if any."""
+    return _ACTIVE.get()
+
+
+def instrument(stage: Optional[str] = None, rows_arg: Optional[int] = 0) -> Callable:
+    """
+    Decorator: record calls as a stage of the active RunProfile.
+
+    WHAT: Wrap a function so each call is a stage (named after the
+        function unless given); rows = len() of positional argument
+        rows_arg when it has one
+    WHY: Instrument library functions once, profile wherever they run
+    WHEN: Pipeline steps called inside `with RunProfile(...)`
+    WHEN NOT: Outside a profile the wrapper just calls the function
+    ALTERNATIVE: profile.stage() blocks at each call site
+    """
+    def decorator(fn: Callable) -> Callable:
+        name = stage or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            profile = _ACTIVE.get()
+            if profile is None:
+                return fn(*args, **kwargs)
+
+            rows = None
+            if rows_arg is not None and len(args) > rows_arg:
+                try:
+                    rows = len(args[rows_arg])
+                except TypeError:
+                    pass
+            with profile.stage(name, rows=rows):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,278 @@
+"""
+Chunked, multi-process batch scoring.
+
+WHAT: Score a whole customer file in chunks across worker processes
+WHY: predict_safe needs the full batch in memory and uses one process
+WHEN: Nightly scoring of the customer base
+WHEN NOT: Single customers (use CompiledScorer)
+ALTERNATIVE: load everything + predict_safe (memory grows with the file)
+"""
+
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from churn_prediction.data.cache import _META_FILE
+from churn_prediction.models.predict import validate_batch
+from churn_prediction.models.shared import SharedModel
+from churn_prediction.models.train import (
+    init_worker_threads,
+    load_model,
+    parallel_section,
+    thread_budget,
+)
+
+
+# Set once per worker process by _init_worker
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _init_worker(model_path: str, engineer_path: str, id_col: str,
+                 mmap_mode: Optional[str] = None,
+                 n_threads: Optional[int] = None) -> None:
+    """Load the model and engineer once per worker, within its thread share."""
+    if n_threads is not None:
+        init_worker_threads(n_threads)
+    model = load_model(model_path, mmap_mode=mmap_mode)
+    # Saved n_jobs (-1 by default) would claim every core in every worker
+    if hasattr(model, "get_params") and "n_jobs" in model.get_params():
+        model.set_params(n_jobs=thread_budget())
+
+    _WORKER_STATE.update(
+        model=model,
+        engineer=load_model(engineer_path, mmap_mode=mmap_mode),
+        id_col=id_col,
+    )
+
+
+def _score_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Transform and score one chunk in a worker.
+
+    Invalid rows (NaN/Inf/missing) get prediction -1 and NaN probability
+    instead of failing the whole run.
+    """
+    model = _WORKER_STATE["model"]
+    engineer = _WORKER_STATE["engineer"]
+    id_col = _WORKER_STATE["id_col"]
+
+    X = engineer.transform(chunk)
+    features = getattr(model, "feature_names_in_", None)
+    if features is not None:
+        X = X[list(features)]
+
+    result = validate_batch(X)
+    predictions = np.full(len(chunk), -1, dtype=np.int8)
+    probabilities = np.full(len(chunk), np.nan, dtype=np.float32)
+
+    valid = result.valid_mask
+    if valid.any():
+        proba = model.predict_proba(X[valid] if not valid.all() else X)
+        predictions[valid] = model.classes_[proba.argmax(axis=1)]
+        probabilities[valid] = proba[:, 1]
+
+    output = pd.DataFrame({"prediction": predictions, "probability": probabilities})
+    if id_col in chunk.columns:
+        output.insert(0, id_col, chunk[id_col].to_numpy())
+
+    return output
+
+
+class _OutputWriter:
+    """
+    Append scored chunks, in order, to a columnar directory, .parquet or .csv.
+
+    A path without a suffix becomes a directory in the ColumnarCache entry
+    layout (meta.json plus one .npy per column, read back with
+    load_columns): columnar output with no extra dependency. Chunks are
+    appended to each .npy and its header is rewritten with the final row
+    count on close (numpy leaves room for the shape to grow in place).
+    """
+
+    def __init__(self, output_path: str):
+        self.path = Path(output_path)
+        formats = {".parquet": "parquet", ".csv": "csv"}
+        self._format = formats.get(self.path.suffix, "npy")
+        if self._format == "npy":
+            self.path.mkdir(parents=True, exist_ok=True)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = None
+        self._first = True
+        # npy: [spec, dtype, open file, string -> code (object columns)]
+        self._columns: List[List[Any]] = []
+        self._rows = 0
+
+        if self._format == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ImportError(
+                    "Parquet output requires pyarrow (uv add pyarrow), "
+                    "or write to a directory (columnar .npy) or .csv path"
+                ) from None
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self._format == "npy":
+            self._write_npy(df)
+        elif self._format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode="w" if self._first else "a",
+                      header=self._first, index=False)
+        self._first = False
+
+    def close(self, complete: bool = True) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        if self._columns:
+            for spec, dtype, f, lookup in self._columns:
+                f.seek(0)
+                _write_npy_header(f, dtype, self._rows)
+                f.close()
+                if lookup is not None:
+                    spec["categories"] = list(lookup)
+            meta = {"n_rows": self._rows, "columns": [c[0] for c in self._columns]}
+            # Written last: a directory without meta.json is an incomplete run
+            if complete:
+                (self.path / _META_FILE).write_text(json.dumps(meta))
+            self._columns = []
+
+    def _write_npy(self, df: pd.DataFrame) -> None:
+        if self._first:
+            (self.path / _META_FILE).unlink(missing_ok=True)
+            for i, (name, dtype) in enumerate(df.dtypes.items()):
+                if dtype == object:
+                    spec, dtype, lookup = {"name": name, "kind": "object"}, np.int32, {}
+                elif isinstance(dtype, np.dtype) and dtype.kind in "biuf":
+                    spec, lookup = {"name": name, "kind": "numpy"}, None
+                else:
+                    raise ValueError(f"Cannot write column {name!r} of dtype {dtype} "
+                                     f"as .npy; write to a .csv path")
+                dtype = np.dtype(dtype)
+                f = open(self.path / f"{i}.npy", "wb")
+                _write_npy_header(f, dtype, 0)
+                self._columns.append([spec, dtype, f, lookup])
+
+        for spec, dtype, f, lookup in self._columns:
+            series = df[spec["name"]]
+            if lookup is not None:
+                # Codes into a vocabulary shared by all chunks; -1 = missing
+                codes, uniques = pd.factorize(series)
+                if not all(isinstance(u, str) for u in uniques):
+                    raise ValueError(f"Column {spec['name']!r} has non-string "
+                                     f"values; write to a .csv path")
+                # Trailing -1 so factorize's -1 (missing) indexes to itself
+                values = np.array(
+                    [lookup.setdefault(u, len(lookup)) for u in uniques] + [-1],
+                    dtype=np.int32,
+                )[codes]
+            else:
+                values = series.to_numpy(dtype=dtype)
+            values.tofile(f)
+        self._rows += len(df)
+
+
+def _write_npy_header(f, dtype: np.dtype, n_rows: int) -> None:
+    """Write a 1-D .npy header; its length does not depend on n_rows."""
+    np.lib.format.write_array_header_1_0(f, {
+        "descr": np.lib.format.dtype_to_descr(dtype),
+        "fortran_order": False,
+        "shape": (n_rows,),
+    })
+
+
+def score_file(model_path: str,
+               engineer_path: str,
+               input_path: str,
+               output_path: str,
+               chunksize: int = 100_000,
+               n_workers: Optional[int] = None,
+               id_col: str = "CustomerID",
+               shared_model: bool = False) -> Dict[str, int]:
+    """
+    Score an input CSV chunk by chunk and write predictions in order.
+
+    WHAT: Stream chunks → process pool (model loaded once per worker) →
+        ordered columnar output
+    WHY: Scales with cores, memory bounded by chunksize x workers
+    WHEN: Batch inference over files of any size
+    WHEN NOT: Online scoring
+    ALTERNATIVE: One process, whole file in memory
+
+    Args:
+        model_path: Saved model (save_model)
+        engineer_path: Saved fitted FeatureEngineer (save_model)
+        input_path: CSV of raw customer features
+        output_path: Directory (columnar: one .npy per column, read with
+            data.cache.load_columns), .parquet (needs pyarrow) or .csv
+        chunksize: Rows per chunk
+        n_workers: Worker processes (None = one per CPU, 1 = in-process)
+        id_col: Identifier copied to the output when present
+        shared_model: Publish the model flattened to a read-only mapped
+            file (SharedModel) so all workers share one copy instead of
+            loading their own (RandomForest / XGBoost only)
+
+    Returns:
+        Dictionary with rows scored and rows rejected by validation
+    """
+    writer = _OutputWriter(output_path)
+    chunks = pd.read_csv(input_path, chunksize=chunksize)
+    n_workers = n_workers or os.cpu_count() or 1
+    totals = {"rows": 0, "rejected": 0}
+
+    def record(scored: pd.DataFrame) -> None:
+        writer.write(scored)
+        totals["rows"] += len(scored)
+        totals["rejected"] += int((scored["prediction"] < 0).sum())
+
+    shared = None
+    complete = False
+    try:
+        if n_workers == 1:
+            _init_worker(model_path, engineer_path, id_col)
+            for chunk in chunks:
+                record(_score_chunk(chunk))
+        else:
+            paths, mmap_mode = (model_path, engineer_path), None
+            if shared_model:
+                shared = SharedModel(load_model(model_path), load_model(engineer_path))
+                paths, mmap_mode = shared.paths, "r"
+            with parallel_section(n_workers) as n_threads:
+                initargs = (*paths, id_col, mmap_mode, n_threads)
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_init_worker,
+                initargs=initargs,
+            ) as pool:
+                # Bounded window of in-flight chunks keeps memory flat and
+                # lets results be written in input order
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(_score_chunk, chunk))
+                    if len(pending) >= 2 * n_workers:
+                        record(pending.popleft().result())
+                while pending:
+                    record(pending.popleft().result())
+        complete = True
+    finally:
+        writer.close(complete)
+        if shared is not None:
+            shared.close()
+
+    print(f"Scored ( {totals['rows']} ) records -> {output_path} "
+          f"({totals['rejected']} rejected)")
+
+    return totals
@@ -0,0 +1,184 @@
+"""
+Forest compaction: tree selection and reduced-precision node arrays.
+
+WHAT: Keep the smallest subset of trees whose ROC AUC stays within a
+    tolerance of the full model, stored as a FlatForest with float32 /
+    float16 thresholds and leaf values
+WHY: Forests grow large on disk and in RAM as n_estimators grows, and
+    latency grows with the tree count
+WHEN: After training, before deployment
+WHEN NOT: Without a representative validation set (the subset is chosen
+    on it)
+ALTERNATIVE: Retrain with fewer trees (loses the best trees' selection)
+"""
+
+import io
+import time
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+import joblib
+import numpy as np
+from scipy.stats import rankdata
+
+from churn_prediction.evaluation.metrics import evaluate_model
+from churn_prediction.models.forest import FlatForest
+
+
+class CompactionResult(NamedTuple):
+    """Compacted model, the kept tree indices and the size/latency/metric report."""
+    model: FlatForest
+    trees: np.ndarray
+    report: Dict[str, Any]
+
+
+def _auc_rows(y: np.ndarray, scores: np.ndarray) -> np.ndarray:
+    """ROC AUC of every row of scores (Mann-Whitney, ties averaged)."""
+    positive = y == 1
+    n_pos = int(positive.sum())
+    n_neg = len(y) - n_pos
+    ranks = rankdata(scores, axis=1)
+    return (ranks[:, positive].sum(axis=1) - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+
+
+def select_trees(forest: FlatForest, X_val, y_val, target_auc: float,
+                 min_trees: int = 1) -> Tuple[np.ndarray, List[float]]:
+    """
+    Greedy forward selection of trees until ROC AUC reaches target_auc.
+
+    WHAT: Start empty; each step adds the tree that maximizes the AUC of
+        the summed leaf values (mean probability for RandomForest, margin
+        for XGBoost; same ranking) of the selection
+    WHY: Far fewer trees than the full forest usually rank customers
+        almost as well
+    WHEN: Inside compact_forest
+    WHEN NOT: Huge validation sets (one AUC per remaining tree per step;
+        subsample first)
+    ALTERNATIVE: Keep the first k trees (ignores which trees are useful)
+
+    Returns:
+        (tree indices in selection order, AUC after each addition); all
+        trees if target_auc is never reached
+    """
+    y = np.asarray(y_val)
+    leaves = forest.leaf_values(X_val).astype(np.float64)
+    remaining = list(range(forest.n_trees))
+    selected: List[int] = []
+    path: List[float] = []
+    total = np.zeros(leaves.shape[1])
+
+    while remaining:
+        candidates = total + leaves[remaining]
+        aucs = _auc_rows(y, candidates)
+        best = int(np.argmax(aucs))
+        selected.append(remaining.pop(best))
+        total = candidates[best]
+        path.append(float(aucs[best]))
+        if path[-1] >= target_auc and len(selected) >= min_trees:
+            break
+
+    return np.array(selected), path
+
+
+def _serialized_bytes(model: Any) -> int:
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    return buffer.getbuffer().nbytes
+
+
+def _latency_ms(model: Any, X, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        model.predict_proba(X)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def compact_forest(model: Any, X_select, y_select, X_val, y_val,
+                   tolerance: float = 0.005,
+                   threshold_dtype: np.dtype = np.float32,
+                   value_dtype: np.dtype = np.float32,
+                   min_trees: int = 1) -> CompactionResult:
+    """
+    Smallest, narrowest forest whose ROC AUC is within tolerance.
+
+    WHAT: Flatten → cast node arrays (FlatForest.astype) → greedy tree
+        selection on the cast forest (X_select) → subset; report size,
+        latency and evaluate_model deltas against the original model on
+        X_val
+    WHY: Selection runs on the reduced-precision forest, so the AUC target
+        already includes the quantization loss; the report uses rows the
+        selection never saw, so it is not biased by the greedy choice
+    WHEN: Post-training step for RandomForest / XGBoost models
+    WHEN NOT: Model must reproduce predict_proba exactly (FlatForest.from_model)
+    ALTERNATIVE: Fewer n_estimators at training time
+
+    Args:
+        model: Fitted RandomForestClassifier or XGBClassifier (or FlatForest)
+        X_select: Features the trees are chosen on (same columns as training)
+        y_select: Labels for X_select
+        X_val: Features for the report, disjoint from X_select (and from
+            the test set the model is finally reported on)
+        y_val: Labels for X_val
+        tolerance: Allowed ROC AUC drop versus the original model
+        threshold_dtype: float32 (exact for float32 inputs) or float16
+        value_dtype: float64, float32 or float16 leaf values
+        min_trees: Keep at least this many trees
+
+    Returns:
+        CompactionResult; report["within_tolerance"] is False when the
+        compacted model misses the tolerance on X_val
+    """
+    selection_target = evaluate_model(model, X_select, y_select)["roc_auc"] - tolerance
+    cast = FlatForest.from_model(model).astype(threshold_dtype, value_dtype)
+    trees, path = select_trees(cast, X_select, y_select, selection_target, min_trees)
+    compacted = cast.subset(np.sort(trees))
+
+    # Report only on rows not used to pick the trees
+    baseline = evaluate_model(model, X_val, y_val)
+    metrics = evaluate_model(compacted, X_val, y_val)
+    n_trees_before = FlatForest.from_model(model).n_trees
+    report = {
+        "trees_before": n_trees_before,
+        "trees_after": compacted.n_trees,
+        "threshold_dtype": np.dtype(threshold_dtype).name,
+        "value_dtype": np.dtype(value_dtype).name,
+        "serialized_bytes_before": _serialized_bytes(model),
+        "serialized_bytes_after": _serialized_bytes(compacted),
+        "latency_ms_before": _latency_ms(model, X_val),
+        "latency_ms_after": _latency_ms(compacted, X_val),
+        "selection_auc_path": path,
+        "metrics_before": {k: v for k, v in baseline.items()
+                           if k != "confusion_matrix"},
+        "metrics_after": {k: v for k, v in metrics.items()
+                          if k != "confusion_matrix"},
+        "within_tolerance": bool(metrics["roc_auc"] >= baseline["roc_auc"] - tolerance),
+    }
+    report["metric_deltas"] = {
+        k: report["metrics_after"][k] - v for k, v in report["metrics_before"].items()
+    }
+
+    print(f"Compacted {n_trees_before} → {compacted.n_trees} trees, validation "
+          f"ROC AUC {baseline['roc_auc']:.4f} → {metrics['roc_auc']:.4f}")
+
+    return CompactionResult(model=compacted, trees=np.sort(trees), report=report)
+
+
+def print_compaction_report(report: Dict[str, Any]) -> None:
+    """Print size, latency and metric deltas of a compaction."""
+    print("\n" + "="*50)
+    print("FOREST COMPACTION")
+    print("="*50)
+    print(f"{'trees':>15s}: {report['trees_before']} → {report['trees_after']}")
+    print(f"{'precision':>15s}: thresholds {report['threshold_dtype']}, "
+          f"leaves {report['value_dtype']}")
+    before, after = report["serialized_bytes_before"], report["serialized_bytes_after"]
+    print(f"{'size':>15s}: {before / 2**20:.2f} MB → {after / 2**20:.2f} MB "
+          f"({after / before:.1%})")
+    print(f"{'latency':>15s}: {report['latency_ms_before']:.2f} ms → "
+          f"{report['latency_ms_after']:.2f} ms")
+    for metric, delta in report["metric_deltas"].items():
+        print(f"{metric:>15s}: {report['metrics_after'][metric]:.4f} ({delta:+.4f})")
+    if not report["within_tolerance"]:
+        print("⚠️  Validation ROC AUC outside tolerance")
+    print("="*50 + "\n")
@@ -0,0 +1,433 @@
+"""
+Flattened, array-backed tree ensemble inference.
+
+WHAT: Convert a trained forest into contiguous NumPy node arrays and
+    traverse all trees for a whole batch at once
+WHY: sklearn scores a RandomForest tree by tree through Python dispatch,
+    which dominates latency for small batches
+WHEN: Scoring RandomForestClassifier (train_model) or XGBClassifier
+    (scripts/experiment_xgboost.py) models
+WHEN NOT: Other model types (use the model's own predict_proba)
+ALTERNATIVE: ONNX / treelite (extra runtime dependencies)
+"""
+
+import json
+import numpy as np
+import pandas as pd
+from typing import Any, List, Optional
+
+
+# Rows traversed together; keeps the (n_trees, block) node matrix in cache
+_BLOCK_ROWS = 4096
+
+
+# Threshold / leaf value dtypes a FlatForest can hold
+_THRESHOLD_DTYPES = (np.float16, np.float32)
+_VALUE_DTYPES = (np.float16, np.float32, np.float64)
+
+
+def _floor_cast(threshold: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    """Largest value of dtype <= each threshold."""
+    cast = threshold.astype(dtype)
+    too_high = cast.astype(np.float64) > threshold
+    cast[too_high] = np.nextafter(cast[too_high], dtype(-np.inf))
+    return cast
+
+
+def _float32_floor(threshold: np.ndarray) -> np.ndarray:
+    """
+    Largest float32 <= each float64 threshold.
+
+    For float32 inputs x: x <= t64  <=>  x <= floor32(t64), so comparisons
+    stay exact with float32 thresholds.
+    """
+    return _floor_cast(threshold, np.float32)
+
+
+class FlatForest:
+    """
+    Tree ensemble as flat node arrays.
+
+    WHAT: feature/threshold/children/default_left/value per node, all
+        trees concatenated
+    WHY: One vectorized step per tree level, for every tree and row at once
+    WHEN: Low-latency or high-throughput scoring
+    WHEN NOT: Training (convert after fitting)
+    ALTERNATIVE: model.predict_proba
+
+    Nodes are laid out breadth-first so that siblings are adjacent: a row
+    at node i moves to children[i] (left) or children[i] + 1 (right). It
+    goes right when x > threshold (float32), or when x is NaN and
+    default_left is not set. Leaves are their own left child with an
+    infinite threshold, so rows that reach a leaf stay there. Leaf values
+    are per-class probabilities averaged over trees (RandomForest, value of
+    shape (n_nodes, 2)) or margins summed and passed through a sigmoid
+    (XGBoost binary:logistic, value of shape (n_nodes,)).
+    """
+
+    # Node/tree arrays, in the order used by shared-memory and compaction code
+    ARRAYS = ("feature", "threshold", "children", "default_left", "value", "roots")
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray,
+                 children: np.ndarray, default_left: np.ndarray,
+                 value: np.ndarray, roots: np.ndarray, max_depth: int,
+                 aggregation: str, base_margin: float = 0.0,
+                 classes: Optional[np.ndarray] = None,
+                 feature_names: Optional[List[str]] = None):
+        if aggregation not in ("mean", "logistic"):
+            raise ValueError(f"Unknown aggregation: {aggregation}")
+
+        feature = np.asarray(feature)
+        threshold = np.asarray(threshold)
+        # Narrower dtypes (int16 features, float16 thresholds) come from astype()
+        if feature.dtype not in (np.int16, np.int32):
+            feature = feature.astype(np.int32)
+        if threshold.dtype not in _THRESHOLD_DTYPES:
+            threshold = threshold.astype(np.float32)
+        self.feature = np.ascontiguousarray(feature)
+        self.threshold = np.ascontiguousarray(threshold)
+        self.children = np.ascontiguousarray(children, dtype=np.int32)
+        self.default_left = np.ascontiguousarray(default_left, dtype=bool)
+        self.value = np.ascontiguousarray(value)
+        self.roots = np.ascontiguousarray(roots, dtype=np.int32)
+        self.max_depth = int(max_depth)
+        self.aggregation = aggregation
+        self.base_margin = float(base_margin)
+        self.classes_ = np.array([0, 1]) if classes is None else np.asarray(classes)
+        self.feature_names_in_ = (None if feature_names is None
+                                  else np.asarray(feature_names, dtype=object))
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the node arrays."""
+        return sum(getattr(self, name).nbytes for name in self.ARRAYS)
+
+    @classmethod
+    def from_model(cls, model: Any) -> "FlatForest":
+        """
+        Flatten a fitted RandomForestClassifier or XGBClassifier.
+
+        Raises:
+            TypeError: For any other model type
+        """
+        if isinstance(model, FlatForest):
+            return model
+        if hasattr(model, "estimators_") and hasattr(model.estimators_[0], "tree_"):
+            return cls.from_sklearn(model)
+        if hasattr(model, "get_booster"):
+            return cls.from_xgboost(model)
+        raise TypeError(f"Cannot flatten model of type {type(model).__name__}")
+
+    @classmethod
+    def from_sklearn(cls, model: Any) -> "FlatForest":
+        """Flatten a fitted binary sklearn RandomForestClassifier."""
+        if len(model.classes_) != 2:
+            raise ValueError("Only binary classifiers are supported")
+
+        builder = _Builder()
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            # Same normalisation as DecisionTreeClassifier.predict_proba
+            value = tree.value[:, 0, :]
+            n = tree.node_count
+            builder.add(
+                left=tree.children_left,
+                right=tree.children_right,
+                feature=tree.feature,
+                threshold=_float32_floor(tree.threshold.astype(np.float64)),
+                default_left=getattr(tree, "missing_go_to_left",
+                                     np.zeros(n)).astype(bool),
+                value=value / value.sum(axis=1, keepdims=True),
+            )
+
+        names = getattr(model, "feature_names_in_", None)
+        return builder.build(
+            value_dtype=np.float64,
+            aggregation="mean",
+            classes=model.classes_,
+            feature_names=None if names is None else list(names),
+        )
+
+    @classmethod
+    def from_xgboost(cls, model: Any) -> "FlatForest":
+        """Flatten a fitted binary:logistic XGBClassifier (or Booster)."""
+        booster = model.get_booster() if hasattr(model, "get_booster") else model
+        dump = json.loads(booster.save_raw("json"))
+        learner = dump["learner"]
+
+        objective = learner["objective"]["name"]
+        if objective != "binary:logistic":
+            raise ValueError(f"Unsupported XGBoost objective: {objective}")
+
+        base_score = learner["learner_model_param"]["base_score"]
+        base_score = float(str(base_score).strip("[]"))
+        trees = learner["gradient_booster"]["model"]["trees"]
+        n_rounds = _xgboost_rounds(model)
+        if n_rounds is not None:
+            indptr = learner["gradient_booster"]["model"]["iteration_indptr"]
+            trees = trees[:indptr[n_rounds]]
+
+        builder = _Builder()
+        for tree in trees:
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+            left = np.asarray(tree["left_children"], dtype=np.int64)
+            builder.add(
+                left=left,
+                right=np.asarray(tree["right_children"], dtype=np.int64),
+                feature=np.asarray(tree["split_indices"], dtype=np.int64),
+                # XGBoost goes left on x < split; for float32 x that is x <= prev(split)
+                threshold=np.nextafter(conditions, np.float32(-np.inf)),
+                default_left=np.asarray(tree["default_left"], dtype=bool),
+                # Leaf nodes store their (already learning-rate scaled) weight here
+                value=np.where(left < 0, conditions, np.float32(0)),
+            )
+
+        return builder.build(
+            value_dtype=np.float32,
+            aggregation="logistic",
+            base_margin=np.log(base_score / (1.0 - base_score)),
+            classes=getattr(model, "classes_", None),
+            feature_names=booster.feature_names,
+        )
+
+    def subset(self, trees) -> "FlatForest":
+        """
+        Forest made of the given trees only (in the given order).
+
+        Node arrays are copied and child indices rebased; aggregation is
+        unchanged (mean over the kept trees, or summed margins).
+        """
+        trees = np.asarray(trees, dtype=np.intp)
+        if len(trees) == 0:
+            raise ValueError("A forest needs at least one tree")
+        ends = np.append(self.roots[1:], self.n_nodes)
+        starts, stops = self.roots[trees], ends[trees]
+        nodes = np.concatenate([np.arange(a, b) for a, b in zip(starts, stops)])
+        new_roots = np.concatenate([[0], np.cumsum(stops - starts)[:-1]])
+        shift = np.repeat(new_roots - starts, stops - starts)
+
+        return self._replace(
+            feature=self.feature[nodes],
+            threshold=self.threshold[nodes],
+            children=self.children[nodes] + shift,
+            default_left=self.default_left[nodes],
+            value=self.value[nodes],
+            roots=new_roots,
+        )
+
+    def astype(self, threshold_dtype: np.dtype = np.float32,
+               value_dtype: np.dtype = np.float32) -> "FlatForest":
+        """
+        Compact copy with narrower node arrays.
+
+        WHAT: Thresholds floored to threshold_dtype, leaf values cast to
+            value_dtype, class-0 leaf column dropped (RandomForest), feature
+            ids int16 when they fit
+        WHY: Smaller model in RAM and on disk, less memory traffic
+        WHEN: After training, checked by forest compaction
+        WHEN NOT: Exact agreement with the source model is required
+        ALTERNATIVE: Keep float64 leaves / float32 thresholds
+
+        float16 thresholds change which side of a split some inputs fall
+        on; the caller is expected to validate the metric impact.
+        """
+        if np.dtype(threshold_dtype) not in _THRESHOLD_DTYPES:
+            raise ValueError(f"threshold_dtype must be one of {_THRESHOLD_DTYPES}")
+        if np.dtype(value_dtype) not in _VALUE_DTYPES:
+            raise ValueError(f"value_dtype must be one of {_VALUE_DTYPES}")
+
+        leaf = self.threshold == np.inf
+        threshold = _floor_cast(self.threshold.astype(np.float64),
+                                np.dtype(threshold_dtype).type)
+        threshold[leaf] = np.inf
+        # Per-tree class probabilities sum to 1: class 1 alone is enough
+        value = self.value[:, 1] if self.value.ndim == 2 else self.value
+        feature = self.feature
+        if feature.max(initial=0) <= np.iinfo(np.int16).max:
+            feature = feature.astype(np.int16)
+
+        return self._replace(feature=feature, threshold=threshold,
+                             value=value.astype(value_dtype))
+
+    def _replace(self, **arrays: np.ndarray) -> "FlatForest":
+        fields = {name: getattr(self, name) for name in self.ARRAYS}
+        fields.update(arrays)
+        return FlatForest(
+            **fields,
+            max_depth=self.max_depth,
+            aggregation=self.aggregation,
+            base_margin=self.base_margin,
+            classes=self.classes_,
+            feature_names=(None if self.feature_names_in_ is None
+                           else list(self.feature_names_in_)),
+        )
+
+    def predict_proba(self, X) -> np.ndarray:
+        """
+        Class probabilities for a batch, shape (n_rows, 2).
+
+        Args:
+            X: DataFrame (columns reordered to the training order when
+                names are known) or 2D array
+        """
+        X = self._as_float32(X)
+        n_rows = X.shape[0]
+        proba = np.empty((n_rows, 2), dtype=np.float64)
+
+        for start in range(0, n_rows, _BLOCK_ROWS):
+            block = X[start:start + _BLOCK_ROWS]
+            proba[start:start + len(block)] = self._proba_block(block)
+
+        return proba
+
+    def predict(self, X) -> np.ndarray:
+        """Class labels (argmax of predict_proba, like the source model)."""
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+    def leaf_values(self, X) -> np.ndarray:
+        """
+        Per-tree leaf value for every row, shape (n_trees, n_rows).
+
+        Class-1 probability per tree (RandomForest) or margin per tree
+        (XGBoost).
+        """
+        X = self._as_float32(X)
+        positive = self.value[:, 1] if self.value.ndim == 2 else self.value
+        blocks = [
+            np.take(positive, self._apply(X[start:start + _BLOCK_ROWS]))
+            for start in range(0, len(X), _BLOCK_ROWS)
+        ]
+        if not blocks:
+            return np.empty((self.n_trees, 0), dtype=positive.dtype)
+        return np.concatenate(blocks, axis=1)
+
+    def _proba_block(self, X: np.ndarray) -> np.ndarray:
+        leaves = self._apply(X)
+        if self.aggregation == "mean" and self.value.ndim == 1:
+            # Compacted forest: class-1 values only
+            positive = np.zeros(X.shape[0], dtype=np.float64)
+            for tree_leaves in leaves:
+                positive += np.take(self.value, tree_leaves)
+            positive /= self.n_trees
+            return np.column_stack([1.0 - positive, positive])
+        if self.aggregation == "mean":
+            # Tree-by-tree accumulation then divide, exactly as sklearn does
+            total = np.zeros((X.shape[0], 2), dtype=np.float64)
+            for tree_leaves in leaves:
+                total += np.take(self.value, tree_leaves, axis=0)
+            return total / self.n_trees
+        margin = np.take(self.value, leaves).sum(axis=0, dtype=np.float32)
+        positive = 1.0 / (1.0 + np.exp(-(margin + np.float32(self.base_margin))))
+        return np.column_stack([1.0 - positive, positive])
+
+    def _apply(self, X: np.ndarray) -> np.ndarray:
+        """Leaf index reached in every tree by every row, (n_trees, n_rows)."""
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        row_offset = np.arange(n_rows, dtype=np.intp) * n_features
+        node = np.repeat(self.roots[:, None], n_rows, axis=1)
+        has_nan = bool(np.isnan(flat_X).any())
+
+        for _ in range(self.max_depth):
+            x = np.take(flat_X, row_offset + np.take(self.feature, node))
+            go_right = x > np.take(self.threshold, node)
+            if has_nan:
+                go_right |= np.isnan(x) & ~np.take(self.default_left, node)
+            node = np.take(self.children, node)
+            node += go_right
+
+        return node
+
+    def _as_float32(self, X) -> np.ndarray:
+        if isinstance(X, pd.DataFrame) and self.feature_names_in_ is not None:
+            X = X[list(self.feature_names_in_)]
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        return X
+
+
+class _Builder:
+    """Accumulate trees in breadth-first, sibling-adjacent layout."""
+
+    def __init__(self):
+        self.parts = {k: [] for k in ("feature", "threshold", "children",
+                                      "default_left", "value")}
+        self.roots: List[int] = []
+        self.offset = 0
+        self.max_depth = 0
+
+    def add(self, left: np.ndarray, right: np.ndarray, feature: np.ndarray,
+            threshold: np.ndarray, default_left: np.ndarray, value: np.ndarray) -> None:
+        """Add one tree given per-node arrays (children -1 at leaves)."""
+        order, children, depth = _breadth_first(np.asarray(left), np.asarray(right))
+        is_leaf = np.asarray(left)[order] < 0
+
+        self.parts["feature"].append(np.where(is_leaf, 0, np.asarray(feature)[order]))
+        self.parts["threshold"].append(
+            np.where(is_leaf, np.float32(np.inf),
+                     np.asarray(threshold, dtype=np.float32)[order])
+        )
+        self.parts["children"].append(children + self.offset)
+        self.parts["default_left"].append(is_leaf | np.asarray(default_left)[order])
+        self.parts["value"].append(np.asarray(value)[order])
+
+        self.roots.append(self.offset)
+        self.offset += len(order)
+        self.max_depth = max(self.max_depth, depth)
+
+    def build(self, value_dtype: np.dtype, **kwargs: Any) -> FlatForest:
+        return FlatForest(
+            feature=np.concatenate(self.parts["feature"]),
+            threshold=np.concatenate(self.parts["threshold"]),
+            children=np.concatenate(self.parts["children"]),
+            default_left=np.concatenate(self.parts["default_left"]),
+            value=np.concatenate(self.parts["value"]).astype(value_dtype),
+            roots=np.array(self.roots),
+            max_depth=self.max_depth,
+            **kwargs,
+        )
+
+
+def _breadth_first(left: np.ndarray, right: np.ndarray):
+    """
+    Breadth-first node order with siblings adjacent.
+
+    Returns:
+        (order, children, depth): order[new] = old node id; children[new] =
+        new id of the left child (right is +1), or new itself for leaves;
+        depth of the tree
+    """
+    order = [0]
+    children = []
+    depth = {0: 0}
+    max_depth = 0
+    i = 0
+    while i < len(order):
+        node = order[i]
+        if left[node] >= 0:
+            children.append(len(order))
+            order.extend((left[node], right[node]))
+            depth[left[node]] = depth[right[node]] = depth[node] + 1
+            max_depth = max(max_depth, depth[node] + 1)
+        else:
+            children.append(i)
+        i += 1
+    return np.array(order), np.array(children), max_depth
+
+
+def _xgboost_rounds(model: Any) -> Optional[int]:
+    """Boosting rounds predict_proba uses (early-stopping best iteration)."""
+    try:
+        best = model.best_iteration
+    except AttributeError:
+        return None
+    return None if best is None else best + 1
@@ -0,0 +1,213 @@
+"""
+Low-latency single-row inference.
+
+WHAT: Score one customer without building a DataFrame
+WHY: DataFrame + transform() + predict_safe costs milliseconds per row
+WHEN: Request-time scoring of individual customers
+WHEN NOT: Batches (vectorized transform/predict_proba is faster per row)
+ALTERNATIVE: predict_safe on a one-row DataFrame (pandas overhead)
+"""
+
+import math
+import time
+import warnings
+import numpy as np
+from typing import Any, Dict, Mapping, Sequence, Union
+
+from churn_prediction.features.engineering import FeatureEngineer
+from churn_prediction.models.forest import FlatForest
+
+
+Row = Union[Mapping[str, float], Sequence[float]]
+
+
+class CompiledScorer:
+    """
+    Pre-validated, preallocated scoring kernel for one row at a time.
+
+    WHAT: Frozen column order + scaler + model, numpy buffers only
+    WHY: Keep per-request work proportional to the number of features
+    WHEN: Online scoring with a latency budget
+    WHEN NOT: Offline scoring (use transform_array + predict_proba)
+    ALTERNATIVE: A model server with its own feature pipeline
+
+    Binary linear models (coef_/intercept_) are scored with one dot
+    product; RandomForest and XGBoost models are flattened to a FlatForest;
+    other models fall back to their predict_proba on the preallocated row.
+    Latency of every call is recorded in a ring buffer.
+    """
+
+    def __init__(self, engineer: FeatureEngineer, model: Any,
+                 threshold: float = 0.5, latency_window: int = 10_000):
+        if not engineer.fitted:
+            raise ValueError("Must call fit_transform() before compiling a scorer")
+
+        self.feature_names = list(engineer.feature_cols)
+        model_features = getattr(model, "feature_names_in_", None)
+        if model_features is not None and list(model_features) != self.feature_names:
+            raise ValueError(
+                f"Model features {list(model_features)} do not match "
+                f"engineer features {self.feature_names}"
+            )
+
+        self.engineer = engineer
+        self.model = model
+        self.threshold = threshold
+        self._index = {name: i for i, name in enumerate(self.feature_names)}
+        # Categorical features arrive as raw strings and are encoded on fill
+        self._categorical = [
+            (name, self._index[name]) for name in engineer.categorical_cols
+        ]
+
+        n_features = len(self.feature_names)
+        self._raw = np.empty((1, n_features), dtype=np.float64)
+        self._row = np.empty((1, n_features), dtype=np.float64)
+        self._raw_1d = self._raw[0]
+        self._row_1d = self._row[0]
+
+        coef = getattr(model, "coef_", None)
+        if (coef is not None and np.shape(coef)[0] == 1
+                and hasattr(model, "predict_proba")):
+            self._coef = np.ascontiguousarray(coef[0], dtype=np.float64)
+            self._intercept = float(np.ravel(model.intercept_)[0])
+            self._kernel = self._score_linear
+        else:
+            try:
+                self._forest = FlatForest.from_model(model)
+                self._kernel = self._score_forest
+            except (TypeError, ValueError):
+                self._kernel = self._score_model
+
+        self._latencies = np.zeros(latency_window, dtype=np.int64)
+        self._n_calls = 0
+
+    def score(self, row: Row) -> float:
+        """
+        Churn probability for one customer.
+
+        Args:
+            row: Mapping of feature name -> raw value, or a sequence in
+                feature_names order
+
+        Returns:
+            Probability of churn
+
+        Raises:
+            ValueError: If features are missing, NaN or Inf
+        """
+        start = time.perf_counter_ns()
+
+        self._fill(row)
+        self.engineer.transform_array(self._raw, dtype=np.float64, out=self._row)
+        proba = self._kernel()
+
+        elapsed = time.perf_counter_ns() - start
+        self._latencies[self._n_calls % len(self._latencies)] = elapsed
+        self._n_calls += 1
+
+        return proba
+
+    def predict(self, row: Row) -> int:
+        """Churn label for one customer (probability above threshold)."""
+        return int(self.score(row) > self.threshold)
+
+    def latency_stats(self) -> Dict[str, float]:
+        """
+        Latency percentiles of recent score() calls.
+
+        Returns:
+            Dictionary with count, p50_us, p99_us, max_us over the last
+            latency_window calls
+        """
+        n = min(self._n_calls, len(self._latencies))
+        if n == 0:
+            return {"count": 0, "p50_us": 0.0, "p99_us": 0.0, "max_us": 0.0}
+
+        recent = self._latencies[:n] / 1e3
+        p50, p99 = np.percentile(recent, [50, 99])
+        return {
+            "count": self._n_calls,
+            "p50_us": float(p50),
+            "p99_us": float(p99),
+            "max_us": float(recent.max()),
+        }
+
+    def _fill(self, row: Row) -> None:
+        """Copy raw features into the preallocated buffer and validate."""
+        raw = self._raw_1d
+
+        if self._categorical:
+            row = self._encode(row)
+
+        if isinstance(row, Mapping):
+            try:
+                for name, i in self._index.items():
+                    raw[i] = row[name]
+            except KeyError as e:
+                raise ValueError(f"Missing feature: {e.args[0]}") from None
+        else:
+            if len(row) != len(raw):
+                raise ValueError(f"Expected {len(raw)} features, got {len(row)}")
+            raw[:] = row
+
+        # One check covers both NaN and Inf on the fast path
+        if not math.isfinite(raw.sum()):
+            bad = [self.feature_names[i] for i in np.flatnonzero(np.isnan(raw))]
+            if bad:
+                raise ValueError(f"Input contains NaN values in columns: {bad}")
+            raise ValueError("Input contains Inf values")
+
+    def _encode(self, row: Row) -> Row:
+        """Replace raw categorical values with their codes."""
+        encode = self.engineer.encode_value
+        if isinstance(row, Mapping):
+            row = dict(row)
+            for name, _ in self._categorical:
+                if name in row:
+                    row[name] = encode(name, row[name])
+        else:
+            row = list(row)
+            for name, i in self._categorical:
+                if i < len(row):
+                    row[i] = encode(name, row[i])
+        return row
+
+    def _score_linear(self) -> float:
+        z = float(self._row_1d @ self._coef) + self._intercept
+        # Numerically safe logistic for large |z|
+        if z >= 0:
+            return 1.0 / (1.0 + math.exp(-z))
+        e = math.exp(z)
+        return e / (1.0 + e)
+
+    def _score_forest(self) -> float:
+        return float(self._forest.predict_proba(self._row)[0, 1])
+
+    def _score_model(self) -> float:
+        with warnings.catch_warnings():
+            # Model was fitted on a DataFrame; the buffer has the same column order
+            warnings.filterwarnings("ignore",
+                                    message="X does not have valid feature names")
+            return float(self.model.predict_proba(self._row)[0, 1])
+
+
+def compile_scorer(engineer: FeatureEngineer, model: Any,
+                   **kwargs: Any) -> CompiledScorer:
+    """
+    Export a fitted engineer + model as a single-row scoring kernel.
+
+    WHAT: Build a CompiledScorer
+    WHY: One object to hand to the request handler
+    WHEN: Service startup, after load_model
+    WHEN NOT: Batch scoring
+    ALTERNATIVE: Construct CompiledScorer directly
+
+    Args:
+        engineer: Fitted FeatureEngineer
+        model: Model trained on engineer's output
+        **kwargs: threshold, latency_window
+
+    Returns:
+        CompiledScorer
+    """
+    return CompiledScorer(engineer, model, **kwargs)
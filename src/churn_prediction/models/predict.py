@@ -10,56 +10,202 @@ ALTERNATIVE: Allow NaNs (causes production failures)
 
 import numpy as np
 import pandas as pd
-from typing import Any
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 
-def predict_safe(model: Any, X: pd.DataFrame) -> np.ndarray:
+class ValidationResult(NamedTuple):
+    """Outcome of validate_batch: per-row mask plus reasons for bad rows."""
+    valid_mask: np.ndarray
+    reasons: pd.Series
+    nan_columns: List[str]
+    inf_columns: List[str]
+    range_columns: List[str]
+
+
+class QuarantineResult(NamedTuple):
+    """Predictions for valid rows plus the rows that were set aside."""
+    predictions: np.ndarray
+    valid_index: pd.Index
+    rejected_index: pd.Index
+    reasons: pd.Series
+
+
+def validate_batch(X: pd.DataFrame,
+                   ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+                   expected_columns: Optional[List[str]] = None) -> ValidationResult:
+    """
+    Check NaN, Inf, value ranges and schema in one pass per column.
+
+    WHAT: One isfinite scan per numeric column, one range compare per
+        bounded column; reasons are only built for the (few) bad rows
+    WHY: predict_safe used to scan the whole batch three times
+    WHEN: Before scoring any batch
+    WHEN NOT: N/A
+    ALTERNATIVE: Separate isnull / isinf / range passes
+
+    Args:
+        X: Input features
+        ranges: Optional column -> (min, max) inclusive bounds
+        expected_columns: Columns the model needs (schema check)
+
+    Returns:
+        ValidationResult; reasons is indexed like X and holds one string
+        per rejected row, e.g. "NaN: Age; Inf: TotalCharges"
+
+    Raises:
+        ValueError: If expected columns are missing (no row can be scored)
+    """
+    if expected_columns is not None:
+        missing = [c for c in expected_columns if c not in X.columns]
+        if missing:
+            raise ValueError(f"Input is missing columns: {missing}")
+
+    ranges = ranges or {}
+    n_rows = len(X)
+    bad_rows = np.zeros(n_rows, dtype=bool)
+    # (column, mask) for every column that has at least one problem
+    problems = []
+
+    for col in X.columns:
+        values = X[col].to_numpy()
+
+        if values.dtype.kind in "fc":
+            bad = ~np.isfinite(values)
+        elif values.dtype.kind in "iub":
+            bad = None
+        else:
+            bad = pd.isna(values)
+
+        if col in ranges:
+            lo, hi = ranges[col]
+            out_of_range = (values < lo) | (values > hi)
+            bad = out_of_range if bad is None else bad | out_of_range
+
+        if bad is not None and bad.any():
+            problems.append((col, values, bad))
+            bad_rows |= bad
+
+    nan_columns, inf_columns, range_columns = [], [], []
+    reasons = [[] for _ in range(int(bad_rows.sum()))]
+    row_position = np.cumsum(bad_rows) - 1
+
+    for col, values, bad in problems:
+        rows = np.flatnonzero(bad)
+        cells = values[rows]
+        is_nan = pd.isna(cells)
+        if values.dtype.kind in "fc":
+            is_inf = ~is_nan & np.isinf(cells)
+        else:
+            is_inf = np.zeros(len(rows), dtype=bool)
+
+        if is_nan.any():
+            nan_columns.append(col)
+        if is_inf.any():
+            inf_columns.append(col)
+        if (~is_nan & ~is_inf).any():
+            range_columns.append(col)
+
+        for row, nan, inf in zip(row_position[rows], is_nan, is_inf):
+            label = "NaN" if nan else "Inf" if inf else "out of range"
+            reasons[row].append(f"{label}: {col}")
+
+    return ValidationResult(
+        valid_mask=~bad_rows,
+        reasons=pd.Series(["; ".join(r) for r in reasons], index=X.index[bad_rows],
+                          dtype=object),
+        nan_columns=nan_columns,
+        inf_columns=inf_columns,
+        range_columns=range_columns,
+    )
+
+
+def predict_safe(model: Any, X: pd.DataFrame,
+                 ranges: Optional[Dict[str, Tuple[float, float]]] = None) -> np.ndarray:
     """
     Make predictions with input validation.
-    
+
     WHAT: Validate inputs before prediction
     WHY: Catch NaNs before they cause issues
     WHEN: Production inference
     WHEN NOT: Training (NaNs handled in preprocessing)
     ALTERNATIVE: model.predict() directly (risky)
-    
+
     Args:
         model: Trained model
         X: Input features
-        
+        ranges: Optional column -> (min, max) bounds to enforce
+
     Returns:
         Predictions
-        
+
     Raises:
-        ValueError: If input contains NaN or Inf
+        ValueError: If input contains NaN, Inf or out-of-range values,
+            or misses columns the model was trained on
     """
-    # WHAT: Check for NaN values
-    # WHY: NaN → NaN predictions
+    # WHAT: Single-pass validation (NaN, Inf, ranges, schema)
+    # WHY: NaN → NaN predictions, Inf → unstable predictions
     # WHEN: Before every prediction
     # WHEN NOT: Never skip validation
-    # ALTERNATIVE: Fill NaN (changes data unexpectedly)
-    
-    if X.isnull().any().any():
+    # ALTERNATIVE: Fill NaN / clip Inf (silent data modification)
+
+    result = validate_batch(X, ranges, _expected_columns(model))
+
+    if result.nan_columns:
         raise ValueError(
-            f"Input contains NaN values in columns: "
-            f"{X.columns[X.isnull().any()].tolist()}"
+            f"Input contains NaN values in columns: {result.nan_columns}"
         )
-    
-    # WHAT: Check for Inf values
-    # WHY: Inf → unstable predictions
-    # WHEN: Before every prediction
-    # WHEN NOT: Never skip validation
-    # ALTERNATIVE: Clip Inf (silent data modification)
-    
-    if np.isinf(X.select_dtypes(include=[np.number])).any().any():
+    if result.inf_columns:
         raise ValueError("Input contains Inf values")
-    
+    if result.range_columns:
+        raise ValueError(
+            f"Input contains out-of-range values in columns: {result.range_columns}"
+        )
+
     # WHAT: Make prediction
     # WHY: Inputs validated, safe to predict
     # WHEN: After validation passes
     # WHEN NOT: If validation fails
     # ALTERNATIVE: None
-    
+
     predictions = model.predict(X)
-    
+
     return predictions
+
+
+def predict_quarantine(model: Any, X: pd.DataFrame,
+                       ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+                       ) -> QuarantineResult:
+    """
+    Score the valid rows of a batch and set the invalid ones aside.
+
+    WHAT: validate_batch, then predict only rows that passed
+    WHY: One bad record must not abort (and force a retry of) a whole batch
+    WHEN: Large production batches
+    WHEN NOT: Interactive use where bad input should fail loudly (predict_safe)
+    ALTERNATIVE: predict_safe + retry without the bad rows (rescans everything)
+
+    Args:
+        model: Trained model
+        X: Input features
+        ranges: Optional column -> (min, max) bounds to enforce
+
+    Returns:
+        QuarantineResult with predictions aligned to valid_index, and the
+        rejected rows' index with a reason per row
+    """
+    result = validate_batch(X, ranges, _expected_columns(model))
+
+    valid = X[result.valid_mask] if not result.valid_mask.all() else X
+    predictions = model.predict(valid) if len(valid) else np.empty(0, dtype=np.int64)
+
+    return QuarantineResult(
+        predictions=predictions,
+        valid_index=valid.index,
+        rejected_index=result.reasons.index,
+        reasons=result.reasons,
+    )
+
+
+def _expected_columns(model: Any) -> Optional[List[str]]:
+    names = getattr(model, "feature_names_in_", None)
+    return None if names is None else list(names)
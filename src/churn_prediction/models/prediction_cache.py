@@ -0,0 +1,181 @@
+"""
+LRU/TTL prediction cache in front of predict_safe.
+
+WHAT: Reuse predictions for customers whose raw features have not changed
+WHY: Much of the daily scoring traffic re-scores unchanged customers
+WHEN: Repeated scoring with the same model and engineer
+WHEN NOT: One-off batch runs (every row is a miss, hashing is overhead)
+ALTERNATIVE: Score everything every time (simple, wastes model time)
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from churn_prediction.features.engineering import FeatureEngineer
+from churn_prediction.models.predict import predict_safe
+from churn_prediction.models.train import model_version
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of predictions with a time-to-live.
+
+    WHAT: Row key = hash of the raw feature vector mixed with a hash of
+        the model/engineer version; hits are served from an OrderedDict,
+        misses go to predict_safe as one batch
+    WHY: Skip the engineer and the model for customers seen recently
+    WHEN: Online or repeated scoring
+    WHEN NOT: Models whose output depends on anything but the features
+    ALTERNATIVE: functools.lru_cache (per-call keys, no TTL, no batching)
+
+    The version is read from the current model and engineer on every call
+    (train.model_version), so assigning a newly loaded model to
+    cache.model drops every cached entry. Rows are keyed on the columns
+    the engineer consumes (or the model's features without an engineer);
+    other columns are ignored. A numeric identifier the engineer was
+    fitted on is a model input, so it is part of the key: scripts/train.py
+    trains on CustomerID, and there every customer has its own entry and
+    hits come only from re-scoring the same customers.
+
+    Usage:
+        cache = PredictionCache(model, engineer, maxsize=100_000, ttl=3600)
+        predictions = cache.predict(raw_customers)
+        cache.model = load_model(new_path)  # next call starts empty
+    """
+
+    def __init__(self, model: Any, engineer: Optional[FeatureEngineer] = None,
+                 maxsize: int = 100_000, ttl: Optional[float] = 3600.0,
+                 ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.model = model
+        self.engineer = engineer
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.ranges = ranges
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+        self._clock = clock
+        # key -> (expires_at, prediction), least recently used first
+        self._entries: "OrderedDict[int, Tuple[float, Any]]" = OrderedDict()
+        self._version: Optional[str] = None
+        self._version_key = np.uint64(0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        Predictions for a batch, cached rows served without the model.
+
+        Args:
+            X: Raw customer features (engineer input), or model features
+                when the cache has no engineer
+
+        Returns:
+            Predictions aligned with X
+
+        Raises:
+            ValueError: If a row that has to be scored fails predict_safe
+                validation (nothing is cached for that batch)
+        """
+        self._check_version()
+        X = self._select(X)
+        row_hashes = pd.util.hash_pandas_object(X, index=False).to_numpy()
+        keys = row_hashes ^ self._version_key
+        now = self._clock()
+
+        predictions = [None] * len(keys)
+        miss_positions = []
+        for position, key in enumerate(keys.tolist()):
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                miss_positions.append(position)
+            else:
+                self._entries.move_to_end(key)
+                predictions[position] = entry[1]
+
+        self.hits += len(keys) - len(miss_positions)
+        self.misses += len(miss_positions)
+
+        if miss_positions:
+            fresh = self._score(X.iloc[miss_positions]).tolist()
+            expires_at = now + self.ttl if self.ttl is not None else float("inf")
+            miss_keys = keys[miss_positions].tolist()
+            for position, key, prediction in zip(miss_positions, miss_keys, fresh):
+                self._entries[key] = (expires_at, prediction)
+                self._entries.move_to_end(key)
+                predictions[position] = prediction
+            self._evict()
+
+        return np.asarray(predictions)
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss/eviction counters, current size and hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _check_version(self) -> None:
+        """Invalidate everything when the model or engineer changed."""
+        version = model_version(self.model)
+        if self.engineer is not None:
+            version += "|" + model_version(self.engineer)
+
+        if version != self._version:
+            if self._version is not None:
+                self.invalidations += 1
+                self._entries.clear()
+            self._version = version
+            digest = hashlib.blake2b(version.encode(), digest_size=8).digest()
+            self._version_key = np.frombuffer(digest, dtype=np.uint64)[0]
+
+    def _select(self, X: pd.DataFrame) -> pd.DataFrame:
+        """Columns that determine the prediction, in a fixed order."""
+        if self.engineer is not None:
+            columns = self.engineer.feature_cols
+        else:
+            names = getattr(self.model, "feature_names_in_", None)
+            columns = list(names) if names is not None else list(X.columns)
+
+        missing = [c for c in columns if c not in X.columns]
+        if missing:
+            raise ValueError(f"Input is missing columns: {missing}")
+
+        return X[columns]
+
+    def _score(self, X: pd.DataFrame) -> np.ndarray:
+        features = self.engineer.transform(X) if self.engineer is not None else X
+        return np.asarray(predict_safe(self.model, features, self.ranges))
+
+    def _evict(self) -> None:
+        """Drop least recently used entries beyond maxsize."""
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
@@ -0,0 +1,211 @@
+"""
+Bounded-memory churn risk ranking.
+
+WHAT: Stream customer chunks and keep only the N highest-risk customers
+    (overall and per segment), plus threshold selection, in one pass
+WHY: Retention campaigns need the top N, not a sorted score for everyone
+WHEN: Building campaign lists from the full customer base
+WHEN NOT: Every customer's score is needed (use batch.score_file)
+ALTERNATIVE: predict_proba everything, then sort (memory O(customers))
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from churn_prediction.features.engineering import FeatureEngineer
+from churn_prediction.models.predict import validate_batch
+
+
+Chunks = Union[str, Path, pd.DataFrame, Iterable[pd.DataFrame]]
+
+
+class RankingResult(NamedTuple):
+    """Outcome of top_n_risk."""
+    top: pd.DataFrame
+    segments: Dict[Any, pd.DataFrame]
+    selected: Optional[pd.DataFrame]
+    rows: int
+    rejected: int
+
+
+class TopN:
+    """
+    Fixed-size set of the highest scores seen so far.
+
+    WHAT: Merge each chunk's candidates with the current top N and cut
+        back to N with np.partition (O(chunk + N) per update)
+    WHY: Memory stays O(N) however many rows are streamed
+    WHEN: Any "N largest" over a stream of arrays
+    WHEN NOT: N close to the total row count (just sort)
+    ALTERNATIVE: heapq.nlargest per row (Python loop per customer)
+
+    Ties at the cut-off keep the earliest rows, so the result equals the
+    first N of a stable descending sort of everything seen.
+    """
+
+    def __init__(self, n: int):
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        self.n = n
+        self.scores = np.empty(0, dtype=np.float64)
+        # Any payload arrays (ids, segment labels), kept aligned with scores
+        self.payload: Dict[str, np.ndarray] = {}
+
+    def update(self, scores: np.ndarray, **payload: np.ndarray) -> None:
+        """Offer a chunk of scores with aligned payload columns."""
+        if len(scores) == 0:
+            return
+        if len(scores) > self.n:
+            # Pre-cut the chunk so the concatenation stays O(N)
+            keep = _first_largest(scores, self.n)
+            scores = scores[keep]
+            payload = {k: np.asarray(v)[keep] for k, v in payload.items()}
+
+        scores = np.concatenate([self.scores, scores])
+        payload = {
+            k: (np.concatenate([self.payload[k], v]) if k in self.payload
+                else np.asarray(v))
+            for k, v in payload.items()
+        }
+        if len(scores) > self.n:
+            keep = _first_largest(scores, self.n)
+            scores = scores[keep]
+            payload = {k: v[keep] for k, v in payload.items()}
+
+        self.scores = scores
+        self.payload = payload
+
+    def result(self) -> pd.DataFrame:
+        """Kept rows, highest score first, with a 1-based rank."""
+        order = np.argsort(-self.scores, kind="stable")
+        frame = pd.DataFrame({k: v[order] for k, v in self.payload.items()})
+        frame["probability"] = self.scores[order]
+        frame.insert(0, "rank", np.arange(1, len(order) + 1))
+        return frame
+
+
+def _first_largest(scores: np.ndarray, n: int) -> np.ndarray:
+    """Positions (ascending) of the n largest scores, earliest ties first."""
+    key = -scores
+    cutoff = np.partition(key, n - 1)[n - 1]
+    better = key < cutoff
+    ties = np.flatnonzero(key == cutoff)[:n - int(better.sum())]
+    better[ties] = True
+    return np.flatnonzero(better)
+
+
+def top_n_risk(model: Any,
+               data: Chunks,
+               n: int = 1000,
+               engineer: Optional[FeatureEngineer] = None,
+               id_col: str = "CustomerID",
+               segment_col: Optional[str] = None,
+               segment_n: Optional[int] = None,
+               threshold: Optional[float] = None,
+               chunksize: int = 100_000) -> RankingResult:
+    """
+    Rank customers by churn probability without holding every score.
+
+    WHAT: Chunk → transform → validate → predict_proba → TopN overall,
+        TopN per segment, and rows above threshold, all in one pass
+    WHY: Memory is O(N x segments + chunksize), not O(customers)
+    WHEN: Campaign lists ("the 5,000 riskiest customers per region")
+    WHEN NOT: Need every score (batch.score_file)
+    ALTERNATIVE: Score everything and sort_values (memory heavy)
+
+    Args:
+        model: Trained classifier with predict_proba
+        data: CSV path (read in chunks), a DataFrame, or an iterable of
+            DataFrames with raw customer features
+        n: Customers to keep overall
+        engineer: Fitted FeatureEngineer (None = data already transformed)
+        id_col: Identifier carried into the results (row position if absent)
+        segment_col: Optional column to rank within (e.g. region)
+        segment_n: Customers to keep per segment (default n)
+        threshold: Also return every customer with probability >= threshold
+            (memory grows with the selection)
+        chunksize: Rows per chunk when data is a path or a DataFrame
+
+    Returns:
+        RankingResult with top (rank, id, [segment], probability), a dict
+        of per-segment tables, the threshold selection, and rows scored /
+        rejected by validation
+    """
+    top = TopN(n)
+    segments: Dict[Any, TopN] = {}
+    selected = []
+    rows = rejected = 0
+
+    for chunk in _iter_chunks(data, chunksize):
+        if id_col in chunk.columns:
+            ids = chunk[id_col].to_numpy()
+        else:
+            ids = np.arange(rows, rows + len(chunk))
+        proba, valid = _score(model, engineer, chunk)
+        rows += len(chunk)
+        rejected += int((~valid).sum())
+
+        payload = {id_col: ids[valid]}
+        if segment_col is not None:
+            labels = chunk[segment_col].to_numpy()[valid]
+            payload[segment_col] = labels
+        top.update(proba, **payload)
+
+        if segment_col is not None:
+            codes, uniques = pd.factorize(labels, use_na_sentinel=False)
+            for code, label in enumerate(uniques):
+                mask = codes == code
+                segment = segments.setdefault(label, TopN(segment_n or n))
+                segment.update(proba[mask], **{k: v[mask] for k, v in payload.items()})
+
+        if threshold is not None:
+            above = proba >= threshold
+            if above.any():
+                selected.append(pd.DataFrame({
+                    **{k: v[above] for k, v in payload.items()},
+                    "probability": proba[above],
+                }))
+
+    selection = None
+    if threshold is not None:
+        columns = [id_col] + ([segment_col] if segment_col else []) + ["probability"]
+        selection = (pd.concat(selected, ignore_index=True) if selected
+                     else pd.DataFrame(columns=columns))
+
+    print(f"Ranked ( {rows} ) records, kept top {min(n, rows - rejected)} "
+          f"({rejected} rejected)")
+
+    return RankingResult(
+        top=top.result(),
+        segments={label: s.result() for label, s in segments.items()},
+        selected=selection,
+        rows=rows,
+        rejected=rejected,
+    )
+
+
+def _iter_chunks(data: Chunks, chunksize: int) -> Iterable[pd.DataFrame]:
+    if isinstance(data, (str, Path)):
+        yield from pd.read_csv(data, chunksize=chunksize)
+    elif isinstance(data, pd.DataFrame):
+        for start in range(0, len(data), chunksize):
+            yield data.iloc[start:start + chunksize]
+    else:
+        yield from data
+
+
+def _score(model: Any, engineer: Optional[FeatureEngineer], chunk: pd.DataFrame):
+    """Probabilities for the valid rows of a chunk, plus the validity mask."""
+    X = engineer.transform(chunk) if engineer is not None else chunk
+    features = getattr(model, "feature_names_in_", None)
+    if features is not None:
+        X = X[list(features)]
+
+    valid = validate_batch(X).valid_mask
+    if not valid.any():
+        return np.empty(0, dtype=np.float64), valid
+    proba = model.predict_proba(X[valid] if not valid.all() else X)[:, 1]
+    return np.asarray(proba, dtype=np.float64), valid
@@ -0,0 +1,257 @@
+"""
+Asyncio micro-batching prediction service.
+
+WHAT: Coalesce concurrent single-customer requests into small batches
+WHY: One predict_proba per request wastes the model's vectorized throughput
+WHEN: Many concurrent scoring requests (e.g. the CRM)
+WHEN NOT: Offline scoring (use batch.score_file)
+ALTERNATIVE: Per-request predict_safe (throughput limited by overhead)
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from churn_prediction.features.engineering import FeatureEngineer
+from churn_prediction.models.predict import validate_batch
+
+
+class MicroBatchScorer:
+    """
+    Queue requests and score them in batches on a worker thread.
+
+    WHAT: A batch closes when it has max_batch_size requests or the oldest
+        request has waited max_wait_ms
+    WHY: Trade a bounded amount of latency for batch throughput
+    WHEN: Inside an asyncio service
+    WHEN NOT: Synchronous code (use CompiledScorer)
+    ALTERNATIVE: Fixed-interval batching (adds latency when traffic is low)
+
+    Each caller's future resolves to its churn probability, or raises
+    ValueError for that request alone if its features are invalid.
+
+    Usage:
+        async with MicroBatchScorer(engineer, model) as scorer:
+            proba = await scorer.score({"Age": 42, ...})
+    """
+
+    def __init__(self, engineer: FeatureEngineer, model: Any,
+                 max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.engineer = engineer
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.batches = 0
+        self.requests = 0
+
+        features = getattr(model, "feature_names_in_", None)
+        self._features = list(features) if features is not None else None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def start(self) -> None:
+        """Start the batching loop on the running event loop."""
+        if self._task is None:
+            # One thread: batches run back to back, the model may use its own
+            # threads. Created here so a stopped scorer can be started again
+            self._executor = ThreadPoolExecutor(max_workers=1,
+                                                thread_name_prefix="scorer")
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the batching loop; pending requests are cancelled."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            future.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def __aenter__(self) -> "MicroBatchScorer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    async def score(self, row: Mapping[str, Any]) -> float:
+        """
+        Churn probability for one customer.
+
+        Args:
+            row: Mapping of raw feature name -> value
+
+        Returns:
+            Probability of churn
+
+        Raises:
+            ValueError: If the row has missing, NaN or Inf features
+        """
+        if self._task is None:
+            raise RuntimeError("MicroBatchScorer is not started")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))
+        return await future
+
+    def stats(self) -> Dict[str, float]:
+        """Batches run, requests served and mean batch size."""
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Drop requests whose callers gave up while waiting
+            batch = [(row, f) for row, f in batch if not f.done()]
+            if not batch:
+                continue
+
+            rows = [row for row, _ in batch]
+            try:
+                try:
+                    probabilities, errors = await loop.run_in_executor(
+                        self._executor, self._score_rows, rows
+                    )
+                except (ValueError, TypeError):
+                    # A malformed row (e.g. a string in a numeric column)
+                    # fails the whole transform: rescore rows one by one so
+                    # only that request gets the error
+                    probabilities, errors = await loop.run_in_executor(
+                        self._executor, self._score_each, rows
+                    )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.requests += len(batch)
+            for (_, future), proba, error in zip(batch, probabilities, errors):
+                if future.done():
+                    continue
+                if error is None:
+                    future.set_result(float(proba))
+                else:
+                    future.set_exception(ValueError(f"Invalid input: {error}"))
+
+    def _score_rows(self, rows: List[Mapping[str, Any]]
+                    ) -> Tuple[np.ndarray, List[Optional[str]]]:
+        """Transform, validate and score one batch (runs on the worker thread)."""
+        frame = pd.DataFrame.from_records(rows)
+        # A feature no request in the batch sent becomes NaN, so validate_batch
+        # rejects those rows instead of transform raising KeyError
+        missing = [c for c in self.engineer.feature_cols if c not in frame.columns]
+        if missing:
+            frame = frame.reindex(columns=[*frame.columns, *missing])
+        X = self.engineer.transform(frame)
+        if self._features is not None:
+            X = X.reindex(columns=self._features)
+
+        result = validate_batch(X)
+        probabilities = np.full(len(rows), np.nan)
+        valid = result.valid_mask
+        if valid.any():
+            probabilities[valid] = self.model.predict_proba(X[valid])[:, 1]
+
+        errors: List[Optional[str]] = [None] * len(rows)
+        for position, reason in zip(np.flatnonzero(~valid), result.reasons):
+            errors[position] = reason
+
+        return probabilities, errors
+
+    def _score_each(self, rows: List[Mapping[str, Any]]
+                    ) -> Tuple[np.ndarray, List[Optional[str]]]:
+        """_score_rows one row at a time, after its batch raised (worker thread)."""
+        probabilities = np.full(len(rows), np.nan)
+        errors: List[Optional[str]] = [None] * len(rows)
+        for i, row in enumerate(rows):
+            try:
+                proba, error = self._score_rows([row])
+            except (ValueError, TypeError) as e:
+                errors[i] = str(e)
+                continue
+            probabilities[i], errors[i] = proba[0], error[0]
+        return probabilities, errors
+
+
+async def serve_http(scorer: MicroBatchScorer, host: str = "127.0.0.1",
+                     port: int = 8080) -> asyncio.AbstractServer:
+    """
+    Minimal JSON-over-HTTP front end for a started MicroBatchScorer.
+
+    WHAT: POST a JSON object of features, get {"probability": p}
+    WHY: Lets the CRM (or a test) hit the batching service over HTTP
+        without adding a web framework dependency
+    WHEN: Local testing, simple internal deployments
+    WHEN NOT: Internet-facing serving (put a real server in front)
+    ALTERNATIVE: FastAPI/uvicorn around scorer.score
+
+    Returns:
+        The asyncio server (call close() / wait_closed() to stop it)
+    """
+    async def handle(reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await reader.readline()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            if not request_line.startswith(b"POST"):
+                status, payload = "405 Method Not Allowed", {"error": "POST only"}
+            else:
+                try:
+                    proba = await scorer.score(json.loads(body))
+                    status, payload = "200 OK", {"probability": proba}
+                except (ValueError, TypeError) as e:
+                    status, payload = "400 Bad Request", {"error": str(e)}
+
+            data = json.dumps(payload).encode()
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode()
+                + data
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
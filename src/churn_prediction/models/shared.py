@@ -0,0 +1,93 @@
+"""
+Share one copy of a model across scoring worker processes.
+
+WHAT: Publish the flattened model and the FeatureEngineer as read-only
+    memory-mapped artifacts (on /dev/shm when available); workers map
+    them instead of unpickling a private copy
+WHY: With load_model per worker, model memory grows linearly with the
+    number of workers and limits how many fit on a node
+WHEN: Multi-process scoring of RandomForest / XGBoost models
+WHEN NOT: One worker, or models FlatForest cannot flatten
+ALTERNATIVE: multiprocessing.shared_memory blocks (same sharing, but
+    Python < 3.13 registers attached blocks with the resource tracker,
+    which can unlink them under the publisher)
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from churn_prediction.features.engineering import FeatureEngineer
+from churn_prediction.models.forest import FlatForest
+from churn_prediction.models.train import load_model, save_model
+
+
+def shared_directory() -> str:
+    """/dev/shm (RAM-backed, shared page cache) if writable, else the temp dir."""
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+class SharedModel:
+    """
+    Read-only mapped model + engineer shared by worker processes.
+
+    WHAT: save_model(flatten=True) + save_model(engineer), uncompressed,
+        into a private directory; attach() maps them with mmap_mode="r"
+    WHY: Every process mapping the same file shares its physical pages;
+        the node arrays are never copied into worker memory
+    WHEN: Before starting a process pool (forked or spawned: workers only
+        need the paths)
+    WHEN NOT: In-process scoring
+    ALTERNATIVE: load_model in each worker (one private copy per worker)
+
+    The publisher owns the files: use it as a context manager, or call
+    close() once the workers are done.
+
+    Usage:
+        with SharedModel(model, engineer) as shared:
+            pool = ProcessPoolExecutor(initializer=init, initargs=shared.paths)
+            # in the worker: model, engineer = SharedModel.attach(*paths)
+    """
+
+    def __init__(self, model: Any, engineer: Optional[FeatureEngineer] = None,
+                 directory: Optional[str] = None):
+        self.directory = Path(tempfile.mkdtemp(prefix="churn-model-",
+                                               dir=directory or shared_directory()))
+        self.model_path = str(self.directory / "model.joblib")
+        self.engineer_path = (str(self.directory / "engineer.joblib")
+                              if engineer is not None else None)
+
+        try:
+            save_model(FlatForest.from_model(model), self.model_path)
+            if engineer is not None:
+                save_model(engineer, self.engineer_path)
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def paths(self) -> Tuple[str, Optional[str]]:
+        """(model_path, engineer_path) to hand to workers."""
+        return self.model_path, self.engineer_path
+
+    @staticmethod
+    def attach(model_path: str, engineer_path: Optional[str] = None,
+               ) -> Tuple[FlatForest, Optional[FeatureEngineer]]:
+        """Map a published model (and engineer) read-only, zero-copy."""
+        model = load_model(model_path, mmap_mode="r")
+        engineer = load_model(engineer_path, mmap_mode="r") if engineer_path else None
+        return model, engineer
+
+    def close(self) -> None:
+        """Remove the published files (mapped workers keep their pages)."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self) -> "SharedModel":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -10,15 +10,201 @@ ALTERNATIVE: Notebook training (not reproducible)
 
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.linear_model import LogisticRegression
+import copy
 import joblib
+import numpy as np
+import os
+import threading
+import uuid
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from churn_prediction.models.forest import FlatForest
+
+
+# Attribute load_model stamps on loaded artifacts (see model_version)
+VERSION_ATTR = "_churn_version"
+
+# First bytes of a Git LFS pointer checked out instead of the real file
+_LFS_POINTER = b"version https://git-lfs"
+
+
+# Threads all fits in this process share (set_thread_budget)
+_THREAD_BUDGET = int(os.environ.get("CHURN_THREADS", 0)) or os.cpu_count() or 1
+# Product of the caller counts of the active parallel_section blocks
+_THREAD_DIVISOR = 1
+_THREAD_LOCK = threading.Lock()
+
+# model_type -> builder(params, n_threads) returning an unfitted estimator
+MODEL_BACKENDS: Dict[str, Callable[[Dict[str, Any], int], Any]] = {}
+
+
+def set_thread_budget(n_threads: Optional[int] = None) -> int:
+    """
+    Set how many threads this process's model fits may use in total.
+
+    WHAT: One budget for sklearn (n_jobs), XGBoost (n_jobs) and BLAS
+        (threadpoolctl); None = $CHURN_THREADS or one per CPU
+    WHY: n_jobs=-1, XGBoost's own pool and BLAS's own pool each assume
+        they own the machine; run a few in parallel and they oversubscribe
+    WHEN: Sharing a node with other jobs, containers with a CPU quota
+    WHEN NOT: Per-call limits (pass n_jobs to train_model)
+    ALTERNATIVE: OMP_NUM_THREADS etc. (read once at import, not per call)
+
+    Returns:
+        The new budget
+    """
+    global _THREAD_BUDGET
+    with _THREAD_LOCK:
+        _THREAD_BUDGET = max(1, n_threads or int(os.environ.get("CHURN_THREADS", 0))
+                             or os.cpu_count() or 1)
+        return _THREAD_BUDGET
+
+
+def thread_budget() -> int:
+    """Threads one caller may use: the budget split across active parallel sections."""
+    return max(1, _THREAD_BUDGET // _THREAD_DIVISOR)
+
+
+@contextmanager
+def parallel_section(n_callers: int) -> Iterator[int]:
+    """
+    Split the thread budget between n_callers concurrent callers.
+
+    WHAT: Inside the block thread_budget() is budget // n_callers (at
+        least 1); nested sections multiply, so a pool inside a pool gets
+        a share of a share
+    WHY: Callers that fan out (search, batch scoring, thread pools of
+        trainings) declare it once and every fit below adapts
+    WHEN: Around any code running several train_model calls at once
+    WHEN NOT: Sequential loops (each fit may use the whole budget)
+    ALTERNATIVE: n_jobs=1 everywhere (idles cores when there are few callers)
+
+    Yields:
+        Threads per caller; pass it to process-pool initializers
+        (init_worker_threads), which do not inherit the section
+    """
+    global _THREAD_DIVISOR
+    n_callers = max(1, n_callers)
+    with _THREAD_LOCK:
+        _THREAD_DIVISOR *= n_callers
+    try:
+        yield thread_budget()
+    finally:
+        with _THREAD_LOCK:
+            _THREAD_DIVISOR //= n_callers
+
+
+def init_worker_threads(n_threads: int) -> None:
+    """
+    Make n_threads the whole budget of a pool worker process.
+
+    Forked workers inherit the parent's sections, so they are reset here;
+    BLAS/OpenMP pools are capped process-wide for scoring code that never
+    goes through train_model.
+    """
+    global _THREAD_BUDGET, _THREAD_DIVISOR
+    with _THREAD_LOCK:
+        _THREAD_BUDGET, _THREAD_DIVISOR = max(1, n_threads), 1
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    threadpool_limits(limits=_THREAD_BUDGET)
+
+
+def limit_threads(n_threads: int):
+    """Cap BLAS/OpenMP pools to n_threads inside a with block (needs threadpoolctl)."""
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return nullcontext()
+    # n_jobs=-1 style values mean "no cap"
+    return threadpool_limits(limits=n_threads if n_threads > 0 else None)
+
+
+def register_backend(model_type: str) -> Callable:
+    """
+    Decorator: make builder(params, n_threads) available as a train_model model_type.
+
+    WHAT: The builder reads its hyperparameters from train_model's
+        **model_params and must run with at most n_threads threads;
+        train_model caps BLAS/OpenMP around fit
+    WHY: New model families plug in without another train_model branch
+    WHEN: Adding LightGBM, CatBoost, a custom estimator
+    WHEN NOT: Overriding a built-in type by accident (names are replaced)
+    ALTERNATIVE: Fit the estimator yourself (no thread budget)
+    """
+    def decorator(builder: Callable[[Dict[str, Any], int], Any]) -> Callable:
+        MODEL_BACKENDS[model_type] = builder
+        return builder
+    return decorator
+
+
+@register_backend("random_forest")
+def _random_forest(params: Dict[str, Any], n_threads: int) -> Any:
+    # WHAT: Random Forest classifier
+    # WHY: Good baseline, handles non-linear patterns
+    # WHEN: First model to try
+    # WHEN NOT: Need probabilistic predictions (use LogisticRegression)
+    # ALTERNATIVE: XGBoost, LightGBM (better but more complex)
+    return RandomForestClassifier(
+        n_estimators=params.get("n_estimators", 100),
+        max_depth=params.get("max_depth", 10),
+        min_samples_split=params.get("min_samples_split", 2),
+        min_samples_leaf=params.get("min_samples_leaf", 1),
+        max_features=params.get("max_features", "sqrt"),
+        random_state=params.get("random_state", 42),
+        n_jobs=n_threads
+    )
+
+
+@register_backend("logistic_regression")
+def _logistic_regression(params: Dict[str, Any], n_threads: int) -> Any:
+    # WHAT: Logistic Regression
+    # WHY: Interpretable, fast, good for linear patterns
+    # WHEN: Need interpretability
+    # WHEN NOT: Complex non-linear patterns
+    # ALTERNATIVE: Random Forest (less interpretable)
+    # Threads come from BLAS, capped by train_model (limit_threads)
+    return LogisticRegression(
+        C=params.get("C", 1.0),
+        random_state=params.get("random_state", 42),
+        max_iter=1000
+    )
+
+
+@register_backend("xgboost")
+def _xgboost(params: Dict[str, Any], n_threads: int) -> Any:
+    # WHAT: Gradient boosted trees (scripts/experiment_xgboost.py)
+    # WHY: Usually beats Random Forest on tabular data
+    # WHEN: Tuning for the best ROC AUC
+    # WHEN NOT: xgboost not installed, or interpretability needed
+    # ALTERNATIVE: Random Forest (fewer knobs)
+    try:
+        import xgboost as xgb
+    except ImportError:
+        raise ImportError(
+            "model_type='xgboost' requires xgboost (uv add xgboost)"
+        ) from None
+    return xgb.XGBClassifier(
+        n_estimators=params.get("n_estimators", 100),
+        max_depth=params.get("max_depth", 5),
+        learning_rate=params.get("learning_rate", 0.1),
+        subsample=params.get("subsample", 1.0),
+        colsample_bytree=params.get("colsample_bytree", 1.0),
+        random_state=params.get("random_state", 42),
+        n_jobs=n_threads
+    )
 
 
 def train_model(
     X_train,
     y_train,
     model_type: str = "random_forest",
+    verbose: bool = True,
+    init_model: Any = None,
     **model_params
 ) -> Any:
     """
@@ -33,45 +219,129 @@ def train_model(
     Args:
         X_train: Training features
         y_train: Training labels
-        model_type: Type of model to train
-        **model_params: Model hyperparameters
+        model_type: "random_forest", "logistic_regression", "xgboost" or
+            any name added with register_backend
+        verbose: Print training progress
+        init_model: Previously trained model to update instead of fitting
+            from scratch (see update_model; n_estimators is then the
+            number of trees to add, max_trees caps the forest)
+        **model_params: Model hyperparameters (n_jobs defaults to
+            thread_budget(), the caller's share of the thread budget)
         
     Returns:
         Trained model
     """
-    if model_type == "random_forest":
-        # WHAT: Random Forest classifier
-        # WHY: Good baseline, handles non-linear patterns
-        # WHEN: First model to try
-        # WHEN NOT: Need probabilistic predictions (use LogisticRegression)
-        # ALTERNATIVE: XGBoost, LightGBM (better but more complex)
-        model = RandomForestClassifier(
-            n_estimators=model_params.get("n_estimators", 100),
-            max_depth=model_params.get("max_depth", 10),
-            random_state=model_params.get("random_state", 42),
-            n_jobs=-1  # Use all CPU cores
-        )
-    elif model_type == "logistic_regression":
-        # WHAT: Logistic Regression
-        # WHY: Interpretable, fast, good for linear patterns
-        # WHEN: Need interpretability
-        # WHEN NOT: Complex non-linear patterns
-        # ALTERNATIVE: Random Forest (less interpretable)
-        model = LogisticRegression(
-            random_state=model_params.get("random_state", 42),
-            max_iter=1000
+    if init_model is not None:
+        return update_model(
+            init_model,
+            X_train,
+            y_train,
+            n_new_trees=model_params.get("n_estimators", 20),
+            max_trees=model_params.get("max_trees"),
+            verbose=verbose,
         )
-    else:
+
+    backend = MODEL_BACKENDS.get(model_type)
+    if backend is None:
         raise ValueError(f"Unknown model type: {model_type}")
+    # Explicit n_jobs wins; otherwise this caller's share of the budget
+    n_threads = model_params.get("n_jobs", thread_budget())
+    model = backend(model_params, n_threads)
     
-    print(f"Training {model_type}...")
-    model.fit(X_train, y_train)
-    print("Training complete!")
+    if verbose:
+        print(f"Training {model_type}...")
+    with limit_threads(n_threads):
+        model.fit(X_train, y_train)
+    if verbose:
+        print("Training complete!")
     
     return model
 
 
-def save_model(model: Any, model_path: str) -> None:
+def update_model(
+    model: Any,
+    X_new,
+    y_new,
+    n_new_trees: int = 20,
+    max_trees: Optional[int] = None,
+    verbose: bool = True
+) -> Any:
+    """
+    Incrementally update a trained tree ensemble with new data.
+
+    WHAT: RandomForest: warm_start adds n_new_trees fitted on the new
+        window, optionally dropping the oldest trees beyond max_trees.
+        XGBoost: n_new_trees more boosting rounds from the existing booster
+    WHY: Daily refreshes only pay for the new trees, not a full refit on
+        all history
+    WHEN: Frequent retraining on a sliding window of recent data
+    WHEN NOT: Feature set or engineer changed (refit from scratch), or
+        the data drifted so far that the old trees are harmful
+    ALTERNATIVE: train_model on all history (slower, no drift memory)
+
+    Args:
+        model: Fitted RandomForestClassifier or XGBClassifier (not
+            modified; a copy is updated)
+        X_new: Features of the newest data window (same columns)
+        y_new: Labels of the newest data window
+        n_new_trees: Trees (RF) or boosting rounds (XGBoost) to add
+        max_trees: Keep at most this many trees, oldest dropped first
+            (RandomForest only: boosting rounds depend on earlier ones)
+        verbose: Print training progress
+
+    Returns:
+        Updated model
+    """
+    if hasattr(model, "estimators_") and hasattr(model, "warm_start"):
+        model = copy.deepcopy(model)
+        n_old = len(model.estimators_)
+        # Trees built so far (including dropped ones) → fresh seeds for new trees;
+        # warm_start alone would reuse the seeds of trees kept after trimming
+        built = getattr(model, "_n_trees_built", n_old)
+        base = model.random_state if isinstance(model.random_state, int) else 0
+        seed = np.random.SeedSequence([base, built]).generate_state(1)[0]
+        model.set_params(warm_start=True, n_estimators=n_old + n_new_trees,
+                         random_state=int(seed))
+
+        if verbose:
+            print(f"Adding {n_new_trees} trees to a {n_old}-tree forest...")
+        model.fit(X_new, y_new)
+        model._n_trees_built = built + n_new_trees
+
+        if max_trees is not None and len(model.estimators_) > max_trees:
+            dropped = len(model.estimators_) - max_trees
+            model.estimators_ = model.estimators_[dropped:]
+            model.set_params(n_estimators=max_trees)
+            if verbose:
+                print(f"Dropped the {dropped} oldest trees")
+        model.set_params(warm_start=False)
+
+    elif hasattr(model, "get_booster"):
+        if max_trees is not None:
+            raise ValueError("max_trees is only supported for random forests; "
+                             "boosting rounds depend on the earlier ones")
+        booster = model.get_booster()
+        model = copy.deepcopy(model).set_params(n_estimators=n_new_trees)
+        if verbose:
+            print(f"Boosting {n_new_trees} more rounds from "
+                  f"{booster.num_boosted_rounds()}...")
+        model.fit(X_new, y_new, xgb_model=booster)
+        model.set_params(n_estimators=model.get_booster().num_boosted_rounds())
+
+    else:
+        raise ValueError(
+            f"Incremental updates need a random forest or XGBoost model, "
+            f"got {type(model).__name__}"
+        )
+
+    if verbose:
+        print("Update complete!")
+
+    return model
+
+
+def save_model(model: Any, model_path: str, compress: int = 0,
+               flatten: bool = False) -> None:
     """
     Save trained model to disk.
     
@@ -84,15 +354,24 @@ def save_model(model: Any, model_path: str) -> None:
     Args:
         model: Trained scikit-learn model
         model_path: Path to save model
+        compress: joblib compression level 0-9. 0 (default) keeps arrays
+            raw so load_model(mmap_mode="r") can map them; higher levels
+            shrink the file but force a full decompress on every load
+        flatten: Save FlatForest.from_model(model) instead: scoring-only
+            artifact whose node arrays load memory-mapped and are shared
+            by every process that maps the file
     """
     path = Path(model_path)
     path.parent.mkdir(parents=True, exist_ok=True)
     
-    joblib.dump(model, path)
+    if flatten:
+        model = FlatForest.from_model(model)
+    joblib.dump(model, path, compress=compress)
     print(f"Model saved to {path}")
 
 
-def load_model(model_path: str) -> Any:
+def load_model(model_path: str, mmap_mode: Optional[str] = None,
+               use_registry: bool = False) -> Any:
     """
     Load trained model from disk.
     
@@ -104,27 +383,127 @@ def load_model(model_path: str) -> Any:
     
     Args:
         model_path: Path to saved model
+        mmap_mode: "r" maps large arrays of an uncompressed artifact
+            instead of reading them (sklearn trees still copy their nodes
+            on unpickle; flattened artifacts stay mapped)
+        use_registry: Return the copy already loaded in this process when
+            the file is unchanged (MODEL_REGISTRY); callers must not
+            mutate it
         
     Returns:
         Loaded model
     """
+    if use_registry:
+        return MODEL_REGISTRY.get(model_path, mmap_mode)
+
     path = Path(model_path)
     
     if not path.exists():
         raise FileNotFoundError(f"Model not found: {model_path}")
+    with open(path, "rb") as f:
+        if f.read(len(_LFS_POINTER)) == _LFS_POINTER:
+            raise ValueError(f"{model_path} is a Git LFS pointer, run `git lfs pull`")
     
-    model = joblib.load(path)
-    print(f"Model loaded from {path}")
+    model = joblib.load(path, mmap_mode=mmap_mode)
+    stat = path.stat()
+    _set_version(model, f"{path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}")
+    logger.info("Model loaded from %s%s", path,
+                f" (mmap_mode={mmap_mode})" if mmap_mode else "")
     
     return model
+
+
+class ModelRegistry:
+    """
+    In-process cache of loaded artifacts, keyed by file version.
+
+    WHAT: (resolved path, mtime_ns, size, mmap_mode) -> loaded object
+    WHY: Repeated load_model calls for an unchanged file should not pay
+        for deserialization or hold a second copy
+    WHEN: Services and workers that (re)load models by path
+    WHEN NOT: Callers that mutate the loaded model (use load_model)
+    ALTERNATIVE: Keep a module-level model variable by hand
+
+    A changed file (new mtime or size) is loaded again and replaces the
+    stale entry for that path. Thread-safe.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, Optional[str]], Tuple[Tuple[int, int], Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+
+    def get(self, model_path: str, mmap_mode: Optional[str] = None) -> Any:
+        """Loaded artifact for model_path, loading it if new or changed."""
+        path = Path(model_path)
+        if not path.exists():
+            raise FileNotFoundError(f"Model not found: {model_path}")
+        stat = path.stat()
+        key = (str(path.resolve()), mmap_mode)
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return entry[1]
+
+            model = load_model(model_path, mmap_mode=mmap_mode)
+            self._entries[key] = (version, model)
+            self.loads += 1
+            return model
+
+    def clear(self) -> None:
+        """Forget every loaded artifact."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide registry used by load_model(use_registry=True)
+MODEL_REGISTRY = ModelRegistry()
+
+
+def model_version(obj: Any) -> str:
+    """
+    Version ID of a model or feature engineer.
+
+    WHAT: load_model stamps "path:mtime_ns:size"; objects created in
+        process get a random ID on first use
+    WHY: Caches keyed on the version are invalidated by loading a new
+        artifact, without hashing the model itself
+    WHEN: Keying anything derived from a model's predictions
+    WHEN NOT: Models mutated in place after the first call (refit gives
+        the same object the same version)
+    ALTERNATIVE: Hash the pickled model (slow for large forests)
+    """
+    version = getattr(obj, VERSION_ATTR, None)
+    if version is None:
+        version = _set_version(obj, uuid.uuid4().hex)
+    return version
+
+
+def _set_version(obj: Any, version: str) -> str:
+    try:
+        setattr(obj, VERSION_ATTR, version)
+    except AttributeError:
+        # Objects that refuse attributes are only versioned by identity
+        version = f"{type(obj).__name__}@{id(obj):x}"
+    return version
 # WHAT: Add logging
 # WHY: Track training progress
 # WHEN: Production deployments
 # WHEN NOT: Quick experiments
 # ALTERNATIVE: Print statements (not production-ready)
 
+import json
 import logging
 
+from churn_prediction.instrumentation import RunProfile, active_profile
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -133,12 +512,16 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 def train_model_with_logging(X_train, y_train, model_type="random_forest", **model_params):
-    """Train model with comprehensive logging."""
+    """Train model with comprehensive logging (fit recorded as a "fit" stage)."""
     logger.info(f"Starting training with {model_type}")
     logger.info(f"Training data shape: {X_train.shape}")
     logger.info(f"Parameters: {model_params}")
     
-    model = train_model(X_train, y_train, model_type, **model_params)
+    # Record into the caller's RunProfile if there is one
+    profile = active_profile() or RunProfile("train_model")
+    with profile.stage("fit", rows=len(X_train)) as record:
+        model = train_model(X_train, y_train, model_type, **model_params)
     
     logger.info("Training completed successfully")
+    logger.info("Stage metrics: %s", json.dumps(record))
     return model
@@ -0,0 +1,32 @@
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from churn_prediction.features.engineering import FeatureEngineer
+from sklearn.ensemble import RandomForestClassifier
+
+
+@pytest.fixture
+def customers():
+    """200 raw customers (Age, MonthlyCharges); churn = MonthlyCharges > 70."""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({
+        "Age": rng.uniform(18, 70, 200),
+        "MonthlyCharges": rng.uniform(20, 120, 200),
+    })
+    y = (X["MonthlyCharges"] > 70).astype(int)
+    return X, y
+
+
+@pytest.fixture
+def fitted(customers):
+    """FeatureEngineer and a 5-tree forest fitted on customers, plus raw X."""
+    X, y = customers
+    engineer = FeatureEngineer()
+    model = RandomForestClassifier(n_estimators=5, random_state=42)
+    model.fit(engineer.fit_transform(X), y)
+    return engineer, model, X
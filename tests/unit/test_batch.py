@@ -0,0 +1,65 @@
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from churn_prediction.data.cache import load_columns
+from churn_prediction.models.batch import score_file
+from churn_prediction.models.train import save_model
+
+
+@pytest.fixture
+def saved(fitted, tmp_path):
+    """The shared fitted engineer and model, saved; raw X with a CustomerID."""
+    engineer, model, X = fitted
+    save_model(model, str(tmp_path / "model.joblib"))
+    save_model(engineer, str(tmp_path / "engineer.joblib"))
+    df = X.copy()
+    df.insert(0, "CustomerID", range(len(X)))
+    df.loc[7, "Age"] = np.nan
+    return engineer, model, df
+
+
+def _score(tmp_path, output, **kwargs):
+    return score_file(str(tmp_path / "model.joblib"), str(tmp_path / "engineer.joblib"),
+                      str(tmp_path / "input.csv"), str(tmp_path / output), **kwargs)
+
+
+@pytest.mark.parametrize("n_workers, shared_model", [(1, False), (2, False), (2, True)])
+def test_score_file_in_order_with_rejects(saved, tmp_path, n_workers, shared_model):
+    """Test chunked scoring keeps input order and flags invalid rows."""
+    engineer, model, df = saved
+    df.to_csv(tmp_path / "input.csv", index=False)
+
+    totals = _score(tmp_path, "scores.csv", chunksize=13, n_workers=n_workers,
+                    shared_model=shared_model)
+
+    scores = pd.read_csv(tmp_path / "scores.csv")
+    assert totals == {"rows": len(df), "rejected": 1}
+    assert scores["CustomerID"].tolist() == list(range(len(df)))
+    assert scores.loc[7, "prediction"] == -1
+
+    valid = df.drop(index=7).drop(columns=["CustomerID"])
+    expected = model.predict_proba(engineer.transform(valid))[:, 1]
+    np.testing.assert_allclose(scores["probability"].drop(index=7), expected, rtol=1e-6)
+
+
+def test_score_file_columnar_output_matches_csv(saved, tmp_path):
+    """Test the default columnar directory holds the same scores as the CSV."""
+    _, _, df = saved
+    df["CustomerID"] = [f"C{i:03d}" for i in df["CustomerID"]]
+    df.to_csv(tmp_path / "input.csv", index=False)
+
+    for output in ("scores", "scores.csv"):
+        _score(tmp_path, output, chunksize=7, n_workers=1)
+
+    columnar = load_columns(str(tmp_path / "scores"), mmap_mode=None)
+    assert sorted(p.name for p in (tmp_path / "scores").iterdir()) == [
+        "0.npy", "1.npy", "2.npy", "meta.json"]
+    assert columnar["prediction"].dtype == np.int8
+    assert columnar["probability"].dtype == np.float32
+    pd.testing.assert_frame_equal(columnar, pd.read_csv(tmp_path / "scores.csv"),
+                                  check_dtype=False)
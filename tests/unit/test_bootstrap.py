@@ -0,0 +1,58 @@
+import pytest
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from churn_prediction.evaluation import bootstrap
+from churn_prediction.evaluation.bootstrap import bootstrap_metrics
+from churn_prediction.evaluation.metrics import (
+    binary_metrics,
+    calculate_business_metrics,
+)
+
+
+@pytest.fixture
+def holdout():
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, 400)
+    proba = np.round(np.clip(rng.normal(0.4 + 0.2 * y, 0.2), 0, 1), 2)
+    return y, proba
+
+
+def test_replicates_match_direct_metrics(holdout):
+    """Test the weighted batch kernel against metrics of explicitly resampled rows."""
+    y, proba = holdout
+    order = np.argsort(-proba, kind="stable")
+    scores = proba[order]
+    bootstrap._init_worker(y[order] == 1, scores > 0.5,
+                           np.r_[0, np.flatnonzero(np.diff(scores)) + 1], 1000.0, 100.0)
+    try:
+        batch = bootstrap._replicate_batch(np.random.default_rng(7), 4)
+    finally:
+        bootstrap._WORKER_STATE.clear()
+
+    draws = np.random.default_rng(7).integers(0, len(y), size=(4, len(y)))
+    for b, rows in enumerate(draws):
+        y_b, p_b = y[order][rows], scores[rows]
+        expected = binary_metrics(y_b, p_b)
+        expected.update(calculate_business_metrics(y_b, (p_b > 0.5).astype(int), p_b))
+        for name in batch:
+            assert batch[name][b] == pytest.approx(expected[name]), name
+
+
+def test_intervals_deterministic_across_workers(holdout):
+    """Test the same seed gives the same replicates in-process and in a pool."""
+    y, proba = holdout
+    serial = bootstrap_metrics(y, proba, n_replicates=600, n_workers=1)
+    parallel = bootstrap_metrics(y, proba, n_replicates=600, n_workers=2)
+
+    assert len(serial.replicates) == 600
+    np.testing.assert_array_equal(
+        serial.replicates.to_numpy(), parallel.replicates.to_numpy()
+    )
+    low, high = serial.intervals["roc_auc"]
+    assert low < serial.estimates["roc_auc"] < high
+    assert serial.estimates["net_benefit"] == calculate_business_metrics(
+        y, (proba > 0.5).astype(int), proba)["net_benefit"]
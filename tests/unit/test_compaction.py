@@ -0,0 +1,74 @@
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from churn_prediction.models.compaction import _auc_rows, compact_forest
+from churn_prediction.models.forest import FlatForest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import roc_auc_score
+
+
+@pytest.fixture
+def forest_and_holdout():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(1500, 4)),
+                     columns=["Age", "Tenure", "MonthlyCharges", "TotalCharges"])
+    y = (X["Age"] + X["Tenure"] * X["MonthlyCharges"]
+         + rng.normal(0, 0.7, 1500) > 0).astype(int)
+    model = RandomForestClassifier(n_estimators=40, max_depth=10, random_state=42)
+    model.fit(X[:1000], y[:1000])
+    return model, X[1000:], y[1000:]
+
+
+@pytest.fixture
+def selection_and_validation(forest_and_holdout):
+    model, X_rest, y_rest = forest_and_holdout
+    return model, X_rest[:250], y_rest[:250], X_rest[250:], y_rest[250:]
+
+
+def test_auc_rows_matches_sklearn_with_ties():
+    """Test the vectorized AUC equals roc_auc_score per row."""
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, 200)
+    scores = rng.integers(0, 10, (3, 200)).astype(float)
+
+    np.testing.assert_allclose(_auc_rows(y, scores),
+                               [roc_auc_score(y, s) for s in scores])
+
+
+def test_subset_and_astype_preserve_tree_predictions(forest_and_holdout):
+    """Test subsets score like the kept trees and float32 leaves stay close."""
+    model, X_val, _ = forest_and_holdout
+    forest = FlatForest.from_model(model)
+
+    subset = forest.subset([3, 7, 11])
+    expected = np.mean([model.estimators_[i].predict_proba(X_val.to_numpy())[:, 1]
+                        for i in (3, 7, 11)], axis=0)
+    np.testing.assert_allclose(subset.predict_proba(X_val)[:, 1], expected)
+
+    compact = forest.astype(np.float32, np.float16)
+    assert compact.value.dtype == np.float16 and compact.value.ndim == 1
+    assert compact.feature.dtype == np.int16
+    np.testing.assert_allclose(compact.predict_proba(X_val),
+                               forest.predict_proba(X_val), atol=1e-3)
+
+
+def test_compact_forest_reports_on_unseen_rows(selection_and_validation):
+    """Test fewer trees, smaller artifact and a report computed on X_val only."""
+    model, X_select, y_select, X_val, y_val = selection_and_validation
+    result = compact_forest(model, X_select, y_select, X_val, y_val, tolerance=0.01)
+    report = result.report
+
+    assert result.model.n_trees == len(result.trees) < 40
+    assert report["serialized_bytes_after"] < report["serialized_bytes_before"]
+    assert len(report["selection_auc_path"]) == result.model.n_trees
+    assert report["metrics_after"]["roc_auc"] == pytest.approx(
+        roc_auc_score(y_val, result.model.predict_proba(X_val)[:, 1]))
+    assert report["metrics_before"]["roc_auc"] == pytest.approx(
+        roc_auc_score(y_val, model.predict_proba(X_val)[:, 1]))
+    before, after = report["metrics_before"], report["metrics_after"]
+    assert report["within_tolerance"] == (after["roc_auc"] >= before["roc_auc"] - 0.01)
@@ -0,0 +1,74 @@
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+from functools import partial
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from churn_prediction.evaluation import cross_validation
+from churn_prediction.evaluation.cross_validation import cross_validate
+from churn_prediction.features.engineering import FeatureEngineer
+
+
+@pytest.fixture
+def mixed_customers():
+    rng = np.random.default_rng(0)
+    n = 600
+    X = pd.DataFrame({
+        "Age": rng.integers(18, 70, n),
+        "Tenure": rng.normal(size=n),
+        "Plan": rng.choice(["basic", "plus", "pro"], n),
+    })
+    y = (X["Tenure"] + rng.normal(0, 0.5, n) > 0).astype(int)
+    return X, y
+
+
+def test_shared_columns_map_read_only_with_dtypes(mixed_customers, tmp_path):
+    """Test numeric blocks are mapped zero-copy and folds rebuild the original rows."""
+    X, y = mixed_customers
+    blocks = cross_validation._write_columns(X, tmp_path)
+    try:
+        cross_validation._init_worker(blocks, list(X.columns), y.to_numpy())
+        frames = cross_validation._WORKER_STATE["frames"]
+        assert all(not frame._mgr.blocks[0].values.flags.writeable
+                   for frame, block in zip(frames, blocks) if "path" in block)
+
+        rows = np.array([5, 0, 42])
+        pd.testing.assert_frame_equal(cross_validation._fold_frame(rows),
+                                      X.iloc[rows].reset_index(drop=True))
+    finally:
+        cross_validation._WORKER_STATE.clear()
+
+
+def test_engineer_refit_per_fold(mixed_customers):
+    """Test each fold's engineer only sees that fold's training rows."""
+    X, y = mixed_customers
+    engineers = []
+
+    def factory():
+        engineers.append(FeatureEngineer(categorical="codes"))
+        return engineers[-1]
+
+    result = cross_validate(X, y, n_splits=3, n_workers=1, engineer_factory=factory,
+                            n_estimators=10)
+    assert len(engineers) == 3
+    n_seen = [e.scaler.n_samples_seen_ for e in engineers]
+    assert n_seen == result.folds["train_rows"].tolist()
+    assert result.folds["test_rows"].sum() == len(X)
+
+
+def test_parallel_folds_match_in_process(mixed_customers):
+    """Test worker processes give the same fold metrics and summary as in-process."""
+    X, y = mixed_customers
+    codes = partial(FeatureEngineer, categorical="codes")
+    serial = cross_validate(X, y, n_splits=3, n_workers=1, engineer_factory=codes,
+                            n_estimators=10)
+    parallel = cross_validate(X, y, n_splits=3, n_workers=2, engineer_factory=codes,
+                              n_estimators=10)
+
+    np.testing.assert_allclose(parallel.folds["roc_auc"], serial.folds["roc_auc"])
+    summary, folds = serial.summary["roc_auc"], serial.folds["roc_auc"]
+    assert summary["mean"] == pytest.approx(folds.mean())
+    assert summary["std"] == pytest.approx(folds.std())
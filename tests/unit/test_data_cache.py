@@ -0,0 +1,62 @@
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from churn_prediction.data.cache import ColumnarCache
+from churn_prediction.data.loader import load_data
+
+
+@pytest.fixture
+def customers_csv(tmp_path):
+    path = tmp_path / "customers.csv"
+    pd.DataFrame({
+        "CustomerID": range(1, 101),
+        "MonthlyCharges": np.linspace(20, 120, 100),
+        "Region": ["north", "south", None, "east"] * 25,
+        "Churn": [0, 1] * 50,
+    }).to_csv(path, index=False)
+    return path
+
+
+def test_load_data_cache_hit_matches_parse(customers_csv, tmp_path, capsys):
+    """Test that a cached load returns the same frame, memory-mapped."""
+    cache_dir = tmp_path / "cache"
+
+    first = load_data(str(customers_csv), cache_dir=str(cache_dir))
+    second = load_data(str(customers_csv), cache_dir=str(cache_dir))
+
+    assert "from cache" in capsys.readouterr().out
+    assert first.equals(second)
+    assert isinstance(second["MonthlyCharges"].values, np.memmap)
+
+
+def test_cache_key_changes_with_content_and_options(customers_csv, tmp_path):
+    """Test that edits to the file or load options never hit a stale entry."""
+    cache = ColumnarCache(str(tmp_path / "cache"))
+
+    key = cache.key(str(customers_csv))
+    assert cache.key(str(customers_csv)) == key
+    assert cache.key(str(customers_csv), optimize_memory=True) != key
+
+    with open(customers_csv, "a") as f:
+        f.write("101,50.0,west,1\n")
+
+    assert cache.key(str(customers_csv)) != key
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Test that the cache stays within max_bytes by dropping old entries."""
+    df = pd.DataFrame({"a": np.zeros(1000)})
+    cache = ColumnarCache(str(tmp_path / "cache"), max_bytes=20_000)
+
+    assert cache.put("old", df)
+    assert cache.put("new", df)
+    assert cache.put("newest", df)
+
+    assert cache.size_bytes() <= 20_000
+    assert cache.get("old") is None
+    assert cache.get("newest") is not None
@@ -16,7 +16,14 @@ import sys
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
-from churn_prediction.data.loader import split_data
+from churn_prediction.data.loader import (
+    CUSTOMER_SCHEMA,
+    infer_schema,
+    load_data,
+    memory_report,
+    split_data,
+    stream_split,
+)
 
 
 def test_split_data():
@@ -72,4 +79,151 @@ def test_split_data_reproducibility():
     X_train2, _, _, _ = split_data(df, random_state=42)
     
     # Should be identical
-    pd.testing.assert_frame_equal(X_train1, X_train2)
\ No newline at end of file
+    pd.testing.assert_frame_equal(X_train1, X_train2)
+
+
+def test_split_data_ranom_state_alias_is_deprecated():
+    """Test the misspelled seed keyword still works, with a warning."""
+    df = pd.DataFrame({"feature1": range(100), "Churn": [0, 1] * 50})
+
+    with pytest.warns(DeprecationWarning, match="random_state"):
+        X_old, _, _, _ = split_data(df, ranom_state=7)
+    X_new, _, _, _ = split_data(df, random_state=7)
+
+    pd.testing.assert_frame_equal(X_old, X_new)
+
+
+def _write_customers(path, n=200):
+    """Write a small customers.csv with the production layout."""
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    pd.DataFrame({
+        "CustomerID": range(1, n + 1),
+        "Age": rng.integers(18, 70, n),
+        "Tenure": rng.integers(0, 120, n),
+        "MonthlyCharges": rng.uniform(20, 120, n),
+        "TotalCharges": rng.uniform(100, 8000, n),
+        "NumProducts": rng.integers(1, 5, n),
+        "Region": rng.choice(["north", "south", "east"], n),
+        "Churn": rng.integers(0, 2, n),
+    }).to_csv(path, index=False)
+
+
+def test_load_data_with_schema_downcasts(tmp_path, capsys):
+    """
+    Test typed loading with the declared customer schema.
+
+    WHAT: Verify narrow dtypes and the memory report
+    WHY: Typed loading is what lets full extracts fit in memory
+    WHEN: Every test run
+    WHEN NOT: N/A
+    ALTERNATIVE: None
+    """
+    path = tmp_path / "customers.csv"
+    _write_customers(path)
+
+    df = load_data(str(path), schema=CUSTOMER_SCHEMA)
+
+    assert df["Age"].dtype == "int8"
+    assert df["NumProducts"].dtype == "int8"
+    assert df["Churn"].dtype == "int8"
+    assert df["MonthlyCharges"].dtype == "float32"
+    assert df["Region"].dtype == "category"
+
+    report = memory_report(df)
+    assert report["optimized_bytes"] < report["default_bytes"]
+    assert "saved" in capsys.readouterr().out
+
+    # Same values as a default load
+    plain = load_data(str(path))
+    assert (df["Age"].to_numpy() == plain["Age"].to_numpy()).all()
+
+
+def test_load_data_schema_rejects_overflow(tmp_path):
+    """Test that declared integer dtypes are range-checked, not wrapped."""
+    path = tmp_path / "customers.csv"
+    pd.DataFrame({"Age": [30, 300], "Churn": [0, 1]}).to_csv(path, index=False)
+
+    with pytest.raises(ValueError, match="does not fit int8"):
+        load_data(str(path), schema={"Age": "int8"})
+
+
+def test_declared_schema_is_not_downcast(tmp_path):
+    """Test declared dtypes (including extension names) survive; others are narrowed."""
+    path = tmp_path / "customers.csv"
+    pd.DataFrame({
+        "CustomerID": [1, 2, 3],
+        "Spend": [1.5, 2.5, 3.5],
+        "Name": ["a", "b", "a"],
+        "Visits": [1, 2, 3],
+        "Churn": [0, 1, 0],
+    }).to_csv(path, index=False)
+
+    df = load_data(str(path), schema={"CustomerID": "int32", "Spend": "float64",
+                                      "Name": "string", "Churn": "int8"})
+
+    assert df["CustomerID"].dtype == "int32"
+    assert df["Spend"].dtype == "float64"
+    assert df["Name"].dtype == "string"
+    assert df["Visits"].dtype == "int8"  # not declared: downcast from the data
+
+
+def test_load_data_optimize_memory_infers_schema(tmp_path):
+    """Test that an inferred schema never truncates values outside the sample."""
+    path = tmp_path / "customers.csv"
+    pd.DataFrame({"Age": [30] * 10 + [300], "Churn": [0, 1] * 5 + [0]}).to_csv(
+        path, index=False
+    )
+
+    assert infer_schema(str(path), sample_rows=10)["Age"] == "int8"
+
+    df = load_data(str(path), optimize_memory=True, sample_rows=10)
+
+    assert df["Age"].max() == 300
+    assert df["Churn"].dtype == "int8"
+
+
+def test_stream_split_is_deterministic_across_chunk_sizes(tmp_path):
+    """
+    Test the out-of-core hashed split.
+
+    WHAT: Same split regardless of chunking, disjoint, near test_size
+    WHY: Reproducibility must not depend on memory settings
+    WHEN: Every test run
+    WHEN NOT: N/A
+    ALTERNATIVE: None
+    """
+    path = tmp_path / "customers.csv"
+    _write_customers(path, n=2000)
+
+    small = stream_split(str(path), str(tmp_path / "a_train.csv"),
+                         str(tmp_path / "a_test.csv"), chunksize=150)
+    large = stream_split(str(path), str(tmp_path / "b_train.csv"),
+                         str(tmp_path / "b_test.csv"), chunksize=5000)
+
+    assert small == large
+    assert small["train"] + small["test"] == 2000
+    # Stratified: every class split at test_size (to the row)
+    source = pd.read_csv(path)
+    test_rows = pd.read_csv(tmp_path / "a_test.csv")
+    for label, n in source["Churn"].value_counts().items():
+        assert (test_rows["Churn"] == label).sum() == round(0.2 * n)
+
+    train = pd.read_csv(tmp_path / "a_train.csv")
+    test = pd.read_csv(tmp_path / "a_test.csv")
+    assert set(train["CustomerID"]).isdisjoint(test["CustomerID"])
+    pd.testing.assert_frame_equal(test, pd.read_csv(tmp_path / "b_test.csv"))
+
+    # Reordered file: same assignment
+    source.iloc[::-1].to_csv(tmp_path / "reversed.csv", index=False)
+    stream_split(str(tmp_path / "reversed.csv"), str(tmp_path / "d_train.csv"),
+                 str(tmp_path / "d_test.csv"))
+    reversed_test = pd.read_csv(tmp_path / "d_test.csv")
+    assert set(reversed_test["CustomerID"]) == set(test["CustomerID"])
+
+    other_seed = stream_split(str(path), str(tmp_path / "c_train.csv"),
+                              str(tmp_path / "c_test.csv"), random_state=7)
+    reseeded_test = pd.read_csv(tmp_path / "c_test.csv")
+    assert set(reseeded_test["CustomerID"]) != set(test["CustomerID"])
+
@@ -31,4 +31,139 @@ def test_feature_engineer_must_fit_before_transform():
     engineer = FeatureEngineer()
     
     with pytest.raises(ValueError, match="Must call fit_transform"):
-        engineer.transform(df)
\ No newline at end of file
+        engineer.transform(df)
+
+def test_feature_engineer_fit_stream_matches_full_fit():
+    """Test that chunked fitting gives the same statistics as one fit."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "feature1": rng.normal(1e6, 1.0, 1000),
+        "feature2": rng.integers(0, 100, 1000),
+    })
+
+    full = FeatureEngineer()
+    full.fit_transform(df)
+
+    streamed = FeatureEngineer().fit_stream(
+        df.iloc[i:i + 137] for i in range(0, len(df), 137)
+    )
+
+    np.testing.assert_allclose(streamed.scaler.mean_, full.scaler.mean_)
+    np.testing.assert_allclose(streamed.scaler.scale_, full.scaler.scale_, rtol=1e-6)
+    pd.testing.assert_frame_equal(streamed.transform(df), full.transform(df))
+
+
+def test_feature_engineer_merge_shards():
+    """Test that engineers fitted on disjoint shards merge into a full fit."""
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({"feature1": rng.normal(5, 2, 900),
+                       "feature2": rng.normal(size=900)})
+
+    shards = [FeatureEngineer().fit_stream([df.iloc[i:i + 300]]) for i in (0, 300, 600)]
+    merged = shards[0].merge(shards[1]).merge(shards[2])
+
+    full = FeatureEngineer()
+    full.fit_transform(df)
+
+    np.testing.assert_allclose(merged.scaler.mean_, full.scaler.mean_)
+    np.testing.assert_allclose(merged.scaler.var_, full.scaler.var_)
+    assert merged.scaler.n_samples_seen_ == 900
+
+
+def test_feature_engineer_transform_array_matches_transform():
+    """Test the copy-free float32 path against the pandas path."""
+    df = pd.DataFrame({
+        "feature1": [1.0, 2.0, 3.0, 4.0],
+        "feature2": [10, 20, 30, 45],
+        "label": ["a", "b", "a", "b"],
+    })
+    engineer = FeatureEngineer(categorical="codes")
+    engineer.fit_transform(df)
+
+    expected = engineer.transform(df)[engineer.feature_cols].to_numpy(dtype=np.float64)
+    result = engineer.transform_array(df)
+
+    assert result.dtype == np.float32
+    assert result.flags.c_contiguous
+    np.testing.assert_allclose(result, expected, rtol=1e-6, atol=1e-6)
+
+    # In place on a matching array, and into a reused buffer
+    raw = np.column_stack([df["feature1"], df["feature2"], [1, 2, 1, 2]])
+    raw = raw.astype(np.float64)
+    same = engineer.transform_array(raw, dtype=np.float64, inplace=True)
+    assert same is raw
+    np.testing.assert_allclose(raw, expected)
+
+    buffer = np.empty((4, 3), dtype=np.float32)
+    assert engineer.transform_array(df, out=buffer) is buffer
+
+
+def test_feature_engineer_transform_array_large_mean():
+    """Test float32 output stays accurate when |mean / std| is large."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"timestamp": 1.7e9 + rng.normal(0, 10, 1000)})
+    engineer = FeatureEngineer()
+    engineer.fit_transform(df)
+
+    expected = engineer.transform(df)[engineer.feature_cols].to_numpy()
+    np.testing.assert_allclose(engineer.transform_array(df), expected, atol=1e-5)
+    np.testing.assert_allclose(engineer.transform_array(df.to_numpy()), expected,
+                               atol=1e-5)
+
+
+def test_feature_engineer_passes_categoricals_through_by_default():
+    """Test object columns are left unchanged unless an encoding is chosen."""
+    df = pd.DataFrame({"charges": [10.0, 20.0, 30.0], "contract": ["a", "b", "a"]})
+    transformed = FeatureEngineer().fit_transform(df)
+
+    assert transformed["contract"].tolist() == ["a", "b", "a"]
+
+
+def test_feature_engineer_categorical_codes():
+    """Test vocabulary encoding with frequency cap and unseen values."""
+    df = pd.DataFrame({
+        "charges": [10.0, 20.0, 30.0, 40.0, 50.0, 60.0],
+        "contract": ["monthly", "monthly", "monthly", "annual", "annual", "two_year"],
+    })
+    engineer = FeatureEngineer(categorical="codes", max_categories=2)
+    transformed = engineer.fit_transform(df)
+
+    assert list(engineer.vocabularies["contract"]) == ["monthly", "annual"]
+    assert transformed["contract"].tolist() == [1, 1, 1, 2, 2, 0]
+    assert transformed["contract"].dtype == np.int8
+
+    new = pd.DataFrame({"charges": [1.0, 2.0], "contract": ["annual", "lifetime"]})
+    assert engineer.transform(new)["contract"].tolist() == [2, 0]
+    assert engineer.encode_value("contract", "monthly") == 1
+
+    onehot = engineer.encode_sparse(df)
+    assert onehot.shape == (6, 3)
+    assert onehot.nnz == 6
+
+
+def test_feature_engineer_categorical_hash_and_persistence():
+    """Test the hashing trick is stable and the engineer survives pickling."""
+    import pickle
+
+    df = pd.DataFrame({"region": pd.Categorical(["n", "s", None, "n"]),
+                       "x": [1.0, 2, 3, 4]})
+    engineer = FeatureEngineer(categorical="hash", hash_buckets=8)
+    codes = engineer.fit_transform(df)["region"]
+
+    assert codes[0] == codes[3] and codes[2] == 0
+    assert codes.between(0, 8).all()
+
+    restored = pickle.loads(pickle.dumps(engineer))
+    pd.testing.assert_frame_equal(restored.transform(df), engineer.transform(df))
+
+
+def test_feature_engineer_partial_fit_accumulates_vocabulary():
+    """Test category counts accumulate across chunks and merge across shards."""
+    a = FeatureEngineer(categorical="codes").fit_stream(
+        [pd.DataFrame({"c": ["x", "y"], "v": [1.0, 2.0]})])
+    b = FeatureEngineer(categorical="codes").fit_stream(
+        [pd.DataFrame({"c": ["y", "z", "y"], "v": [3.0, 4, 5]})])
+    a.merge(b)
+
+    assert list(a.vocabularies["c"]) == ["y", "x", "z"]
+
@@ -0,0 +1,80 @@
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from churn_prediction.models.forest import FlatForest, _float32_floor
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(500, 4)),
+                     columns=["Age", "Tenure", "MonthlyCharges", "TotalCharges"])
+    y = (X["Age"] + X["Tenure"] * X["MonthlyCharges"]
+         + rng.normal(0, 0.5, 500) > 0).astype(int)
+    X_new = pd.DataFrame(rng.normal(size=(300, 4)), columns=X.columns)
+    return X, y, X_new
+
+
+def test_float32_floor_preserves_comparisons():
+    """Test float32 x <= floor32(t) exactly when x <= t in float64."""
+    thresholds = np.array([0.1, -0.3, 1e-8, 2.5, 70.00000001])
+    floored = _float32_floor(thresholds)
+    x = np.concatenate([floored, np.nextafter(floored, np.float32(np.inf))])
+
+    for t64, t32 in zip(thresholds, floored):
+        np.testing.assert_array_equal(x.astype(np.float64) <= t64, x <= t32)
+
+
+def test_flat_random_forest_matches_predict_proba(data):
+    """Test flattened RandomForest gives the same probabilities and labels."""
+    X, y, X_new = data
+    model = RandomForestClassifier(n_estimators=20, max_depth=8, random_state=42)
+    model.fit(X, y)
+    forest = FlatForest.from_model(model)
+
+    np.testing.assert_array_equal(forest.predict_proba(X_new),
+                                  model.predict_proba(X_new))
+    np.testing.assert_array_equal(forest.predict(X_new), model.predict(X_new))
+    assert forest.n_trees == 20
+    assert forest.threshold.dtype == np.float32
+
+
+def test_flat_forest_reorders_dataframe_columns(data):
+    """Test DataFrame columns are aligned to the training order."""
+    X, y, X_new = data
+    model = RandomForestClassifier(n_estimators=5, random_state=42).fit(X, y)
+    forest = FlatForest.from_model(model)
+
+    np.testing.assert_array_equal(
+        forest.predict_proba(X_new[X_new.columns[::-1]]),
+        model.predict_proba(X_new),
+    )
+
+
+def test_flat_xgboost_matches_predict_proba(data):
+    """Test flattened XGBoost agrees to float32 precision, NaNs included."""
+    xgb = pytest.importorskip("xgboost")
+    X, y, X_new = data
+    X_new = X_new.copy()
+    X_new.iloc[::7, 1] = np.nan
+    model = xgb.XGBClassifier(n_estimators=30, max_depth=4, learning_rate=0.1,
+                              random_state=42).fit(X, y)
+    forest = FlatForest.from_model(model)
+
+    np.testing.assert_allclose(forest.predict_proba(X_new), model.predict_proba(X_new),
+                               atol=1e-6)
+    np.testing.assert_array_equal(forest.predict(X_new), model.predict(X_new))
+
+
+def test_flat_forest_rejects_other_models(data):
+    """Test non-tree models are refused."""
+    X, y, _ = data
+    with pytest.raises(TypeError, match="LogisticRegression"):
+        FlatForest.from_model(LogisticRegression().fit(X, y))
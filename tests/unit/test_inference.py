@@ -0,0 +1,66 @@
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from churn_prediction.features.engineering import FeatureEngineer
+from churn_prediction.models.inference import compile_scorer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+
+@pytest.mark.parametrize("model", [
+    LogisticRegression(),
+    RandomForestClassifier(n_estimators=10, random_state=42),
+])
+def test_compiled_scorer_matches_predict_proba(fitted, customers, model):
+    """Test that single-row scores equal the DataFrame pipeline."""
+    engineer, _, X = fitted
+    _, y = customers
+    model.fit(engineer.transform(X), y)
+    scorer = compile_scorer(engineer, model)
+
+    expected = model.predict_proba(engineer.transform(X.iloc[:5]))[:, 1]
+    from_dicts = [scorer.score(row) for row in X.iloc[:5].to_dict("records")]
+    from_tuples = [scorer.score(tuple(row))
+                   for row in X.iloc[:5].itertuples(index=False)]
+
+    np.testing.assert_allclose(from_dicts, expected)
+    np.testing.assert_allclose(from_tuples, expected)
+    assert scorer.latency_stats()["count"] == 10
+
+
+def test_compiled_scorer_validates_input(fitted):
+    """Test missing, NaN and Inf features are rejected."""
+    engineer, model, _ = fitted
+    scorer = compile_scorer(engineer, model)
+
+    with pytest.raises(ValueError, match="Missing feature"):
+        scorer.score({"Age": 30})
+    with pytest.raises(ValueError, match="NaN values"):
+        scorer.score({"Age": 30, "MonthlyCharges": np.nan})
+    with pytest.raises(ValueError, match="Inf values"):
+        scorer.score((30, np.inf))
+
+
+def test_compiled_scorer_encodes_categoricals():
+    """Test raw categorical values are encoded like transform() does."""
+    X = pd.DataFrame({
+        "MonthlyCharges": [20.0, 80.0, 30.0, 90.0] * 10,
+        "Contract": ["annual", "monthly", "annual", "monthly"] * 10,
+    })
+    y = [0, 1, 0, 1] * 10
+    engineer = FeatureEngineer(categorical="codes")
+    model = RandomForestClassifier(n_estimators=5, random_state=0)
+    model.fit(engineer.fit_transform(X), y)
+    scorer = compile_scorer(engineer, model)
+
+    expected = model.predict_proba(engineer.transform(X.iloc[:2]))[:, 1]
+    scores = [scorer.score(r) for r in X.iloc[:2].to_dict("records")]
+
+    np.testing.assert_allclose(scores, expected)
+    assert scorer.score((80.0, "never-seen")) >= 0.0
+
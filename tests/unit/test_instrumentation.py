@@ -0,0 +1,79 @@
+import json
+import logging
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from churn_prediction.instrumentation import RunProfile, active_profile, instrument
+from churn_prediction.models.train import train_model_with_logging
+
+
+def test_stage_records_time_memory_and_rows(tmp_path):
+    """Test a stage records wall/CPU time, RSS and throughput to JSON."""
+    profile = RunProfile("test", model_type="random_forest")
+    with profile.stage("allocate", rows=1000):
+        block = np.ones(4 * 2**20)  # 32 MB touched
+        block.sum()
+
+    with profile.stage("load") as record:
+        record["rows"] = 10
+
+    first = profile.stages[0]
+    assert first["stage"] == "allocate"
+    assert first["wall_seconds"] > 0
+    assert first["cpu_seconds"] >= 0
+    assert first["peak_rss_mb"] > 0
+    assert first["rows_per_second"] > 0
+    assert profile.stages[1]["rows"] == 10
+
+    saved = json.loads(profile.to_json(str(tmp_path / "run.json")))
+    assert saved["model_type"] == "random_forest"
+    assert [s["stage"] for s in saved["stages"]] == ["allocate", "load"]
+    assert json.loads((tmp_path / "run.json").read_text()) == saved
+
+
+def test_instrument_records_only_inside_active_profile():
+    """Test the decorator is a no-op outside a profile."""
+    @instrument("score", rows_arg=0)
+    def score(rows):
+        return len(rows)
+
+    assert score([1, 2, 3]) == 3
+    with RunProfile() as profile:
+        assert active_profile() is profile
+        score([1, 2, 3])
+
+    assert active_profile() is None
+    assert [(s["stage"], s["rows"]) for s in profile.stages] == [("score", 3)]
+
+
+def test_train_model_with_logging_records_fit_stage(caplog):
+    """Test training with logging adds a fit stage to the active profile."""
+    X = pd.DataFrame({"a": [1, 2, 3, 4], "b": [4, 3, 2, 1]})
+    with RunProfile() as profile, caplog.at_level(logging.INFO):
+        train_model_with_logging(X, [0, 1, 0, 1], n_estimators=3)
+
+    assert profile.stages[0]["stage"] == "fit"
+    assert profile.stages[0]["rows"] == 4
+    assert "Stage metrics" in caplog.text
+
+
+def test_profile_without_getrusage(monkeypatch, capsys):
+    """Test stages still record where resource/psutil are unavailable (Windows)."""
+    from churn_prediction import instrumentation
+    monkeypatch.setattr(instrumentation, "resource", None)
+    monkeypatch.setitem(sys.modules, "psutil", None)
+
+    profile = RunProfile("test")
+    with profile.stage("fit", rows=100):
+        sum(range(10_000))
+
+    record = profile.stages[0]
+    assert record["peak_rss_mb"] is None and record["peak_rss_increase_mb"] is None
+    assert record["cpu_seconds"] >= 0
+    assert profile.to_dict()["peak_rss_mb"] is None
+    profile.print_summary()
+    assert "fit" in capsys.readouterr().out
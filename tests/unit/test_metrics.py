@@ -0,0 +1,117 @@
+import pytest
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from churn_prediction.evaluation.metrics import (
+    MetricsAccumulator,
+    binary_metrics,
+    calculate_business_metrics,
+    evaluate_model,
+    optimal_threshold,
+    roc_auc,
+    threshold_sweep,
+)
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import (
+    accuracy_score,
+    confusion_matrix,
+    f1_score,
+    precision_score,
+    recall_score,
+    roc_auc_score,
+)
+
+
+@pytest.fixture
+def scores():
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, 2000)
+    # Two decimals: many tied scores
+    proba = np.round(np.clip(rng.normal(0.4 + 0.2 * y, 0.2), 0, 1), 2)
+    return y, proba
+
+
+def test_binary_metrics_match_sklearn(scores):
+    """Test the single-pass kernel against the sklearn metric functions."""
+    y, proba = scores
+    y_pred = (proba > 0.5).astype(int)
+    metrics = binary_metrics(y, proba)
+
+    assert metrics["accuracy"] == pytest.approx(accuracy_score(y, y_pred))
+    assert metrics["precision"] == pytest.approx(precision_score(y, y_pred))
+    assert metrics["recall"] == pytest.approx(recall_score(y, y_pred))
+    assert metrics["f1"] == pytest.approx(f1_score(y, y_pred))
+    assert metrics["roc_auc"] == pytest.approx(roc_auc_score(y, proba), abs=1e-12)
+    assert metrics["confusion_matrix"] == confusion_matrix(y, y_pred).tolist()
+
+    with pytest.raises(ValueError, match="single class"):
+        roc_auc(np.ones(5), proba[:5])
+
+
+def test_evaluate_model_labels_match_predict():
+    """Test thresholded probabilities reproduce model.predict, with one inference."""
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(500, 4))
+    y = (X[:, 0] + rng.normal(0, 1, 500) > 0).astype(int)
+    model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+
+    metrics = evaluate_model(model, X, y)
+    assert metrics["confusion_matrix"] == confusion_matrix(y, model.predict(X)).tolist()
+
+
+def test_accumulator_merges_chunks(scores):
+    """Test chunked accumulators merge to the in-memory metrics."""
+    y, proba = scores
+    parts = [MetricsAccumulator().update(y[i:i + 300], proba[i:i + 300])
+             for i in range(0, len(y), 300)]
+    total = parts[0]
+    for part in parts[1:]:
+        total.merge(part)
+
+    merged, exact = total.compute(), binary_metrics(y, proba)
+    assert merged["confusion_matrix"] == exact["confusion_matrix"]
+    assert merged["f1"] == pytest.approx(exact["f1"])
+    # Scores on a 0.01 grid fall in distinct bins: AUC exact too
+    assert merged["roc_auc"] == pytest.approx(exact["roc_auc"], abs=1e-12)
+
+    with pytest.raises(ValueError, match="same threshold"):
+        total.merge(MetricsAccumulator(threshold=0.3))
+
+
+def test_threshold_sweep_matches_business_metrics(scores):
+    """Test every sweep row equals calculate_business_metrics at that threshold."""
+    y, proba = scores
+    y, proba = y[:300], proba[:300]
+    sweep = threshold_sweep(y, proba, revenue_per_customer=500, retention_cost=80)
+
+    assert len(sweep) == len(np.unique(proba)) + 1
+    for row in sweep.iloc[::7].to_dict("records"):
+        y_pred = (proba > row["threshold"]).astype(int)
+        expected = calculate_business_metrics(
+            y, y_pred, proba, revenue_per_customer=500, retention_cost=80
+        )
+        for name, value in expected.items():
+            assert row[name] == pytest.approx(value), name
+
+
+def test_optimal_threshold_maximizes_objective(scores):
+    """Test the optimum beats every threshold, and costs change it."""
+    y, proba = scores
+    best = optimal_threshold(y, proba)
+    brute = max(calculate_business_metrics(y, proba > t, proba)["net_benefit"]
+                for t in np.r_[np.unique(proba), -np.inf])
+    assert best["net_benefit"] == pytest.approx(brute)
+
+    # Same customers targeted when the threshold goes back into evaluate_model's rule
+    confusion = binary_metrics(y, proba, best["threshold"])["confusion_matrix"]
+    tn, fp, fn, tp = np.ravel(confusion)
+    assert (tp, fp, fn) == (best["tp"], best["fp"], best["fn"])
+
+    # Offers that cost more than a customer is worth: target nobody
+    nobody = optimal_threshold(y, proba, retention_cost=2000)
+    assert nobody["threshold"] == proba.max() and nobody["targeted"] == 0
+    with pytest.raises(ValueError, match="Unknown objective"):
+        optimal_threshold(y, proba, objective="threshold")
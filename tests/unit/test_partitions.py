@@ -0,0 +1,58 @@
+import pytest
+import pandas as pd
+from datetime import date
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from churn_prediction.data.partitions import (
+    iter_partitions,
+    list_partitions,
+    load_partitions,
+    partition_date,
+)
+
+
+@pytest.fixture
+def partition_dir(tmp_path):
+    """Three daily partitions with different region vocabularies."""
+    regions = {"2024-01-01": "north", "2024-01-02": "south", "2024-01-03": "east"}
+    for i, (day, region) in enumerate(regions.items()):
+        pd.DataFrame({
+            "CustomerID": range(i * 10, i * 10 + 10),
+            "Region": [region, "west"] * 5,
+            "Churn": [0, 1] * 5,
+        }).to_csv(tmp_path / f"customers_{day.replace('-', '')}.csv", index=False)
+    return tmp_path
+
+
+def test_partition_date_parsing():
+    """Test date extraction from file names and hive-style directories."""
+    assert partition_date("raw/customers_20240115.csv") == date(2024, 1, 15)
+    assert partition_date("raw/date=2024-01-15/part-0.csv") == date(2024, 1, 15)
+    assert partition_date("raw/customers.csv") is None
+
+
+def test_list_partitions_prunes_by_date(partition_dir):
+    """Test that only partitions inside the date range are kept."""
+    paths = list_partitions(partition_dir, start_date=date(2024, 1, 2))
+
+    assert [partition_date(p) for p in paths] == [date(2024, 1, 2), date(2024, 1, 3)]
+
+
+def test_load_partitions_parallel(partition_dir):
+    """Test concurrent loading keeps date order and categorical dtypes."""
+    df = load_partitions(partition_dir, max_workers=2, optimize_memory=True)
+
+    assert len(df) == 30
+    assert df["CustomerID"].tolist() == list(range(30))
+    assert df["Region"].dtype == "category"
+    assert set(df["Region"].cat.categories) == {"north", "south", "east", "west"}
+
+
+def test_iter_partitions_yields_one_at_a_time(partition_dir):
+    """Test the generator form for out-of-core consumers."""
+    sizes = [len(df) for df in iter_partitions(str(partition_dir / "*.csv"))]
+
+    assert sizes == [10, 10, 10]
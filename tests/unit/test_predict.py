@@ -6,7 +6,11 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
-from churn_prediction.models.predict import predict_safe
+from churn_prediction.models.predict import (
+    predict_quarantine,
+    predict_safe,
+    validate_batch,
+)
 from sklearn.ensemble import RandomForestClassifier
 
 def test_predict_safe_raises_on_nan():
@@ -54,4 +58,45 @@ def test_predict_safe_works_on_valid_input():
     predictions = predict_safe(model, X_test)
     
     assert len(predictions) == 2
-    assert predictions.dtype in [np.int64, np.int32]
\ No newline at end of file
+    assert predictions.dtype in [np.int64, np.int32]
+
+
+def test_predict_safe_enforces_ranges_and_schema():
+    """Test range bounds and missing-column checks."""
+    model = RandomForestClassifier(n_estimators=10, random_state=42)
+    model.fit(pd.DataFrame({'a': [1, 2, 3], 'b': [4, 5, 6]}), [0, 1, 0])
+
+    with pytest.raises(ValueError, match=r"out-of-range values in columns: \['a'\]"):
+        predict_safe(model, pd.DataFrame({'a': [1, 500], 'b': [4, 5]}),
+                     ranges={'a': (0, 100)})
+
+    with pytest.raises(ValueError, match="missing columns"):
+        predict_safe(model, pd.DataFrame({'a': [1, 2]}))
+
+
+def test_predict_quarantine_scores_valid_rows():
+    """Test that bad rows are set aside with reasons instead of aborting."""
+    model = RandomForestClassifier(n_estimators=10, random_state=42)
+    model.fit(pd.DataFrame({'a': [1, 2, 3], 'b': [4, 5, 6]}), [0, 1, 0])
+
+    X = pd.DataFrame(
+        {'a': [1, np.nan, 2, 3, -1], 'b': [4, 5, np.inf, 6, 5]},
+        index=[10, 11, 12, 13, 14],
+    )
+    result = predict_quarantine(model, X, ranges={'a': (0, 10)})
+
+    assert list(result.valid_index) == [10, 13]
+    assert len(result.predictions) == 2
+    assert list(result.rejected_index) == [11, 12, 14]
+    assert result.reasons[11] == "NaN: a"
+    assert result.reasons[12] == "Inf: b"
+    assert result.reasons[14] == "out of range: a"
+
+
+def test_validate_batch_all_valid():
+    """Test a clean batch passes with no reasons."""
+    result = validate_batch(pd.DataFrame({'a': [1.0, 2.0], 'b': [1, 2]}))
+
+    assert result.valid_mask.all()
+    assert result.reasons.empty
+
@@ -0,0 +1,116 @@
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from churn_prediction.features.engineering import FeatureEngineer
+from churn_prediction.models.prediction_cache import PredictionCache
+from churn_prediction.models.train import load_model, model_version, save_model
+from sklearn.ensemble import RandomForestClassifier
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_serves_hits_without_the_model(fitted):
+    """Test repeated rows are hits and predictions match predict_safe."""
+    engineer, model, X = fitted
+    cache = PredictionCache(model, engineer)
+    expected = model.predict(engineer.transform(X))
+
+    np.testing.assert_array_equal(cache.predict(X.iloc[:60]), expected[:60])
+    np.testing.assert_array_equal(cache.predict(X), expected)
+
+    stats = cache.stats()
+    assert stats["hits"] == 60
+    assert stats["misses"] == len(X)
+    assert stats["size"] == len(X)
+
+
+def test_cache_ignores_columns_the_engineer_does_not_use(fitted):
+    """Test rows are keyed on the engineer's columns only."""
+    engineer, model, X = fitted
+    cache = PredictionCache(model, engineer)
+    cache.predict(X.iloc[:10])
+
+    with_ids = X.iloc[:10].assign(CustomerID=np.arange(10))
+    np.testing.assert_array_equal(cache.predict(with_ids), cache.predict(X.iloc[:10]))
+
+    assert cache.hits == 20
+
+
+def test_cache_keys_on_identifier_the_model_was_fitted_on(customers):
+    """Test an ID column among the engineer's features splits the cache."""
+    X, y = customers
+    X = X.assign(CustomerID=np.arange(len(X)))
+    engineer = FeatureEngineer()
+    model = RandomForestClassifier(n_estimators=5, random_state=42).fit(
+        engineer.fit_transform(X), y)
+    cache = PredictionCache(model, engineer)
+
+    same_features = pd.concat([X.iloc[[0]]] * 3).assign(CustomerID=[0, 1, 2])
+    cache.predict(same_features)
+
+    assert "CustomerID" in engineer.feature_cols
+    assert cache.misses == 3 and len(cache) == 3
+
+
+def test_cache_evicts_least_recently_used_and_expires(fitted):
+    """Test maxsize eviction order and TTL expiry."""
+    engineer, model, X = fitted
+    clock = FakeClock()
+    cache = PredictionCache(model, engineer, maxsize=3, ttl=10, clock=clock)
+
+    cache.predict(X.iloc[[0, 1, 2]])
+    cache.predict(X.iloc[[0]])        # 0 becomes most recent
+    cache.predict(X.iloc[[3]])        # evicts 1
+    cache.predict(X.iloc[[0, 2]])
+    assert cache.evictions == 1
+    assert cache.hits == 3
+
+    clock.now = 11
+    cache.predict(X.iloc[[0]])
+    assert cache.expirations == 1
+    assert cache.misses == 5
+
+
+def test_cache_invalidates_when_new_model_is_loaded(fitted, tmp_path):
+    """Test swapping in a freshly loaded model empties the cache."""
+    engineer, model, X = fitted
+    path = tmp_path / "model.joblib"
+    save_model(model, str(path))
+
+    cache = PredictionCache(load_model(str(path)), engineer)
+    cache.predict(X)
+    cache.model = load_model(str(path))  # same file, same version
+    cache.predict(X)
+    assert cache.invalidations == 0 and cache.hits == len(X)
+
+    save_model(RandomForestClassifier(n_estimators=3, random_state=0).fit(
+        engineer.transform(X), (X["Age"] > 40).astype(int)), str(path))
+    cache.model = load_model(str(path))
+    cache.predict(X)
+
+    assert cache.invalidations == 1
+    assert cache.hits == len(X)
+    assert model_version(cache.model).startswith(str(path.resolve()))
+
+
+def test_cache_does_not_store_rejected_batches(fitted):
+    """Test predict_safe validation errors propagate and cache nothing."""
+    engineer, model, X = fitted
+    cache = PredictionCache(model, engineer)
+    bad = X.iloc[:3].copy()
+    bad.loc[bad.index[1], "Age"] = np.nan
+
+    with pytest.raises(ValueError, match="NaN values"):
+        cache.predict(bad)
+    assert len(cache) == 0
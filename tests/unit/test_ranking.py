@@ -0,0 +1,80 @@
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from churn_prediction.features.engineering import FeatureEngineer
+from churn_prediction.models.ranking import TopN, top_n_risk
+from sklearn.ensemble import RandomForestClassifier
+
+
+@pytest.fixture
+def scored_customers():
+    rng = np.random.default_rng(0)
+    n = 1000
+    df = pd.DataFrame({
+        "CustomerID": np.arange(n),
+        "Region": rng.choice(["north", "south", "west"], n),
+        "Age": rng.uniform(18, 70, n),
+        "MonthlyCharges": rng.uniform(20, 120, n),
+    })
+    features = df[["Age", "MonthlyCharges"]]
+    engineer = FeatureEngineer()
+    y = (df["MonthlyCharges"] + rng.normal(0, 20, n) > 70).astype(int)
+    model = RandomForestClassifier(n_estimators=10, random_state=42)
+    model.fit(engineer.fit_transform(features), y)
+    proba = model.predict_proba(engineer.transform(features))[:, 1]
+    return df, engineer, model, proba
+
+
+def test_top_n_matches_full_sort_with_ties():
+    """Test streamed top N equals a stable sort of everything."""
+    rng = np.random.default_rng(1)
+    scores = rng.integers(0, 20, 500) / 20.0  # many ties
+    top = TopN(37)
+    for start in range(0, 500, 64):
+        top.update(scores[start:start + 64], id=np.arange(start, min(start + 64, 500)))
+
+    expected = np.argsort(-scores, kind="stable")[:37]
+    result = top.result()
+    np.testing.assert_array_equal(result["id"], expected)
+    np.testing.assert_array_equal(result["probability"], scores[expected])
+    assert list(result["rank"]) == list(range(1, 38))
+
+
+def test_top_n_risk_overall_segments_and_threshold(scored_customers):
+    """Test one pass gives overall, per-segment and threshold results."""
+    df, engineer, model, proba = scored_customers
+    result = top_n_risk(model, df, n=25, engineer=engineer, segment_col="Region",
+                        segment_n=5, threshold=0.8, chunksize=128)
+
+    expected = np.argsort(-proba, kind="stable")[:25]
+    np.testing.assert_array_equal(result.top["CustomerID"], expected)
+    np.testing.assert_allclose(result.top["probability"], proba[expected])
+
+    for region, table in result.segments.items():
+        in_region = np.flatnonzero(df["Region"] == region)
+        best = in_region[np.argsort(-proba[in_region], kind="stable")[:5]]
+        np.testing.assert_array_equal(table["CustomerID"], best)
+        assert (table["Region"] == region).all()
+
+    assert sorted(result.selected["CustomerID"]) == list(np.flatnonzero(proba >= 0.8))
+    assert result.rows == 1000 and result.rejected == 0
+
+
+def test_top_n_risk_streams_csv_and_skips_invalid_rows(scored_customers, tmp_path):
+    """Test CSV input in chunks; invalid rows are rejected, not ranked."""
+    df, engineer, model, proba = scored_customers
+    df = df.copy()
+    df.loc[[3, 500], "Age"] = np.nan
+    path = tmp_path / "customers.csv"
+    df.to_csv(path, index=False)
+
+    result = top_n_risk(model, str(path), n=10, engineer=engineer, chunksize=100)
+
+    assert result.rejected == 2
+    assert not {3, 500} & set(result.top["CustomerID"])
+    assert len(result.top) == 10
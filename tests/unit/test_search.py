@@ -0,0 +1,96 @@
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from churn_prediction.models.search import candidate_params, successive_halving_search
+from churn_prediction.models.train import train_model
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(600, 4)),
+                     columns=["Age", "Tenure", "MonthlyCharges", "TotalCharges"])
+    y = (X["Age"] + X["Tenure"] * X["MonthlyCharges"]
+         + rng.normal(0, 0.5, 600) > 0).astype(int)
+    return X, y
+
+
+def test_candidate_params_grid_and_sample():
+    """Test full grid vs random sample."""
+    grid = {"max_depth": [2, 4, 8], "min_samples_leaf": [1, 5]}
+    assert len(candidate_params(grid)) == 6
+    sample = candidate_params(grid, n_candidates=4, random_state=0)
+    assert len(sample) == 4 and all(p in candidate_params(grid) for p in sample)
+
+
+def test_successive_halving_prunes_and_resumes(data, tmp_path):
+    """Test rounds shrink, the log is written, and a rerun refits nothing."""
+    X, y = data
+    log_path = tmp_path / "search.jsonl"
+    grid = {"max_depth": [1, 2, 6, 10], "min_samples_leaf": [1, 20]}
+
+    result = successive_halving_search(X, y, grid, n_workers=1, factor=2,
+                                       log_path=str(log_path))
+
+    per_round = result.history.groupby("round")["candidate"].nunique().tolist()
+    assert per_round == [8, 4, 2, 1]
+    assert result.history["budget"].is_monotonic_increasing
+    assert result.best_params["max_depth"] > 1
+    assert 0.5 < result.best_score <= 1.0
+    assert hasattr(result.best_model, "predict_proba")
+
+    n_lines = len(log_path.read_text().splitlines())
+    assert n_lines == 15
+
+    again = successive_halving_search(X, y, grid, n_workers=1, factor=2,
+                                      log_path=str(log_path))
+    assert len(log_path.read_text().splitlines()) == n_lines
+    assert again.best_params == result.best_params
+
+
+@pytest.mark.parametrize("random_state", [1, 2])
+def test_successive_halving_small_budgets_keep_both_classes(random_state):
+    """Test a large grid on a rare target never fits a single-class subset."""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(1000, 3)),
+                     columns=["Age", "Tenure", "MonthlyCharges"])
+    y = (X["MonthlyCharges"] + rng.normal(0, 0.5, 1000) > 1.8).astype(int)
+    grid = {"n_estimators": [5], "max_depth": [2, 4, 8, None],
+            "min_samples_leaf": [1, 2, 5], "max_features": ["sqrt", 1.0],
+            "class_weight": [None, "balanced", "balanced_subsample"]}
+
+    result = successive_halving_search(X, y, grid, n_workers=1,
+                                       random_state=random_state)
+
+    # The default first round (800 // 81 = 9 rows) is raised to hold churners
+    assert result.history["budget"].min() >= 2 / y.mean()
+    assert 0.5 < result.best_score <= 1.0
+
+
+def test_successive_halving_tree_budget_in_process_pool(data):
+    """Test n_estimators budgets across worker processes with XGBoost."""
+    pytest.importorskip("xgboost")
+    X, y = data
+    result = successive_halving_search(
+        X, y, {"max_depth": [2, 4], "learning_rate": [0.05, 0.3]},
+        model_type="xgboost", resource="n_estimators", max_resource=40,
+        factor=2, n_workers=2,
+    )
+
+    assert sorted(result.history["budget"].unique()) == [10, 20, 40]
+    assert result.best_model.n_estimators == 40
+
+
+def test_train_model_xgboost(data):
+    """Test the xgboost model type honours its parameters."""
+    pytest.importorskip("xgboost")
+    X, y = data
+    model = train_model(X, y, "xgboost", verbose=False, n_estimators=7, max_depth=2)
+
+    assert model.n_estimators == 7
+    assert model.predict_proba(X).shape == (600, 2)
@@ -0,0 +1,141 @@
+import asyncio
+import json
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from churn_prediction.models.serving import MicroBatchScorer, serve_http
+
+
+def test_micro_batching_coalesces_concurrent_requests(fitted):
+    """Test concurrent requests share batches and get their own results."""
+    engineer, model, X = fitted
+    rows = X.iloc[:20].to_dict("records")
+    expected = model.predict_proba(engineer.transform(X.iloc[:20]))[:, 1]
+
+    async def run():
+        async with MicroBatchScorer(engineer, model, max_batch_size=8,
+                                    max_wait_ms=50) as scorer:
+            results = await asyncio.gather(*(scorer.score(r) for r in rows))
+            return results, scorer.stats()
+
+    results, stats = asyncio.run(run())
+
+    np.testing.assert_allclose(results, expected)
+    assert stats["requests"] == 20
+    assert stats["batches"] == 3
+
+
+def test_micro_batching_rejects_only_bad_request(fitted):
+    """Test an invalid row fails its own future, not the batch."""
+    engineer, model, X = fitted
+
+    async def run():
+        async with MicroBatchScorer(engineer, model, max_wait_ms=20) as scorer:
+            return await asyncio.gather(
+                scorer.score({"Age": 30.0, "MonthlyCharges": 50.0}),
+                scorer.score({"Age": np.nan, "MonthlyCharges": 50.0}),
+                return_exceptions=True,
+            )
+
+    good, bad = asyncio.run(run())
+
+    assert 0.0 <= good <= 1.0
+    assert isinstance(bad, ValueError) and "NaN: Age" in str(bad)
+
+
+def test_micro_batching_isolates_malformed_request(fitted):
+    """Test a string in a numeric column fails only its own request."""
+    engineer, model, X = fitted
+
+    async def run():
+        async with MicroBatchScorer(engineer, model, max_wait_ms=20) as scorer:
+            return await asyncio.gather(
+                scorer.score({"Age": 30.0, "MonthlyCharges": 50.0}),
+                scorer.score({"Age": "thirty", "MonthlyCharges": 50.0}),
+                return_exceptions=True,
+            ), scorer.stats()
+
+    (good, bad), stats = asyncio.run(run())
+
+    assert 0.0 <= good <= 1.0
+    assert isinstance(bad, ValueError) and "thirty" in str(bad)
+    assert stats["batches"] == 1
+
+
+def test_micro_batching_rejects_lone_missing_feature(fitted):
+    """Test a request missing a feature alone in its batch gets ValueError."""
+    engineer, model, _ = fitted
+
+    async def run():
+        async with MicroBatchScorer(engineer, model, max_wait_ms=1) as scorer:
+            return await asyncio.gather(scorer.score({"Age": 30.0}),
+                                        return_exceptions=True)
+
+    (result,) = asyncio.run(run())
+
+    assert isinstance(result, ValueError) and "NaN: MonthlyCharges" in str(result)
+
+
+def test_micro_batch_scorer_restarts_after_stop(fitted):
+    """Test a stopped scorer can be started again."""
+    engineer, model, _ = fitted
+    row = {"Age": 30.0, "MonthlyCharges": 50.0}
+
+    async def run():
+        scorer = MicroBatchScorer(engineer, model, max_wait_ms=1)
+        results = []
+        for _ in range(2):
+            async with scorer:
+                results.append(await scorer.score(row))
+        return results
+
+    first, second = asyncio.run(run())
+
+    assert first == second
+
+
+def _post(scorer, payload):
+    """POST payload to a fresh serve_http server; return the raw response."""
+    async def run():
+        async with scorer:
+            server = await serve_http(scorer, port=0)
+            port = server.sockets[0].getsockname()[1]
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            body = json.dumps(payload).encode()
+            writer.write(b"POST /score HTTP/1.1\r\nContent-Length: %d\r\n\r\n"
+                         % len(body) + body)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+
+            server.close()
+            await server.wait_closed()
+            return response
+
+    return asyncio.run(run())
+
+
+def test_serve_http_round_trip(fitted):
+    """Test the HTTP stand-in against a local socket."""
+    engineer, model, _ = fitted
+    scorer = MicroBatchScorer(engineer, model, max_wait_ms=1)
+
+    response = _post(scorer, {"Age": 30.0, "MonthlyCharges": 100.0})
+
+    assert response.startswith(b"HTTP/1.1 200 OK")
+    assert 0.0 <= json.loads(response.split(b"\r\n\r\n", 1)[1])["probability"] <= 1.0
+
+
+def test_serve_http_missing_feature_is_bad_request(fitted):
+    """Test a request missing a feature gets a 400, not a dropped connection."""
+    engineer, model, _ = fitted
+    scorer = MicroBatchScorer(engineer, model, max_wait_ms=1)
+
+    response = _post(scorer, {"Age": 30.0})
+
+    assert response.startswith(b"HTTP/1.1 400 Bad Request")
+    assert "MonthlyCharges" in json.loads(response.split(b"\r\n\r\n", 1)[1])["error"]
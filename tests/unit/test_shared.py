@@ -0,0 +1,44 @@
+import pytest
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from churn_prediction.instrumentation import process_memory
+from churn_prediction.models.shared import SharedModel
+from sklearn.linear_model import LogisticRegression
+
+
+def test_shared_model_attaches_read_only_mapping(fitted, tmp_path):
+    """Test attached arrays are read-only maps and score like the model."""
+    engineer, model, X = fitted
+    with SharedModel(model, engineer, directory=str(tmp_path)) as shared:
+        forest, attached_engineer = SharedModel.attach(*shared.paths)
+
+        assert isinstance(forest.threshold, np.memmap)
+        assert not forest.threshold.flags.writeable
+        np.testing.assert_array_equal(
+            forest.predict_proba(attached_engineer.transform(X)),
+            model.predict_proba(engineer.transform(X)),
+        )
+
+    assert not Path(shared.model_path).exists()
+
+
+def test_shared_model_rejects_unflattenable_models(fitted, tmp_path):
+    """Test non-tree models fail and leave no files behind."""
+    engineer, _, X = fitted
+    model = LogisticRegression().fit(engineer.transform(X), (X["Age"] > 40).astype(int))
+
+    with pytest.raises(TypeError):
+        SharedModel(model, engineer, directory=str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_process_memory_reports_rss():
+    """Test RSS (and PSS where available) for the current process."""
+    memory = process_memory()
+    assert memory["rss"] > 0
+    if memory["pss"] is not None:
+        assert 0 < memory["pss"] <= memory["rss"]
@@ -0,0 +1,175 @@
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from churn_prediction.models.forest import FlatForest
+from churn_prediction.models.train import (
+    MODEL_BACKENDS,
+    ModelRegistry,
+    load_model,
+    parallel_section,
+    register_backend,
+    save_model,
+    set_thread_budget,
+    thread_budget,
+    train_model,
+    update_model,
+)
+from sklearn.linear_model import LogisticRegression
+
+
+@pytest.fixture
+def windows():
+    rng = np.random.default_rng(0)
+
+    def window(n, shift):
+        X = pd.DataFrame(rng.normal(size=(n, 3)),
+                         columns=["Age", "Tenure", "MonthlyCharges"])
+        y = (X["Age"] + shift * X["Tenure"] + rng.normal(0, 0.5, n) > 0).astype(int)
+        return X, y
+
+    return window(400, 0.0), window(200, 1.0)
+
+
+def test_update_random_forest_adds_and_replaces_trees(windows):
+    """Test warm start adds new trees and drops the oldest past max_trees."""
+    (X_old, y_old), (X_new, y_new) = windows
+    model = train_model(X_old, y_old, verbose=False, n_estimators=10, random_state=0)
+
+    updated = update_model(model, X_new, y_new, n_new_trees=4, verbose=False)
+    assert len(updated.estimators_) == 14
+    np.testing.assert_array_equal(updated.estimators_[0].tree_.threshold,
+                                  model.estimators_[0].tree_.threshold)
+    assert len(model.estimators_) == 10  # original untouched
+
+    trimmed = train_model(X_new, y_new, verbose=False, init_model=updated,
+                          n_estimators=4, max_trees=14)
+    assert len(trimmed.estimators_) == 14
+    kept = {id(tree) for tree in trimmed.estimators_}
+    assert not kept & {id(tree) for tree in updated.estimators_[:4]}
+    seeds = [tree.random_state for tree in trimmed.estimators_]
+    assert len(set(seeds)) == len(seeds)
+    assert trimmed.predict_proba(X_new).shape == (200, 2)
+
+
+def test_update_xgboost_continues_boosting(windows):
+    """Test XGBoost gains boosting rounds on top of the old booster."""
+    pytest.importorskip("xgboost")
+    (X_old, y_old), (X_new, y_new) = windows
+    model = train_model(X_old, y_old, "xgboost", verbose=False, n_estimators=10)
+
+    updated = update_model(model, X_new, y_new, n_new_trees=5, verbose=False)
+
+    assert updated.get_booster().num_boosted_rounds() == 15
+    assert model.get_booster().num_boosted_rounds() == 10
+    with pytest.raises(ValueError, match="max_trees"):
+        update_model(model, X_new, y_new, max_trees=10, verbose=False)
+
+
+def test_update_model_rejects_non_ensembles(windows):
+    """Test models without incremental support are refused."""
+    (X_old, y_old), (X_new, y_new) = windows
+    with pytest.raises(ValueError, match="LogisticRegression"):
+        update_model(LogisticRegression().fit(X_old, y_old), X_new, y_new)
+
+
+def test_flattened_artifact_loads_memory_mapped(windows, tmp_path):
+    """Test flatten + mmap_mode gives a mapped FlatForest with equal scores."""
+    (X_old, y_old), _ = windows
+    model = train_model(X_old, y_old, verbose=False, n_estimators=5)
+    path = tmp_path / "forest.joblib"
+    save_model(model, str(path), flatten=True)
+
+    forest = load_model(str(path), mmap_mode="r")
+
+    assert isinstance(forest, FlatForest)
+    assert isinstance(forest.threshold, np.memmap)
+    np.testing.assert_array_equal(forest.predict_proba(X_old),
+                                  model.predict_proba(X_old))
+
+
+def test_compressed_artifact_round_trip(windows, tmp_path):
+    """Test compressed artifacts are smaller and load identically."""
+    (X_old, y_old), _ = windows
+    model = train_model(X_old, y_old, verbose=False, n_estimators=5)
+    save_model(model, str(tmp_path / "raw.joblib"))
+    save_model(model, str(tmp_path / "small.joblib"), compress=3)
+
+    small = (tmp_path / "small.joblib").stat().st_size
+    assert small < (tmp_path / "raw.joblib").stat().st_size
+    np.testing.assert_array_equal(
+        load_model(str(tmp_path / "small.joblib")).predict_proba(X_old),
+        model.predict_proba(X_old),
+    )
+
+
+def test_model_registry_reuses_until_file_changes(windows, tmp_path):
+    """Test the registry returns the loaded object until the file changes."""
+    (X_old, y_old), (X_new, y_new) = windows
+    path = str(tmp_path / "model.joblib")
+    save_model(train_model(X_old, y_old, verbose=False, n_estimators=3), path)
+    registry = ModelRegistry()
+
+    first = registry.get(path)
+    assert registry.get(path) is first
+    assert registry.hits == 1
+
+    save_model(train_model(X_new, y_new, verbose=False, n_estimators=4), path)
+    second = registry.get(path)
+    assert second is not first and len(second.estimators_) == 4
+    assert registry.loads == 2 and len(registry) == 1
+
+
+def test_load_model_rejects_lfs_pointers(tmp_path):
+    """Test a Git LFS pointer file gives an actionable error."""
+    pointer = tmp_path / "model.pkl"
+    pointer.write_text("version https://git-lfs.github.com/spec/v1\n"
+                       "oid sha256:abc\nsize 1\n")
+
+    with pytest.raises(ValueError, match="git lfs pull"):
+        load_model(str(pointer))
+
+
+@pytest.fixture
+def budget():
+    yield set_thread_budget(8)
+    set_thread_budget()
+
+
+def test_parallel_sections_split_the_thread_budget(budget):
+    """Test nested parallel callers get a fair share, restored on exit."""
+    assert thread_budget() == 8
+    with parallel_section(2) as outer:
+        assert outer == thread_budget() == 4
+        with parallel_section(3) as inner:
+            assert inner == 1
+        assert thread_budget() == 4
+    assert thread_budget() == 8
+
+
+def test_train_model_uses_budget_and_registered_backends(windows, budget):
+    """Test n_jobs follows the budget unless given, and custom backends plug in."""
+    (X, y), _ = windows
+    with parallel_section(4):
+        model = train_model(X, y, verbose=False, n_estimators=5)
+    assert model.n_jobs == 2
+    assert train_model(X, y, verbose=False, n_estimators=5, n_jobs=1).n_jobs == 1
+
+    seen = {}
+
+    @register_backend("test_logistic")
+    def build(params, n_threads):
+        seen["n_threads"] = n_threads
+        return LogisticRegression(C=params.get("C", 1.0))
+
+    try:
+        model = train_model(X, y, "test_logistic", verbose=False, C=0.5)
+    finally:
+        MODEL_BACKENDS.pop("test_logistic")
+    assert model.C == 0.5 and seen["n_threads"] == 8
+    with pytest.raises(ValueError, match="Unknown model type"):
+        train_model(X, y, "test_logistic", verbose=False)